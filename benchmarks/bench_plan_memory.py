@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Plan memory benchmark - bytes per entry for a list of (Path, str) vs CompactPlanStore
+
+Usage:
+    python benchmarks/bench_plan_memory.py [--entries 1000000] [--dirs 5000]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from batch_renamer.core.plan_store import CompactPlanStore
+
+
+def _synthetic_entries(entries: int, dirs: int):
+    """產生 (路徑, 新名稱)：約一半名稱有變化"""
+    root = Path("/archive/share")
+    parents = [root / f"dir{d:05d}" / "子資料夾" for d in range(dirs)]
+    for i in range(entries):
+        name = f"IMG_{i:08d}_国家.jpg" if i % 2 else f"IMG_{i:08d}.jpg"
+        yield parents[i % dirs] / name, name.replace("国", "國")
+
+
+def _measure(build) -> int:
+    """回傳建立結果所增加的記憶體 (位元組)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def run(entries: int, dirs: int) -> dict:
+    """執行基準測試並回傳結果"""
+    list_bytes = _measure(lambda: list(_synthetic_entries(entries, dirs)))
+
+    def _build_store():
+        store = CompactPlanStore()
+        for item, new_name in _synthetic_entries(entries, dirs):
+            store.append(item, new_name)
+        return store
+
+    store_bytes = _measure(_build_store)
+
+    return {
+        "benchmark": "plan_memory",
+        "entries": entries,
+        "dirs": dirs,
+        "list_bytes_per_entry": round(list_bytes / entries, 1),
+        "compact_bytes_per_entry": round(store_bytes / entries, 1),
+        "ratio": round(list_bytes / store_bytes, 2) if store_bytes else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--dirs", type=int, default=5_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.entries, args.dirs), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Cold-start check for the packaged app - launch it several times and compare launch-to-first-paint with the target
+
+Usage:
+    python benchmarks/check_startup.py "dist/Batch Renamer.app/Contents/MacOS/Batch Renamer"
+                                       [--runs 3] [--timeout 30] [--target 1.5]
+
+每次啟動都設定 BATCH_RENAMER_STARTUP_LOG，等到程式寫入計時報告後結束該行程。
+冷啟動時間從呼叫 Popen 之前開始，到報告中的 first_paint_at 為止 (含直譯器啟動與 bootloader)；
+其中位數超過目標 (預設 COLD_START_TARGET) 或任何一次沒有產生報告時以非零狀態結束。
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from batch_renamer.utils.constants import COLD_START_TARGET
+from batch_renamer.utils.startup import STARTUP_LOG_ENV
+
+
+def launch_once(command: List[str], timeout: float) -> Optional[dict]:
+    """
+    啟動一次並等待計時報告
+
+    Returns:
+        報告 (StartupTimer.report 的內容，另加從啟動行程到首個畫面的秒數 launch_to_first_paint)，逾時為 None
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "startup.jsonl"
+        env = {**os.environ, STARTUP_LOG_ENV: str(log_path)}
+        launched = time.time()
+        proc = subprocess.Popen(command, env=env)
+        try:
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                if log_path.exists():
+                    lines = log_path.read_text(encoding="utf-8").splitlines()
+                    if lines:
+                        report = json.loads(lines[0])
+                        if report.get("first_paint_at") is not None:
+                            report["launch_to_first_paint"] = report["first_paint_at"] - launched
+                        return report
+                if proc.poll() is not None:
+                    return None
+                time.sleep(0.1)
+            return None
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", nargs="+", help="Packaged executable (and arguments)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for each report")
+    parser.add_argument("--target", type=float, default=COLD_START_TARGET, help="Launch-to-first-paint target in seconds")
+    args = parser.parse_args()
+
+    first_paints = []
+    for run in range(max(1, args.runs)):
+        report = launch_once(args.command, args.timeout)
+        if report is None or "launch_to_first_paint" not in report:
+            print(f"run {run + 1}: no startup report within {args.timeout:.0f} s", file=sys.stderr)
+            sys.exit(1)
+        first_paints.append(report["launch_to_first_paint"])
+        print(json.dumps({"launch_to_first_paint": round(report["launch_to_first_paint"], 4), **report["marks"]}))
+
+    median = statistics.median(first_paints)
+    print(f"launch to first paint median {median:.3f} s (target {args.target:.2f} s)")
+    sys.exit(0 if median <= args.target else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite - scan, conversion, formatting and execution on a synthetic tree
+
+Usage:
+    python benchmarks/run_benchmarks.py [--entries 100000] [--depth 4] [--fanout 8] [--cjk-ratio 0.5]
+                                        [--seed 0] [--repeat 3] [--dir /dev/shm] [--fs local|memory]
+                                        [--output results.json]
+
+結果為 JSON (每個項目取多次執行的最佳值)，可逐次提交比較是否退步。
+--fs memory 在記憶體檔案系統上量測掃描與執行，只反映本程式的成本 (每項目約 15 µs 掃描、25 µs 執行)。
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from batch_renamer.core.fs import MemoryFileSystem
+from batch_renamer.core.grouping import CompanionGrouper, parse_companion_rules
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.utils.converter import get_opencc_status, has_opencc
+
+from treegen import DEFAULT_EXTS, TreeSpec, generate_tree, iter_tree
+
+
+# 整理模式基準測試使用的樣式 (副檔名 / 年 / 月)
+REORGANIZE_PATTERN = "{ext}/{mtime:%Y}/{mtime:%m}"
+
+
+def _default_dir() -> Path:
+    """優先使用 tmpfs (/dev/shm)，避免量到磁碟"""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return Path(tempfile.gettempdir())
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _best(fn: Callable[[], int], repeat: int, setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """執行 repeat 次，回傳最快的一次 (fn 回傳處理的項目數)"""
+    best = None
+    count = 0
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        count = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "seconds": round(best, 6),
+        "items": count,
+        "per_second": round(count / best, 1) if best else None,
+    }
+
+
+def run(spec: TreeSpec, repeat: int, base_dir: Path, fs_kind: str = "local") -> dict:
+    """執行所有基準測試並回傳結果 (fs_kind: "local" 或 "memory")"""
+    renamer = FileRenamer()
+    names = [rel.rpartition("/")[2] for rel, _ in iter_tree(spec)]
+    files = [Path(rel) for rel, is_dir in iter_tree(spec) if not is_dir]
+    results: Dict[str, dict] = {}
+
+    # --- 純文字轉換 (不碰檔案系統) ---
+    def convert(operation: str, **kwargs) -> Callable[[], int]:
+        def fn() -> int:
+            for name in names:
+                renamer.apply_conversion(name, operation, **kwargs)
+            return len(names)
+        return fn
+
+    if has_opencc():
+        results["apply_conversion.s2t_opencc"] = _best(convert("s2t"), repeat)
+    else:
+        results["apply_conversion.s2t_opencc"] = {"skipped": get_opencc_status()}
+    with mock.patch("batch_renamer.core.renamer.has_opencc", new=lambda: False):
+        results["apply_conversion.s2t_fallback"] = _best(convert("s2t"), repeat)
+    results["apply_conversion.replace"] = _best(convert("replace", find_text="_", replace_text=" "), repeat)
+
+    def formatting() -> int:
+        for item in files:
+            renamer.apply_formatting(item, item.name, "pre_", "_suf", "-_ ", is_dir=False)
+        return len(files)
+
+    results["apply_formatting"] = _best(formatting, repeat)
+
+    # 每兩個檔案配一個同名 .xmp 附屬檔，全部位於同一批資料夾
+    grouper_rules = parse_companion_rules("default")
+    sidecar_targets = []
+    for i, item in enumerate(files):
+        sidecar_targets.append((item, f"x_{item.name}"))
+        if i % 2 == 0:
+            sidecar_targets.append((item.with_suffix(".xmp"), item.with_suffix(".xmp").name))
+
+    results["group_companions"] = _best(
+        lambda: len(CompanionGrouper(grouper_rules).group(list(sidecar_targets))), repeat
+    )
+
+    # --- 檔案系統 ---
+    memory = fs_kind == "memory"
+    work = Path("/bench") if memory else Path(tempfile.mkdtemp(prefix="batch_renamer_bench_", dir=base_dir))
+    root = work / "tree"
+
+    def new_tree() -> None:
+        # 記憶體模式每次換一個新的檔案系統 (不需刪除舊樹)
+        if memory:
+            renamer.fs = MemoryFileSystem()
+            renamer.plan = None
+            generate_tree(root, spec, renamer.fs)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+            generate_tree(root, spec)
+
+    try:
+        start = time.perf_counter()
+        new_tree()
+        results["generate_tree"] = {"seconds": round(time.perf_counter() - start, 6), "items": spec.entries}
+
+        settings = dict(root_path=root, rename_mode="both", filter_type="all", valid_exts=[], operation="s2t")
+        results["scan_directory"] = _best(lambda: len(renamer.scan_directory(**settings)), repeat)
+
+        def execute() -> int:
+            plan = renamer.build_plan(dict(settings, rename_mode="files", operation="none", prefix="x_"))
+            success, failed = renamer.execute_rename(plan.changed)
+            return success + failed
+
+        results["execute_rename"] = _best(execute, repeat, setup=new_tree)
+
+        def reorganize() -> int:
+            plan = renamer.build_reorganize_plan(
+                dict(settings, rename_mode="files", operation="none"), REORGANIZE_PATTERN
+            )
+            success, failed = renamer.reorganize(plan)
+            return success + failed
+
+        results["reorganize"] = _best(reorganize, repeat, setup=new_tree)
+    finally:
+        if not memory:
+            shutil.rmtree(work, ignore_errors=True)
+
+    return {
+        "benchmark": "suite",
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "opencc": get_opencc_status(),
+        "fs": fs_kind,
+        "tmp_dir": None if memory else str(base_dir),
+        "spec": {**vars(spec), "exts": list(spec.exts)},
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--depth", type=int, default=TreeSpec.depth)
+    parser.add_argument("--fanout", type=int, default=TreeSpec.fanout)
+    parser.add_argument("--cjk-ratio", type=float, default=TreeSpec.cjk_ratio)
+    parser.add_argument("--exts", default=",".join(DEFAULT_EXTS))
+    parser.add_argument("--seed", type=int, default=TreeSpec.seed)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dir", type=Path, default=None, help="Where to build the tree (default: /dev/shm)")
+    parser.add_argument("--fs", choices=("local", "memory"), default="local",
+                        help="Filesystem for the scan/execute benchmarks (memory = no disk I/O)")
+    parser.add_argument("--output", type=Path, help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    spec = TreeSpec(args.entries, args.depth, args.fanout, args.cjk_ratio, args.exts.split(","), args.seed)
+    result = run(spec, max(1, args.repeat), args.dir or _default_dir(), args.fs)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic tree generator for benchmarks
+
+Usage:
+    python benchmarks/treegen.py /dev/shm/tree [--entries 100000] [--depth 4] [--fanout 8]
+                                               [--cjk-ratio 0.5] [--exts jpg,png,txt] [--seed 0]
+"""
+
+import argparse
+import json
+import random
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from batch_renamer.core.fs import MemoryFileSystem
+from batch_renamer.utils.constants import SIMPLIFIED_TO_TRADITIONAL
+
+DEFAULT_EXTS = (".jpg", ".png", ".txt", ".pdf", ".mp3", ".mp4", ".docx", ".zip")
+
+# 簡體字取自備用字典 (保證 s2t 有字可轉)，再加上簡繁相同的常用字
+_CJK_CHARS = sorted(chr(k) for k, v in SIMPLIFIED_TO_TRADITIONAL.items() if chr(k) != v) + list("的是在有人中大和")
+_ASCII_WORDS = (
+    "photo", "report", "draft", "final", "scan", "invoice", "notes", "backup",
+    "meeting", "budget", "holiday", "project", "summary", "export", "archive", "image",
+)
+_SEPARATORS = (" ", "_", "-", "")
+
+
+@dataclass
+class TreeSpec:
+    """Generator parameters (same spec + seed = same tree)"""
+
+    entries: int = 10_000
+    depth: int = 4
+    fanout: int = 8
+    cjk_ratio: float = 0.5
+    exts: Sequence[str] = DEFAULT_EXTS
+    seed: int = 0
+
+
+def _name(rng: random.Random, cjk_ratio: float) -> str:
+    """產生 1-3 個詞組成的名稱 (中文詞 2-4 字，比例由 cjk_ratio 決定)"""
+    words = []
+    for _ in range(rng.randint(1, 3)):
+        if rng.random() < cjk_ratio:
+            words.append("".join(rng.choice(_CJK_CHARS) for _ in range(rng.randint(2, 4))))
+        else:
+            words.append(rng.choice(_ASCII_WORDS))
+    return rng.choice(_SEPARATORS).join(words)
+
+
+def iter_tree(spec: TreeSpec) -> Iterator[Tuple[str, bool]]:
+    """
+    依建立順序產生 (相對路徑, 是否為資料夾)，上層資料夾一定先出現
+
+    資料夾約佔 1/20 (依廣度優先、每層 fanout 個)，其餘為檔案，隨機分配到所有資料夾；
+    副檔名依 1/k 權重分佈。
+    """
+    rng = random.Random(spec.seed)
+    exts = [e if e.startswith(".") else f".{e}" for e in spec.exts]
+    ext_weights = [1 / (k + 1) for k in range(len(exts))]
+    dir_budget = min(max(spec.entries // 20, 1), spec.entries)
+
+    dirs: List[str] = [""]
+    frontier = [""]
+    for _ in range(spec.depth):
+        next_frontier = []
+        for parent in frontier:
+            for _ in range(spec.fanout):
+                if len(dirs) - 1 >= dir_budget:
+                    break
+                name = f"{_name(rng, spec.cjk_ratio)}_{len(dirs)}"
+                path = f"{parent}/{name}" if parent else name
+                dirs.append(path)
+                next_frontier.append(path)
+                yield path, True
+        frontier = next_frontier
+
+    for i in range(spec.entries - (len(dirs) - 1)):
+        parent = dirs[rng.randrange(len(dirs))]
+        name = f"{_name(rng, spec.cjk_ratio)}_{i}{rng.choices(exts, ext_weights)[0]}"
+        yield (f"{parent}/{name}" if parent else name), False
+
+
+def generate_tree(root: Path, spec: TreeSpec, fs: Optional[MemoryFileSystem] = None) -> dict:
+    """
+    在 root 下建立樹 (空檔案)
+
+    Args:
+        fs: 建立在記憶體檔案系統中 (root 須為絕對路徑)；None = 本機磁碟
+
+    Returns:
+        {"dirs", "files"}
+    """
+    root = Path(root)
+    if fs is None:
+        root.mkdir(parents=True, exist_ok=True)
+        mkdir, touch = Path.mkdir, Path.touch
+    else:
+        fs.mkdir(root, parents=True, exist_ok=True)
+        mkdir, touch = fs.mkdir, fs.add_file
+    prefix = str(root).rstrip("/")
+    dirs = files = 0
+    for rel, is_dir in iter_tree(spec):
+        # 記憶體檔案系統直接使用字串路徑
+        path = root / rel if fs is None else f"{prefix}/{rel}"
+        if is_dir:
+            mkdir(path)
+            dirs += 1
+        else:
+            touch(path)
+            files += 1
+    return {"dirs": dirs, "files": files}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--entries", type=int, default=TreeSpec.entries)
+    parser.add_argument("--depth", type=int, default=TreeSpec.depth)
+    parser.add_argument("--fanout", type=int, default=TreeSpec.fanout)
+    parser.add_argument("--cjk-ratio", type=float, default=TreeSpec.cjk_ratio)
+    parser.add_argument("--exts", default=",".join(DEFAULT_EXTS))
+    parser.add_argument("--seed", type=int, default=TreeSpec.seed)
+    args = parser.parse_args()
+
+    spec = TreeSpec(args.entries, args.depth, args.fanout, args.cjk_ratio, args.exts.split(","), args.seed)
+    counts = generate_tree(args.root, spec)
+    print(json.dumps({"root": str(args.root), **asdict(spec), **counts}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
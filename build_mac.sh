@@ -25,6 +25,12 @@ python -m PyInstaller \
     --collect-all flet \
     main.py
 
+# Check packaged cold start (optional, needs a display)
+if [ "${CHECK_STARTUP:-0}" = "1" ]; then
+    echo "Checking cold start..."
+    python benchmarks/check_startup.py --runs 3 -- "dist/Batch Renamer.app/Contents/MacOS/Batch Renamer"
+fi
+
 # Create a DMG (optional)
 if command -v hdiutil &> /dev/null; then
     echo "Creating DMG installer..."
@@ -10,7 +10,18 @@ from pathlib import Path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-from batch_renamer.ui.app import create_app
+from batch_renamer.utils.startup import STARTUP
 
-if __name__ == "__main__":
+STARTUP.mark("imports")
+
+
+def main() -> None:
+    """Import the UI (Flet) only when the app is launched, after the first startup mark"""
+    from batch_renamer.ui.app import create_app
+
+    STARTUP.mark("ui_imports")
     create_app()
+
+
+if __name__ == "__main__":
+    main()
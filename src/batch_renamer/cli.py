@@ -0,0 +1,513 @@
+"""Headless command-line interface - never imports Flet, streams JSON lines"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+from .core.renamer import FileRenamer
+from .core.journal import RenameJournal
+from .core.executor import ThrottledProgress
+from .core.export import EXPORT_FORMATS, export_plan
+from .core.grouping import parse_companion_rules
+from .core.inventory import InventoryIndex
+from .core.mapping import MappingIndex
+from .core.metrics import METRICS_INTERVAL, MetricsWriter
+from .core.mirror import MIRROR_METHODS, mirror_plan
+from .core.stats import PerfStats
+from .utils.constants import DEFAULT_SYMLINK_POLICY, SYMLINK_POLICIES
+from .utils.eventlog import EVENT_LOG, WARNING
+
+# 匯入 CLI 模組 (不含直譯器啟動) 的時間預算 (秒)，由測試檢查
+STARTUP_BUDGET_SECONDS = 0.5
+
+# 執行時進度事件的最短間隔 (秒)
+PROGRESS_INTERVAL = 0.5
+
+# 結束時輸出的最近警告 / 錯誤事件數 (完整記錄請用 --log)
+LOG_TAIL = 20
+
+
+class JsonLinesWriter:
+    """Write one JSON object per line"""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def emit(self, event: str, flush: bool = False, **fields: Any) -> None:
+        """輸出一個事件"""
+        fields = {"event": event, **fields}
+        self.stream.write(json.dumps(fields, ensure_ascii=False) + "\n")
+        if flush:
+            self.stream.flush()
+
+
+def parse_extensions(text: str) -> List[str]:
+    """將 "jpg, .PNG" 解析為 [".jpg", ".png"]"""
+    exts = []
+    for part in text.split(","):
+        part = part.strip().lower()
+        if part:
+            exts.append(part if part.startswith(".") else f".{part}")
+    return exts
+
+
+def _add_job_arguments(parser: argparse.ArgumentParser) -> None:
+    """工作設定參數 (對應 FileRenamer.scan_directory)"""
+    parser.add_argument("root", type=Path, help="Root folder to scan")
+    parser.add_argument("--mode", choices=["files", "both"], default="files",
+                        help="Rename files only, or files and folders")
+    parser.add_argument("--ext", default="", help="Only include these extensions, e.g. 'jpg,png'")
+    parser.add_argument("--op", choices=["none", "s2t", "replace", "mapping"], default="none",
+                        help="Text conversion ('mapping' applies --mapping)")
+    parser.add_argument("--find", default="", help="Text to find (--op replace)")
+    parser.add_argument("--replace", default="", help="Replacement text (--op replace)")
+    parser.add_argument("--prefix", default="", help="Prefix to add")
+    parser.add_argument("--suffix", default="", help="Suffix to add (before the extension)")
+    parser.add_argument("--symbols", default="", help="Symbols to remove")
+    parser.add_argument("--mapping", type=Path,
+                        help="CSV/TSV of 'old relative path, new name' rows (--op mapping)")
+    parser.add_argument("--symlinks", choices=SYMLINK_POLICIES, default=DEFAULT_SYMLINK_POLICY,
+                        help="Symbolic links: skip them, rename the link itself, or follow (cycle-safe)")
+    parser.add_argument("--one-filesystem", action="store_true",
+                        help="Never cross into other mounted filesystems under the root")
+    parser.add_argument("--companions", nargs="?", const="default",
+                        help="Rename sidecars (.xmp, .json, .srt ...) with their primary file; "
+                             "optional rules like 'xmp=jpg,cr2; srt=mkv,mp4'")
+
+
+def _add_scan_arguments(parser: argparse.ArgumentParser) -> None:
+    """本機掃描參數：工作設定加上索引與溢出選項"""
+    _add_job_arguments(parser)
+    parser.add_argument("--index", type=Path, help="Persistent scan index database (incremental re-scan)")
+    parser.add_argument("--spill-threshold", type=int,
+                        help="Move the plan to a temporary SQLite store above this many entries")
+    parser.add_argument("--stats", action="store_true",
+                        help="Emit per-phase timings, cache hit rates and syscall counts")
+    _add_metrics_arguments(parser)
+
+
+def _add_metrics_arguments(parser: argparse.ArgumentParser) -> None:
+    """Prometheus textfile 指標選項"""
+    parser.add_argument("--metrics", type=Path,
+                        help="Write Prometheus metrics to this textfile (e.g. node-exporter's textfile directory)")
+    parser.add_argument("--metrics-interval", type=float, default=METRICS_INTERVAL,
+                        help="Minimum seconds between metrics writes during long runs")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """建立命令列解析器"""
+    parser = argparse.ArgumentParser(
+        prog="batch-renamer",
+        description="Batch Renamer (headless). Every command writes JSON lines to stdout."
+    )
+    parser.add_argument("--log", type=Path,
+                        help="Append structured warnings and errors to this JSONL file (rotated)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan = sub.add_parser("scan", help="List every matching entry with its new name")
+    _add_scan_arguments(scan)
+
+    preview = sub.add_parser("preview", help="List only entries whose name would change")
+    _add_scan_arguments(preview)
+    preview.add_argument("--limit", type=int, default=0, help="Stop after this many changes (0 = all)")
+
+    export = sub.add_parser("export", help="Write the plan to a file")
+    _add_scan_arguments(export)
+    export.add_argument("--output", "-o", type=Path, required=True,
+                        help="Output file (.csv, .jsonl or .sh; add .gz to compress)")
+    export.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from the file name)")
+    export.add_argument("--gzip", action="store_true", default=None, help="Compress with gzip")
+    export.add_argument("--all", action="store_true", help="Include unchanged entries (CSV / JSONL)")
+    export.add_argument("--undo", action="store_true", help="Shell script: write the reverse renames")
+
+    mirror = sub.add_parser("mirror", help="Recreate the renamed tree under another folder (originals untouched)")
+    _add_scan_arguments(mirror)
+    mirror.add_argument("--output", "-o", type=Path, required=True, help="Output folder (outside the root)")
+    mirror.add_argument("--method", choices=MIRROR_METHODS, default="auto",
+                        help="hardlink, reflink or in-kernel copy (auto tries them in that order)")
+
+    execute = sub.add_parser("execute", help="Rename entries")
+    _add_scan_arguments(execute)
+    execute.add_argument("--journal", type=Path, help="Write-ahead journal for resume / undo")
+    execute.add_argument("--durable", action="store_true", help="fsync touched folders")
+    execute.add_argument("--sync-every", type=int, default=0, help="Durable mode: fsync every N renames")
+
+    reorganize = sub.add_parser("reorganize", help="Move files into folders computed from a pattern")
+    _add_scan_arguments(reorganize)
+    reorganize.add_argument("--pattern", required=True,
+                            help="Destination folders, e.g. '{mtime:%%Y}/{mtime:%%m}' or '{ext}'")
+    reorganize.add_argument("--dest", type=Path, help="Destination root on the same filesystem (default: the root)")
+    reorganize.add_argument("--dry-run", action="store_true", help="Only list the moves")
+    reorganize.add_argument("--journal", type=Path, help="Write-ahead journal for resume / undo")
+    reorganize.add_argument("--durable", action="store_true", help="fsync touched folders")
+    reorganize.add_argument("--sync-every", type=int, default=0, help="Durable mode: fsync every N moves")
+
+    for name, help_text in (("resume", "Finish an interrupted run"), ("undo", "Revert a journaled run")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("journal", type=Path, help="Journal file")
+        cmd.add_argument("--durable", action="store_true", help="fsync touched folders")
+
+    jobs = sub.add_parser("jobs", help="Run every job in a JSON/TOML manifest concurrently")
+    jobs.add_argument("manifest", type=Path, help="Job manifest (.json or .toml)")
+    jobs.add_argument("--workers", type=int, help="Maximum concurrent jobs (default: manifest max_workers)")
+    jobs.add_argument("--durable", action="store_true", help="fsync touched folders")
+
+    serve = sub.add_parser("serve", help="Run the job service on a Unix domain socket")
+    serve.add_argument("socket", type=Path, help="Socket path")
+    serve.add_argument("--workers", type=int, default=2, help="Maximum concurrent jobs")
+    serve.add_argument("--index", type=Path, help="Persistent scan index shared by all jobs")
+    serve.add_argument("--journal-dir", type=Path, help="Write one journal per job into this folder")
+    serve.add_argument("--durable", action="store_true", help="fsync touched folders")
+    serve.add_argument("--keep-jobs", type=int, default=1000,
+                       help="Finished jobs kept for status/list/watch (oldest are dropped)")
+    _add_metrics_arguments(serve)
+
+    submit = sub.add_parser("submit", help="Submit a job to a running service and stream its progress")
+    submit.add_argument("socket", type=Path, help="Socket path")
+    _add_job_arguments(submit)
+    submit.add_argument("--name", help="Job name")
+    submit.add_argument("--no-wait", action="store_true", help="Return after the job is queued")
+
+    index = sub.add_parser("index", help="Refresh the persistent scan index for a root")
+    index.add_argument("root", type=Path, help="Root folder")
+    index.add_argument("--index", type=Path, required=True, help="Index database")
+
+    return parser
+
+
+def _scan_settings(args: argparse.Namespace) -> Dict[str, Any]:
+    """將命令列參數轉為 scan_directory 的關鍵字參數"""
+    valid_exts = parse_extensions(args.ext)
+    settings = dict(
+        root_path=args.root,
+        rename_mode=args.mode,
+        filter_type="ext" if valid_exts else "all",
+        valid_exts=valid_exts,
+        operation=args.op,
+        find_text=args.find,
+        replace_text=args.replace,
+        prefix=args.prefix,
+        suffix=args.suffix,
+        symbols=args.symbols,
+        symlinks=args.symlinks,
+        one_filesystem=args.one_filesystem,
+        companions=args.companions
+    )
+    if args.op == "mapping":
+        settings["mapping"] = MappingIndex.from_file(args.mapping)
+    return settings
+
+
+def _emit_mapping_report(out: JsonLinesWriter, settings: Dict[str, Any]) -> None:
+    """對照表模式：輸出配對統計 (未配對的列與檔案)"""
+    if "mapping" in settings:
+        out.emit("mapping", flush=True, **vars(settings["mapping"].report()))
+
+
+def _make_renamer(args: argparse.Namespace) -> FileRenamer:
+    inventory = InventoryIndex(args.index) if getattr(args, "index", None) else None
+    stats = PerfStats() if getattr(args, "stats", False) else None
+    return FileRenamer(
+        spill_threshold=getattr(args, "spill_threshold", None), inventory=inventory, stats=stats,
+        metrics=_make_metrics(args)
+    )
+
+
+def _make_metrics(args: argparse.Namespace) -> Optional[MetricsWriter]:
+    if not getattr(args, "metrics", None):
+        return None
+    return MetricsWriter(args.metrics, interval=args.metrics_interval)
+
+
+def _emit_stats(out: JsonLinesWriter, renamer: FileRenamer) -> None:
+    """--stats：輸出各階段耗時與計數"""
+    if renamer.stats is not None:
+        out.emit("stats", flush=True, **renamer.stats.as_dict())
+
+
+def _emit_summary(out: JsonLinesWriter, renamer: FileRenamer, **extra: Any) -> int:
+    summary = renamer.last_summary
+    out.emit(
+        "summary", flush=True,
+        success=summary.success, failed=summary.failed, total=summary.total,
+        cancelled=summary.cancelled, elapsed=round(summary.elapsed, 3),
+        durable=summary.durable, dirs_synced=summary.dirs_synced,
+        fsync_seconds=round(summary.fsync_seconds, 3), **extra
+    )
+    return 1 if summary.failed else 0
+
+
+def _run_jobs(args: argparse.Namespace, out: JsonLinesWriter) -> int:
+    """執行工作清單 (行程池只在此時載入)"""
+    from .core.jobs import load_manifest, run_manifest
+
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        out.emit("error", flush=True, message=f"invalid manifest: {e}")
+        return 2
+
+    summary = run_manifest(
+        manifest, max_workers=args.workers, durable=args.durable,
+        on_result=lambda result: out.emit("job", flush=True, **vars(result))
+    )
+    out.emit(
+        "summary", flush=True,
+        jobs=len(summary.results), jobs_failed=summary.jobs_failed,
+        success=summary.success, failed=summary.failed, elapsed=round(summary.elapsed, 3)
+    )
+    return 1 if summary.jobs_failed else 0
+
+
+def _serve(args: argparse.Namespace, out: JsonLinesWriter) -> int:
+    """執行常駐服務直到收到 shutdown 或 Ctrl+C"""
+    from .service import RenameService
+
+    service = RenameService(
+        args.socket, max_workers=args.workers, index_path=args.index,
+        journal_dir=args.journal_dir, durable=args.durable, metrics=_make_metrics(args),
+        job_retention=args.keep_jobs
+    )
+    out.emit("listening", flush=True, socket=str(args.socket))
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        service.shutdown()
+    return 0
+
+
+def _submit(args: argparse.Namespace, out: JsonLinesWriter) -> int:
+    """送出工作到常駐服務並轉發通知"""
+    from .service import ServiceClient, ServiceError
+
+    params = dict(
+        root=os.path.abspath(args.root), mode=args.mode, ext=parse_extensions(args.ext),
+        operation=args.op, find=args.find, replace=args.replace,
+        prefix=args.prefix, suffix=args.suffix, symbols=args.symbols,
+        symlinks=args.symlinks, one_filesystem=args.one_filesystem, companions=args.companions
+    )
+    if args.name:
+        params["name"] = args.name
+    if args.mapping:
+        params["mapping"] = os.path.abspath(args.mapping)
+
+    final = {}
+
+    def on_notify(method: str, params: dict) -> None:
+        if method == "done":
+            final.update(params)
+            out.emit("summary", flush=True, **params)
+        else:
+            out.emit(method, flush=True, **params)
+
+    try:
+        with ServiceClient(args.socket) as client:
+            job = client.call("submit", None if args.no_wait else on_notify, stream=not args.no_wait, **params)
+    except (OSError, ServiceError) as e:
+        out.emit("error", flush=True, message=str(e))
+        return 2
+
+    if args.no_wait:
+        out.emit("job", flush=True, **job)
+        return 0
+    return 0 if final.get("state") == "done" else 1
+
+
+def _emit_log(out: JsonLinesWriter, since: int, counts_before: Dict[str, int]) -> None:
+    """輸出本次命令的警告 / 錯誤計數與最近幾筆事件 (沒有時不輸出)"""
+    recent = EVENT_LOG.events(since=since, level=WARNING, limit=LOG_TAIL)
+    if not recent:
+        return
+    counts = {
+        code: count - counts_before.get(code, 0)
+        for code, count in EVENT_LOG.counts.items() if count > counts_before.get(code, 0)
+    }
+    out.emit("log", flush=True, counts=counts, recent=[event.as_dict() for event in recent])
+
+
+def run(args: argparse.Namespace, out: JsonLinesWriter) -> int:
+    """
+    執行子命令
+
+    Returns:
+        結束代碼 (0 = 成功, 1 = 有失敗項目, 2 = 參數錯誤)
+    """
+    if getattr(args, "log", None):
+        EVENT_LOG.set_sink(args.log)
+    since, counts_before = EVENT_LOG.last_seq, dict(EVENT_LOG.counts)
+    try:
+        return _run_command(args, out)
+    finally:
+        _emit_log(out, since, counts_before)
+
+
+def _run_command(args: argparse.Namespace, out: JsonLinesWriter) -> int:
+    """執行子命令 (run 的本體)"""
+    if args.command == "jobs":
+        return _run_jobs(args, out)
+    if args.command == "serve":
+        return _serve(args, out)
+    if args.command == "submit":
+        return _submit(args, out)
+
+    renamer = _make_renamer(args)
+
+    if args.command in ("resume", "undo"):
+        if not args.journal.exists():
+            out.emit("error", flush=True, message=f"journal not found: {args.journal}")
+            return 2
+        if args.command == "resume":
+            renamer.resume_journal(args.journal, durable=args.durable)
+        else:
+            renamer.undo_journal(args.journal, durable=args.durable)
+        return _emit_summary(out, renamer)
+
+    if args.command == "index":
+        stats = renamer.inventory.refresh(args.root)
+        renamer.inventory.close()
+        out.emit("summary", flush=True, **vars(stats))
+        return 0
+
+    if not args.root.is_dir():
+        out.emit("error", flush=True, message=f"not a directory: {args.root}")
+        return 2
+
+    if args.op == "mapping" and args.mapping is None:
+        out.emit("error", flush=True, message="--op mapping requires --mapping FILE")
+        return 2
+    if args.companions:
+        try:
+            parse_companion_rules(args.companions)
+        except ValueError as e:
+            out.emit("error", flush=True, message=str(e))
+            return 2
+    try:
+        settings = _scan_settings(args)
+    except (OSError, UnicodeDecodeError) as e:
+        out.emit("error", flush=True, message=f"cannot read mapping file {args.mapping}: {e}")
+        return 2
+
+    if args.command == "scan":
+        total = changed = 0
+        for item, new_name in renamer.iter_targets(**settings):
+            total += 1
+            changed += item.name != new_name
+            out.emit("entry", path=str(item), new_name=new_name, changed=item.name != new_name)
+        _emit_mapping_report(out, settings)
+        _emit_stats(out, renamer)
+        out.emit("summary", flush=True, total=total, changed=changed)
+        return 0
+
+    if args.command == "preview":
+        changed = 0
+        for item, new_name in renamer.iter_targets(**settings):
+            if item.name == new_name:
+                continue
+            changed += 1
+            out.emit("entry", path=str(item), new_name=new_name)
+            if args.limit and changed >= args.limit:
+                break
+        _emit_mapping_report(out, settings)
+        _emit_stats(out, renamer)
+        out.emit("summary", flush=True, changed=changed, truncated=bool(args.limit and changed >= args.limit))
+        return 0
+
+    if args.command == "export":
+        try:
+            stats = export_plan(
+                renamer.iter_targets(**settings), args.output, fmt=args.format, root=args.root,
+                changed_only=not args.all, undo=args.undo, compress=args.gzip
+            )
+        except ValueError as e:
+            out.emit("error", flush=True, message=str(e))
+            return 2
+        _emit_mapping_report(out, settings)
+        _emit_stats(out, renamer)
+        out.emit("summary", flush=True, **vars(stats))
+        return 0
+
+    if args.command == "mirror":
+        try:
+            stats = mirror_plan(
+                renamer.iter_targets(**settings), args.root, args.output, method=args.method,
+                follow_symlinks=args.symlinks == "follow"
+            )
+        except ValueError as e:
+            out.emit("error", flush=True, message=str(e))
+            return 2
+        _emit_mapping_report(out, settings)
+        _emit_stats(out, renamer)
+        out.emit("summary", flush=True, **vars(stats))
+        return 1 if stats.failed else 0
+
+    if args.command == "reorganize":
+        return _reorganize(args, out, renamer, settings)
+
+    # execute
+    plan = renamer.build_plan(settings)
+    _emit_mapping_report(out, settings)
+    out.emit("plan", flush=True, total=plan.total_count, changed=plan.changed_count)
+    progress = ThrottledProgress(
+        lambda success, failed, total: out.emit("progress", flush=True, success=success, failed=failed, total=total),
+        PROGRESS_INTERVAL
+    )
+    renamer.execute_rename(
+        plan.changed,
+        journal=RenameJournal(args.journal) if args.journal else None,
+        durable=args.durable,
+        sync_every=args.sync_every,
+        progress=progress
+    )
+    _emit_stats(out, renamer)
+    return _emit_summary(out, renamer)
+
+
+def _reorganize(args: argparse.Namespace, out: JsonLinesWriter, renamer: FileRenamer, settings: Dict[str, Any]) -> int:
+    """依樣式移動檔案 (--dry-run 只列出)"""
+    try:
+        plan = renamer.build_reorganize_plan(settings, args.pattern, args.dest)
+    except ValueError as e:
+        out.emit("error", flush=True, message=str(e))
+        return 2
+    _emit_mapping_report(out, settings)
+    for item, target in plan.conflicts:
+        out.emit("conflict", path=str(item), target=str(target))
+    out.emit(
+        "plan", flush=True, total=plan.scanned, changed=len(plan.moves), unchanged=plan.unchanged,
+        new_dirs=len(plan.new_dirs), conflicts=len(plan.conflicts), skipped_dirs=plan.skipped_dirs
+    )
+    if args.dry_run:
+        for item, target in plan.moves:
+            out.emit("entry", path=str(item), target=str(target))
+        _emit_stats(out, renamer)
+        return 0
+
+    progress = ThrottledProgress(
+        lambda success, failed, total: out.emit("progress", flush=True, success=success, failed=failed, total=total),
+        PROGRESS_INTERVAL
+    )
+    renamer.reorganize(
+        plan,
+        journal=RenameJournal(args.journal) if args.journal else None,
+        durable=args.durable,
+        sync_every=args.sync_every,
+        progress=progress
+    )
+    _emit_stats(out, renamer)
+    return _emit_summary(out, renamer, skipped_dirs=plan.skipped_dirs)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "op", None) == "mapping" and args.mapping is None:
+        parser.error("--op mapping requires --mapping FILE")
+    return run(args, JsonLinesWriter(sys.stdout))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
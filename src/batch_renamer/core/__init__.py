@@ -1,4 +1,25 @@
 """Core business logic module"""
 from .renamer import FileRenamer
+from .journal import RenameJournal, JournalState
+from .durability import RenameSummary
+from .executor import RenameControl, RenameWorker, ThrottledProgress
+from .plan import RenamePlan
+from .inventory import InventoryIndex
+from .stats import PerfStats
+from .fs import FileSystem, LocalFileSystem, MemoryFileSystem
 
-__all__ = ['FileRenamer']
+__all__ = [
+    'FileRenamer',
+    'RenameJournal',
+    'JournalState',
+    'RenameSummary',
+    'RenameControl',
+    'RenameWorker',
+    'ThrottledProgress',
+    'RenamePlan',
+    'InventoryIndex',
+    'PerfStats',
+    'FileSystem',
+    'LocalFileSystem',
+    'MemoryFileSystem'
+]
@@ -0,0 +1,132 @@
+"""Durable rename support - batched fsync of touched parent directories"""
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from ..utils.eventlog import EVENT_LOG, FSYNC_FAILED
+
+
+@dataclass
+class RenameSummary:
+    """單次重命名執行的統計摘要"""
+
+    success: int = 0
+    failed: int = 0
+    total: int = 0
+    cancelled: bool = False
+    elapsed: float = 0.0
+    durable: bool = False
+    dirs_synced: int = 0
+    fsync_calls: int = 0
+    fsync_seconds: float = 0.0
+    # 執行途中拋出例外時的錯誤訊息 (None = 正常結束或取消)
+    error: Optional[str] = None
+
+    @property
+    def fsync_overhead(self) -> float:
+        """fsync 佔總耗時的比例 (0~1)"""
+        return self.fsync_seconds / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class DirectorySyncer:
+    """
+    Track parent directories touched by renames and fsync each once per batch
+
+    重命名是由深到淺執行，資料夾內容改名後資料夾本身可能在同一批中被改名，
+    原本記下的路徑便不再存在。因此每個待同步目錄也登記在其所有上層之下，
+    某個資料夾被改名時，立即以新路徑同步其下所有待同步目錄 (之後不會再觸及它們)，
+    其餘目錄照常等到批次結束。
+    """
+
+    def __init__(self, summary: RenameSummary, sync_every: int = 0, sync: Optional[Callable[[Path], bool]] = None):
+        """
+        Args:
+            summary: 用於累計 fsync 成本的摘要
+            sync_every: 每多少筆操作同步一次 (0 = 僅在結束時同步)
+            sync: 同步單一目錄的函式 (預設 fsync_directory)
+        """
+        self.summary = summary
+        self.sync_every = sync_every
+        self.sync = sync if sync is not None else fsync_directory
+        self._pending: Set[Path] = set()
+        # 資料夾 (含本身) -> 位於其下的待同步目錄
+        self._covered: Dict[Path, Set[Path]] = {}
+        self._ops = 0
+
+    def touch(self, src: Path, dst: Path) -> None:
+        """記錄一次成功的重命名所影響的目錄"""
+        if src in self._covered:
+            self._flush_moved(src, dst)
+        self._add(src.parent)
+        self._add(dst.parent)
+        self._ops += 1
+        if self.sync_every and self._ops >= self.sync_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """對所有待同步目錄各執行一次 fsync"""
+        if self._pending:
+            self._sync_all(self._pending)
+        self._pending.clear()
+        self._covered.clear()
+        self._ops = 0
+
+    def _add(self, directory: Path) -> None:
+        if directory in self._pending:
+            return
+        self._pending.add(directory)
+        covered = self._covered
+        for ancestor in (directory, *directory.parents):
+            covered.setdefault(ancestor, set()).add(directory)
+
+    def _flush_moved(self, src: Path, dst: Path) -> None:
+        """src 已改名為 dst：以新路徑同步其下的待同步目錄並移出待同步集合"""
+        moved = self._covered.pop(src)
+        for directory in moved:
+            self._pending.discard(directory)
+            for ancestor in directory.parents:
+                under = self._covered.get(ancestor)
+                if under is not None:
+                    under.discard(directory)
+                    if not under:
+                        del self._covered[ancestor]
+            self._covered.pop(directory, None)
+        self._sync_all(dst / directory.relative_to(src) for directory in moved)
+
+    def _sync_all(self, directories: Iterable[Path]) -> None:
+        start = time.perf_counter()
+        for directory in directories:
+            self.summary.fsync_calls += 1
+            if self.sync(directory):
+                self.summary.dirs_synced += 1
+        self.summary.fsync_seconds += time.perf_counter() - start
+
+
+def fsync_directory(directory: Path) -> bool:
+    """
+    對目錄執行 fsync，使其中的目錄項變更落盤
+
+    Args:
+        directory: 目錄路徑
+
+    Returns:
+        是否成功同步 (Windows 不支援目錄 fsync，回傳 False)
+    """
+    if os.name == "nt":
+        return False
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError as ex:
+        EVENT_LOG.error(FSYNC_FAILED, str(ex), directory)
+        return False
+    try:
+        os.fsync(fd)
+        return True
+    except OSError as ex:
+        EVENT_LOG.error(FSYNC_FAILED, str(ex), directory)
+        return False
+    finally:
+        os.close(fd)
@@ -0,0 +1,130 @@
+"""Background rename execution - throttled progress, pause/resume/cancel"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from .durability import RenameSummary
+from .journal import RenameJournal
+
+# 進度回呼簽名: (成功數量, 失敗數量, 總數量)
+ProgressCallback = Callable[[int, int, int], None]
+
+
+class RenameControl:
+    """Pause / resume / cancel signals, checked between rename operations"""
+
+    def __init__(self):
+        self._running = threading.Event()
+        self._running.set()
+        self._cancelled = threading.Event()
+
+    def pause(self) -> None:
+        """暫停 (目前操作完成後生效)"""
+        self._running.clear()
+
+    def resume(self) -> None:
+        """繼續執行"""
+        self._running.set()
+
+    def cancel(self) -> None:
+        """取消 (目前操作完成後停止)"""
+        self._cancelled.set()
+        self._running.set()
+
+    @property
+    def is_paused(self) -> bool:
+        return not self._running.is_set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def wait(self) -> bool:
+        """
+        暫停時阻塞直到繼續或取消
+
+        Returns:
+            True = 可繼續執行下一筆, False = 已取消
+        """
+        self._running.wait()
+        return not self._cancelled.is_set()
+
+
+class ThrottledProgress:
+    """Forward progress to a callback at most once per interval"""
+
+    def __init__(self, callback: ProgressCallback, interval: float = 0.1):
+        """
+        Args:
+            callback: 實際的進度回呼 (例如更新 UI)
+            interval: 最短回呼間隔 (秒)
+        """
+        self.callback = callback
+        self.interval = interval
+        self._last = 0.0
+
+    def __call__(self, success: int, failed: int, total: int) -> None:
+        now = time.monotonic()
+        if now - self._last >= self.interval or success + failed >= total:
+            self._last = now
+            self.callback(success, failed, total)
+
+
+class RenameWorker(threading.Thread):
+    """Run FileRenamer.execute_rename on a background thread"""
+
+    def __init__(
+        self,
+        renamer,
+        targets: List[Tuple[Path, str]],
+        on_progress: Optional[ProgressCallback] = None,
+        on_complete: Optional[Callable[[RenameSummary], None]] = None,
+        refresh_interval: float = 0.1,
+        journal: Optional[RenameJournal] = None,
+        durable: bool = False
+    ):
+        """
+        Args:
+            renamer: FileRenamer 實例
+            targets: [(原始路徑, 新名稱), ...] 列表
+            on_progress: 進度回呼 (依 refresh_interval 節流)
+            on_complete: 完成、取消或失敗後的回呼，參數為這次執行的摘要 (失敗時 error 為錯誤訊息)
+            refresh_interval: 進度回呼的最短間隔 (秒)
+            journal: 預寫日誌 (可選)
+            durable: 是否啟用耐久模式
+        """
+        super().__init__(daemon=True)
+        self.renamer = renamer
+        self.targets = targets
+        self.control = RenameControl()
+        self.on_complete = on_complete
+        self.journal = journal
+        self.durable = durable
+        self.progress = ThrottledProgress(on_progress, refresh_interval) if on_progress else None
+
+    def pause(self) -> None:
+        self.control.pause()
+
+    def resume(self) -> None:
+        self.control.resume()
+
+    def cancel(self) -> None:
+        self.control.cancel()
+
+    def run(self) -> None:
+        # 先換成這次執行的摘要，避免 execute_rename 提早失敗時回報上一次的結果
+        self.renamer.last_summary = RenameSummary(durable=self.durable)
+        try:
+            self.renamer.execute_rename(
+                self.targets,
+                journal=self.journal,
+                durable=self.durable,
+                progress=self.progress,
+                control=self.control
+            )
+        except Exception as e:
+            self.renamer.last_summary.error = f"{type(e).__name__}: {e}"
+        if self.on_complete is not None:
+            self.on_complete(self.renamer.last_summary)
@@ -0,0 +1,157 @@
+"""Streaming plan export - CSV, JSONL or a reversible shell script"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import shlex
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, TextIO, Tuple
+
+from .mapping import relative_key
+
+# 寫入緩衝區大小 (位元組)
+EXPORT_BUFFER_SIZE = 1 << 20
+
+EXPORT_FORMATS = ("csv", "jsonl", "sh")
+
+_SUFFIX_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".sh": "sh"}
+
+# 腳本中的改名函式：目標已存在時略過，不覆蓋
+_SCRIPT_HEADER = """#!/bin/sh
+# Generated by batch-renamer ({direction}). Review before running.
+r() {{
+    if [ -e "$2" ]; then
+        echo "skip (target exists): $2" >&2
+    else
+        mv -- "$1" "$2" || echo "failed: $1" >&2
+    fi
+}}
+"""
+
+
+@dataclass
+class ExportStats:
+    """Counts for one export"""
+
+    path: str
+    format: str
+    scanned: int = 0
+    written: int = 0
+
+
+def detect_format(path: Path) -> str:
+    """依副檔名判斷格式 (忽略 .gz)"""
+    path = Path(path)
+    suffix = Path(path.stem).suffix if path.suffix.lower() == ".gz" else path.suffix
+    fmt = _SUFFIX_FORMATS.get(suffix.lower())
+    if fmt is None:
+        raise ValueError(f"cannot tell export format from '{path.name}', use one of {EXPORT_FORMATS}")
+    return fmt
+
+
+def open_export(path: Path, compress: Optional[bool] = None) -> TextIO:
+    """
+    開啟大區塊緩衝的文字輸出 (可選 gzip)
+
+    Args:
+        path: 輸出檔案
+        compress: 是否以 gzip 壓縮 (None = 副檔名為 .gz 時壓縮)
+    """
+    path = Path(path)
+    if compress is None:
+        compress = path.suffix.lower() == ".gz"
+    if compress:
+        raw = io.BufferedWriter(gzip.GzipFile(path, "wb"), EXPORT_BUFFER_SIZE)
+        return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="", buffering=EXPORT_BUFFER_SIZE)
+
+
+class _ScriptPaths:
+    """
+    Rewrite pre-order paths to where they will be when the script reaches them
+
+    腳本依掃描的先序順序執行 (資料夾先於其內容)，因此資料夾改名後，
+    其下項目的路徑要換成新的資料夾路徑。只保留目前所在分支的已改名祖先 (記憶體與深度成正比)。
+    """
+
+    def __init__(self):
+        self._renamed: List[Tuple[str, str]] = []
+
+    def current(self, path: str) -> str:
+        while self._renamed and not path.startswith(self._renamed[-1][0] + os.sep):
+            self._renamed.pop()
+        if self._renamed:
+            old, new = self._renamed[-1]
+            return new + path[len(old):]
+        return path
+
+    def renamed(self, old: str, new: str) -> None:
+        self._renamed.append((old, new))
+
+
+def export_plan(
+    targets: Iterable[Tuple[Path, str]],
+    path: Path,
+    fmt: Optional[str] = None,
+    root: Optional[Path] = None,
+    changed_only: bool = True,
+    undo: bool = False,
+    compress: Optional[bool] = None
+) -> ExportStats:
+    """
+    將掃描結果逐筆寫入檔案，不建立完整列表
+
+    Args:
+        targets: (原始路徑, 新名稱)，須為掃描的先序順序 (例如 FileRenamer.iter_targets)
+        path: 輸出檔案
+        fmt: "csv" / "jsonl" / "sh" (None = 依副檔名)
+        root: 提供時 CSV 的舊路徑改為相對路徑 (可直接當作 --mapping 使用)
+        changed_only: 只輸出名稱有變化的項目 (腳本一律只含有變化的項目)
+        undo: 腳本改為還原方向 (新名稱 -> 原始名稱)
+        compress: 是否以 gzip 壓縮 (None = 副檔名為 .gz 時壓縮)
+
+    Returns:
+        ExportStats
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format: {fmt}")
+
+    stats = ExportStats(path=str(path), format=fmt)
+    if root is not None:
+        root = Path(root)
+
+    with open_export(path, compress) as fh:
+        if fmt == "csv":
+            writer = csv.writer(fh)
+            writer.writerow(["old", "new"] if root is not None else ["path", "new_name"])
+        elif fmt == "sh":
+            fh.write(_SCRIPT_HEADER.format(direction="undo" if undo else "rename"))
+            paths = _ScriptPaths()
+
+        for item, new_name in targets:
+            stats.scanned += 1
+            changed = item.name != new_name
+            if not changed and (changed_only or fmt == "sh"):
+                continue
+            stats.written += 1
+
+            if fmt == "csv":
+                old = relative_key(item, root) if root is not None else str(item)
+                writer.writerow([old, new_name])
+            elif fmt == "jsonl":
+                fh.write(json.dumps({"path": str(item), "new_name": new_name, "changed": changed}, ensure_ascii=False) + "\n")
+            elif undo:
+                # 還原同樣依先序：上層資料夾先改回原名，其下項目即回到原始路徑
+                parent = str(item.parent)
+                fh.write(f"r {shlex.quote(os.path.join(parent, new_name))} {shlex.quote(str(item))}\n")
+            else:
+                src = paths.current(str(item))
+                dst = os.path.join(os.path.dirname(src), new_name)
+                paths.renamed(str(item), dst)
+                fh.write(f"r {shlex.quote(src)} {shlex.quote(dst)}\n")
+
+    return stats
@@ -0,0 +1,352 @@
+"""Filesystem backends - local disk and an in-memory tree for tests and benchmarks"""
+
+import errno
+import itertools
+import os
+import stat as stat_module
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+from .durability import fsync_directory
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+@dataclass
+class FileStat:
+    """The stat fields the scanner and plan use (os.stat_result provides the same names)"""
+
+    st_mode: int
+    st_ino: int
+    st_dev: int
+    st_mtime_ns: int
+    st_size: int = 0
+
+
+class FileSystem(ABC):
+    """
+    Operations used by the scanner and executor
+
+    掃描與執行只透過這些方法存取檔案系統；錯誤以與 os 模組相同的 OSError 子類別拋出。
+    子類別必須實作 list_dir / stat / lstat / rename / mkdir，其餘方法有以 stat 為基礎的預設實作。
+    """
+
+    @abstractmethod
+    def list_dir(self, path: PathLike) -> Iterator[Tuple[str, bool, bool]]:
+        """
+        列出資料夾 (惰性；錯誤在第一次迭代時拋出)
+
+        Yields:
+            (名稱, 是否為資料夾, 是否為符號連結)；類型不跟隨符號連結
+        """
+
+    @abstractmethod
+    def stat(self, path: PathLike):
+        """取得狀態 (跟隨符號連結)，回傳具有 st_mode / st_ino / st_dev / st_mtime_ns / st_size 的物件"""
+
+    @abstractmethod
+    def lstat(self, path: PathLike):
+        """取得狀態 (不跟隨符號連結)"""
+
+    @abstractmethod
+    def rename(self, src: PathLike, dst: PathLike) -> None:
+        """重命名 (語意同 POSIX rename：目標為檔案時取代)"""
+
+    @abstractmethod
+    def mkdir(self, path: PathLike, parents: bool = False, exist_ok: bool = False) -> None:
+        """建立資料夾"""
+
+    def exists(self, path: PathLike) -> bool:
+        try:
+            self.stat(path)
+        except OSError:
+            return False
+        return True
+
+    def is_dir(self, path: PathLike) -> bool:
+        """是否為資料夾 (跟隨符號連結；不存在時為 False)"""
+        try:
+            return stat_module.S_ISDIR(self.stat(path).st_mode)
+        except OSError:
+            return False
+
+    def sync_dir(self, path: PathLike) -> bool:
+        """讓資料夾的目錄項變更落盤 (不支援時回傳 False)"""
+        return False
+
+
+class LocalFileSystem(FileSystem):
+    """The local disk through os.scandir / os.stat / os.rename"""
+
+    def list_dir(self, path: PathLike) -> Iterator[Tuple[str, bool, bool]]:
+        with os.scandir(path) as it:
+            for entry in it:
+                is_link = entry.is_symlink()
+                yield entry.name, not is_link and entry.is_dir(follow_symlinks=False), is_link
+
+    def stat(self, path: PathLike) -> os.stat_result:
+        return os.stat(path)
+
+    def lstat(self, path: PathLike) -> os.stat_result:
+        return os.lstat(path)
+
+    def rename(self, src: PathLike, dst: PathLike) -> None:
+        os.rename(src, dst)
+
+    def mkdir(self, path: PathLike, parents: bool = False, exist_ok: bool = False) -> None:
+        Path(path).mkdir(parents=parents, exist_ok=exist_ok)
+
+    def exists(self, path: PathLike) -> bool:
+        return os.path.exists(path)
+
+    def is_dir(self, path: PathLike) -> bool:
+        return os.path.isdir(path)
+
+    def sync_dir(self, path: PathLike) -> bool:
+        return fsync_directory(Path(path))
+
+
+# 行程共用的本機檔案系統
+LOCAL_FS = LocalFileSystem()
+
+
+class _Dir:
+    """In-memory folder: name -> child (int inode = file, _Dir, or _Link)"""
+
+    __slots__ = ("children", "ino", "mtime_ns")
+
+    def __init__(self, ino: int):
+        self.children: Dict[str, object] = {}
+        self.ino = ino
+        self.mtime_ns = 0
+
+
+class _Link:
+    """In-memory symbolic link"""
+
+    __slots__ = ("target", "ino")
+
+    def __init__(self, target: str, ino: int):
+        self.target = target
+        self.ino = ino
+
+
+def _error(code: int, path: PathLike) -> OSError:
+    """建立與 os 模組相同類型的 OSError (例如 ENOENT -> FileNotFoundError)"""
+    return OSError(code, os.strerror(code), os.fspath(path))
+
+
+class MemoryFileSystem(FileSystem):
+    """
+    Whole tree held in nested dicts (absolute POSIX paths, no disk I/O)
+
+    檔案只記錄 inode 編號 (不存內容)，資料夾的 mtime 在子項目變動時遞增，
+    讓計畫的過期檢查與真實檔案系統行為一致。上層資料夾的查詢結果依路徑字串快取，
+    資料夾或連結被改名時整個清除。後端本身每次操作約 1-3 µs，掃描與執行的耗時主要來自
+    引擎的 Path 與轉換運算 (20 萬項目約 3 秒掃描、5 秒執行，並非數秒內處理百萬項目)。
+    """
+
+    # 所有項目共用的裝置編號
+    DEVICE = 1
+
+    def __init__(self):
+        self._inodes = itertools.count(2)
+        self._clock = itertools.count(1)
+        self.root = _Dir(1)
+        # 資料夾路徑字串 -> 節點 (只存已存在的資料夾)
+        self._dirs: Dict[str, _Dir] = {}
+
+    # ------------------------------------------------------------------
+    # 路徑解析
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _parts(path: PathLike) -> List[str]:
+        path = os.fspath(path)
+        if not path.startswith("/"):
+            raise ValueError(f"MemoryFileSystem needs absolute paths: {path}")
+        return [part for part in path.split("/") if part and part != "."]
+
+    def _resolve(self, path: PathLike, follow: bool = True, depth: int = 0) -> object:
+        """取得節點 (中間的符號連結一律跟隨，最後一段依 follow)"""
+        if depth > 40:
+            raise _error(errno.ELOOP, path)
+        node: object = self.root
+        parts = self._parts(path)
+        for i, part in enumerate(parts):
+            if isinstance(node, _Link):
+                node = self._resolve(node.target, True, depth + 1)
+            if not isinstance(node, _Dir):
+                raise _error(errno.ENOTDIR, path)
+            if part == "..":
+                # 以字串方式回到上一層後重新解析
+                return self._resolve("/" + "/".join(parts[:max(i - 1, 0)] + parts[i + 1:]), follow, depth + 1)
+            child = node.children.get(part)
+            if child is None:
+                raise _error(errno.ENOENT, path)
+            node = child
+        if follow and isinstance(node, _Link):
+            node = self._resolve(node.target, True, depth + 1)
+        return node
+
+    def _parent(self, path: PathLike) -> Tuple[_Dir, str]:
+        """取得上層資料夾節點與最後一段名稱"""
+        text = os.fspath(path)
+        parent_path, _, name = text.rpartition("/")
+        if not text.startswith("/") or name in ("", ".", ".."):
+            # 少見的寫法 (結尾斜線、. 或 ..) 先正規化
+            parts = self._parts(path)
+            if not parts or parts[-1] == "..":
+                raise _error(errno.EBUSY if not parts else errno.EINVAL, path)
+            parent_path, name = "/" + "/".join(parts[:-1]), parts[-1]
+        parent = self._dirs.get(parent_path)
+        if parent is None:
+            parent = self._resolve(parent_path or "/")
+            if not isinstance(parent, _Dir):
+                raise _error(errno.ENOTDIR, path)
+            self._dirs[parent_path] = parent
+        return parent, name
+
+    def _node(self, path: PathLike) -> object:
+        """取得節點 (跟隨符號連結)；經由上層資料夾快取查詢"""
+        if os.fspath(path).rstrip("/") == "":
+            return self.root
+        parent, name = self._parent(path)
+        node = parent.children.get(name)
+        if node is None:
+            raise _error(errno.ENOENT, path)
+        if isinstance(node, _Link):
+            node = self._resolve(node.target)
+        return node
+
+    def _touch_dir(self, directory: _Dir) -> None:
+        directory.mtime_ns = next(self._clock)
+
+    # ------------------------------------------------------------------
+    # FileSystem
+    # ------------------------------------------------------------------
+    def list_dir(self, path: PathLike) -> Iterator[Tuple[str, bool, bool]]:
+        node = self._node(path)
+        if not isinstance(node, _Dir):
+            raise _error(errno.ENOTDIR, path)
+        # 先複製名稱：走訪期間改名不影響本次列出
+        for name, child in list(node.children.items()):
+            yield name, isinstance(child, _Dir), isinstance(child, _Link)
+
+    def stat(self, path: PathLike) -> FileStat:
+        node = self._node(path)
+        if isinstance(node, _Dir):
+            return FileStat(stat_module.S_IFDIR | 0o755, node.ino, self.DEVICE, node.mtime_ns)
+        return FileStat(stat_module.S_IFREG | 0o644, node, self.DEVICE, 0)
+
+    def lstat(self, path: PathLike) -> FileStat:
+        if os.fspath(path).rstrip("/") == "":
+            node = self.root
+        else:
+            parent, name = self._parent(path)
+            node = parent.children.get(name)
+            if node is None:
+                raise _error(errno.ENOENT, path)
+        if isinstance(node, _Link):
+            return FileStat(stat_module.S_IFLNK | 0o777, node.ino, self.DEVICE, 0, len(node.target))
+        return self.stat(path)
+
+    def rename(self, src: PathLike, dst: PathLike) -> None:
+        src_parent, src_name = self._parent(src)
+        node = src_parent.children.get(src_name)
+        if node is None:
+            raise _error(errno.ENOENT, src)
+        dst_parent, dst_name = self._parent(dst)
+        if dst_parent is src_parent and dst_name == src_name:
+            return
+
+        if isinstance(node, _Dir) and dst_parent is not src_parent:
+            # 不能把資料夾移到自己底下 (同一資料夾內改名不可能發生，不必走訪子樹)
+            ancestor = dst_parent
+            if ancestor is node or self._contains(node, ancestor):
+                raise _error(errno.EINVAL, dst)
+
+        existing = dst_parent.children.get(dst_name)
+        if existing is not None:
+            if isinstance(existing, _Dir):
+                if not isinstance(node, _Dir):
+                    raise _error(errno.EISDIR, dst)
+                if existing.children:
+                    raise _error(errno.ENOTEMPTY, dst)
+            elif isinstance(node, _Dir):
+                raise _error(errno.ENOTDIR, dst)
+
+        del src_parent.children[src_name]
+        dst_parent.children[dst_name] = node
+        if not isinstance(node, int) or isinstance(existing, _Dir):
+            # 資料夾或連結換了位置，快取的路徑不再可靠
+            self._dirs.clear()
+        self._touch_dir(src_parent)
+        self._touch_dir(dst_parent)
+
+    @staticmethod
+    def _contains(directory: _Dir, target: _Dir) -> bool:
+        """target 是否位於 directory 之下"""
+        stack = [directory]
+        while stack:
+            for child in stack.pop().children.values():
+                if child is target:
+                    return True
+                if isinstance(child, _Dir):
+                    stack.append(child)
+        return False
+
+    def mkdir(self, path: PathLike, parents: bool = False, exist_ok: bool = False) -> None:
+        try:
+            parent, name = self._parent(path)
+        except FileNotFoundError:
+            if not parents:
+                raise
+            self.mkdir(os.path.dirname(os.fspath(path)), parents=True, exist_ok=True)
+            parent, name = self._parent(path)
+        existing = parent.children.get(name)
+        if existing is not None:
+            if exist_ok and isinstance(self._node(path), _Dir):
+                return
+            raise _error(errno.EEXIST, path)
+        parent.children[name] = _Dir(next(self._inodes))
+        self._touch_dir(parent)
+
+    def sync_dir(self, path: PathLike) -> bool:
+        # 記憶體中沒有需要落盤的資料
+        return True
+
+    # ------------------------------------------------------------------
+    # 建立測試資料
+    # ------------------------------------------------------------------
+    def add_file(self, path: PathLike, parents: bool = False) -> None:
+        """建立 (空) 檔案"""
+        if parents:
+            self.mkdir(os.path.dirname(os.fspath(path)), parents=True, exist_ok=True)
+        parent, name = self._parent(path)
+        if name in parent.children:
+            raise _error(errno.EEXIST, path)
+        parent.children[name] = next(self._inodes)
+        self._touch_dir(parent)
+
+    def symlink(self, target: PathLike, path: PathLike) -> None:
+        """建立指向 target (絕對路徑) 的符號連結"""
+        parent, name = self._parent(path)
+        if name in parent.children:
+            raise _error(errno.EEXIST, path)
+        parent.children[name] = _Link(os.fspath(target), next(self._inodes))
+        self._touch_dir(parent)
+
+    def walk_paths(self, path: PathLike = "/") -> Iterator[str]:
+        """以先序產生 path 之下所有項目的絕對路徑 (不跟隨符號連結)"""
+        base = "/" + "/".join(self._parts(path))
+        stack = [(base.rstrip("/"), self._resolve(path))]
+        while stack:
+            prefix, node = stack.pop()
+            for name in sorted(node.children, reverse=True):
+                child = node.children[name]
+                child_path = f"{prefix}/{name}"
+                yield child_path
+                if isinstance(child, _Dir):
+                    stack.append((child_path, child))
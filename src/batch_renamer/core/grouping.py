@@ -0,0 +1,151 @@
+"""Companion grouping - rename sidecar files (.xmp, .json, .srt ...) together with their primary file"""
+
+import os
+from pathlib import Path
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from ..utils.constants import DEFAULT_COMPANION_RULES
+
+# 附屬副檔名 -> 主檔副檔名 (依優先順序，皆為小寫含點)
+CompanionRules = Dict[str, Tuple[str, ...]]
+
+
+def _normalize_ext(ext: str) -> str:
+    ext = ext.strip().lower()
+    return ext if ext.startswith(".") else f".{ext}"
+
+
+def parse_companion_rules(spec: Union[str, Mapping[str, Sequence[str]]]) -> CompanionRules:
+    """
+    解析附屬檔案規則
+
+    Args:
+        spec: "default" (內建規則)、"xmp=jpg,cr2; srt=mkv,mp4" 形式的字串，或 {附屬: [主檔, ...]}
+
+    Returns:
+        {".xmp": (".jpg", ".cr2"), ...}
+
+    Raises:
+        ValueError: 格式錯誤
+    """
+    if isinstance(spec, str):
+        if spec.strip().lower() == "default":
+            return dict(DEFAULT_COMPANION_RULES)
+        parsed = {}
+        for part in spec.split(";"):
+            if not part.strip():
+                continue
+            companion, sep, primaries = part.partition("=")
+            if not sep or not companion.strip() or not primaries.strip():
+                raise ValueError(f"invalid companion rule '{part.strip()}', expected 'xmp=jpg,cr2'")
+            parsed[companion] = [e for e in primaries.split(",") if e.strip()]
+        spec = parsed
+    rules = {
+        _normalize_ext(companion): tuple(_normalize_ext(e) for e in primaries)
+        for companion, primaries in spec.items()
+    }
+    if not rules:
+        raise ValueError("no companion rules given")
+    return rules
+
+
+class CompanionGrouper:
+    """
+    Give companion files the new stem of their primary file, in linear time
+
+    第一次走過掃描結果時以 (資料夾, 主檔名稱去掉副檔名) 建立索引，第二次為每個附屬檔查表，
+    全程只做字串運算，不列出資料夾也不 stat。附屬檔可與主檔同名 (IMG_001.xmp)，
+    或多一段副檔名 (IMG_001.jpg.json、movie.en.srt)，多出的部分改名後保留。
+    名稱相同的主檔有多個時，優先選擇副檔名與中間那段相同者，其次依規則中的順序。
+    資料夾不參與分組 (既不當主檔也不當附屬檔)。
+    """
+
+    def __init__(self, rules: CompanionRules):
+        self.rules = rules
+        self.primary_exts = {ext for primaries in rules.values() for ext in primaries}
+        # 找到主檔而改用主檔名稱的附屬檔數
+        self.grouped = 0
+        # 因副檔名篩選而加入掃描、但沒有主檔因此移除的附屬檔數
+        self.dropped = 0
+
+    def group(
+        self,
+        targets: Iterable[Tuple[Path, str]],
+        valid_exts: Optional[Sequence[str]] = None,
+        directories: AbstractSet[str] = frozenset()
+    ) -> List[Tuple[Path, str]]:
+        """
+        調整附屬檔的新名稱 (依原順序回傳)
+
+        Args:
+            targets: 掃描結果 (原始路徑, 新名稱)
+            valid_exts: 原本的副檔名篩選；不在其中且找不到主檔的附屬檔會被移除 (None = 不篩選)
+            directories: 掃描結果中屬於資料夾的路徑字串 (略過，不參與分組)
+
+        Returns:
+            [(原始路徑, 新名稱), ...]
+        """
+        entries = targets if isinstance(targets, list) else list(targets)
+        rules = self.rules
+        primary_exts = self.primary_exts
+        sep = os.sep
+
+        # (資料夾, 主檔名稱去掉副檔名) -> [(索引, 副檔名), ...]
+        primaries: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+        companions = []
+        for i, (item, _) in enumerate(entries):
+            path = str(item)
+            directory, _, name = path.rpartition(sep)
+            dot = name.rfind(".")
+            if dot <= 0 or path in directories:
+                continue
+            ext = name[dot:].lower()
+            if ext in rules:
+                companions.append((i, directory, name, dot, ext))
+            elif ext in primary_exts:
+                primaries.setdefault((directory, name[:dot]), []).append((i, ext))
+
+        drop = set()
+        for i, directory, name, dot, ext in companions:
+            allowed = rules[ext]
+            head = name[:dot]
+            primary = self._pick(primaries.get((directory, head)), allowed, None)
+            if primary is None:
+                inner = head.rfind(".")
+                if inner > 0:
+                    primary = self._pick(primaries.get((directory, head[:inner])), allowed, head[inner:].lower())
+                    head = head[:inner]
+            if primary is None:
+                if valid_exts is not None and ext not in valid_exts:
+                    drop.add(i)
+                continue
+
+            primary_new = entries[primary][1]
+            stem_end = primary_new.rfind(".")
+            new_stem = primary_new[:stem_end] if stem_end > 0 else primary_new
+            entries[i] = (entries[i][0], new_stem + name[len(head):])
+            self.grouped += 1
+
+        if drop:
+            self.dropped += len(drop)
+            entries = [entry for i, entry in enumerate(entries) if i not in drop]
+        return entries
+
+    @staticmethod
+    def _pick(
+        candidates: Optional[List[Tuple[int, str]]],
+        allowed: Tuple[str, ...],
+        preferred: Optional[str]
+    ) -> Optional[int]:
+        """從同名主檔中選出一個 (回傳索引)"""
+        if not candidates:
+            return None
+        best, best_rank = None, len(allowed)
+        for index, ext in candidates:
+            if ext == preferred and ext in allowed:
+                return index
+            if ext in allowed:
+                rank = allowed.index(ext)
+                if rank < best_rank:
+                    best, best_rank = index, rank
+        return best
@@ -0,0 +1,214 @@
+"""Persistent scan index - incremental re-scan of large archives"""
+
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..utils.eventlog import EVENT_LOG, INDEX_ERROR
+from .fs import FileSystem, LOCAL_FS
+
+# 每重新掃描多少個資料夾提交一次交易
+COMMIT_EVERY = 256
+
+# entries.kind 欄位的值 (不跟隨符號連結)
+KIND_FILE = 0
+KIND_DIR = 1
+KIND_SYMLINK = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    root BLOB NOT NULL,
+    path BLOB NOT NULL,
+    parent BLOB NOT NULL,
+    name BLOB NOT NULL,
+    kind INTEGER NOT NULL,  -- KIND_FILE / KIND_DIR / KIND_SYMLINK
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER,
+    PRIMARY KEY (root, path)
+);
+CREATE INDEX IF NOT EXISTS entries_parent ON entries (root, parent);
+CREATE TABLE IF NOT EXISTS dirs (
+    root BLOB NOT NULL,
+    path BLOB NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (root, path)
+);
+"""
+
+
+@dataclass
+class IndexStats:
+    """索引使用統計"""
+
+    dirs_checked: int = 0
+    dirs_reused: int = 0
+    dirs_rescanned: int = 0
+    entries_written: int = 0
+
+
+class InventoryIndex:
+    """
+    On-disk inventory (SQLite) keyed by root
+
+    記錄每個項目的路徑、類型、大小、修改時間與 inode，以及每個資料夾的修改時間。
+    資料夾的修改時間未變時直接使用索引中的子項目清單 (只需一次 stat)，
+    變化時才重新列出並更新該資料夾。新增、刪除或改名都會更新上層資料夾的修改時間；
+    檔案內容變化不會，因此未變資料夾內的 size / mtime 可能是舊值。
+    被索引的樹透過 fs 存取 (應與 FileRenamer 使用同一個檔案系統)，資料庫本身一律位於本機磁碟。
+    """
+
+    def __init__(self, db_path: Path, fs: FileSystem = LOCAL_FS):
+        """
+        Args:
+            db_path: 索引資料庫路徑 (不存在時建立)
+            fs: 被索引的檔案系統
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.fs = fs
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._dirty = 0
+        self.stats = IndexStats()
+
+    def close(self) -> None:
+        """提交並關閉資料庫"""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def commit(self) -> None:
+        """提交尚未寫入的變更"""
+        with self._lock:
+            self._conn.commit()
+            self._dirty = 0
+
+    @staticmethod
+    def _key(root: Path, path: Path) -> bytes:
+        """項目相對於根目錄的鍵值 (根目錄為空字串)"""
+        rel = os.path.relpath(path, root)
+        return b"" if rel == "." else os.fsencode(Path(rel).as_posix())
+
+    def children(self, root: Path, directory: Path) -> List[Tuple[str, bool, bool]]:
+        """
+        取得資料夾的子項目；資料夾修改時間未變時直接讀索引
+
+        Args:
+            root: 索引的根目錄
+            directory: 要列出的資料夾
+
+        Returns:
+            [(名稱, 是否為資料夾, 是否為符號連結), ...] (依名稱排序；類型不跟隨符號連結)
+        """
+        root_key = os.fsencode(str(root))
+        dir_key = self._key(root, directory)
+        mtime = self.fs.stat(directory).st_mtime_ns
+
+        with self._lock:
+            self.stats.dirs_checked += 1
+            row = self._conn.execute(
+                "SELECT mtime_ns FROM dirs WHERE root = ? AND path = ?", (root_key, dir_key)
+            ).fetchone()
+            if row is not None and row[0] == mtime:
+                self.stats.dirs_reused += 1
+                rows = self._conn.execute(
+                    "SELECT name, kind FROM entries WHERE root = ? AND parent = ? ORDER BY name",
+                    (root_key, dir_key)
+                ).fetchall()
+                return [(os.fsdecode(name), kind == KIND_DIR, kind == KIND_SYMLINK) for name, kind in rows]
+
+        return self._rescan(root_key, dir_key, directory, mtime)
+
+    def _rescan(self, root_key: bytes, dir_key: bytes, directory: Path, mtime: int) -> List[Tuple[str, bool, bool]]:
+        """重新列出資料夾並更新索引"""
+        records = []
+        fs = self.fs
+        dir_str = os.fspath(directory)
+        for entry_name, is_dir, is_link in fs.list_dir(directory):
+            try:
+                st = fs.lstat(os.path.join(dir_str, entry_name))
+            except OSError:
+                continue
+            kind = KIND_SYMLINK if is_link else KIND_DIR if is_dir else KIND_FILE
+            name = os.fsencode(entry_name)
+            path = dir_key + b"/" + name if dir_key else name
+            records.append((root_key, path, dir_key, name, kind, st.st_size, st.st_mtime_ns, st.st_ino))
+        records.sort(key=lambda r: r[3])
+
+        with self._lock:
+            self.stats.dirs_rescanned += 1
+            self.stats.entries_written += len(records)
+
+            # 已消失的子資料夾：連同其下所有項目一併刪除
+            kept_dirs = {r[1] for r in records if r[4] == KIND_DIR}
+            for (old_path,) in self._conn.execute(
+                "SELECT path FROM entries WHERE root = ? AND parent = ? AND kind = ?", (root_key, dir_key, KIND_DIR)
+            ).fetchall():
+                if old_path not in kept_dirs:
+                    self._forget_subtree(root_key, old_path)
+
+            self._conn.execute("DELETE FROM entries WHERE root = ? AND parent = ?", (root_key, dir_key))
+            self._conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records)
+            self._conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", (root_key, dir_key, mtime))
+
+            self._dirty += 1
+            if self._dirty >= COMMIT_EVERY:
+                self.commit()
+
+        return [(os.fsdecode(r[3]), r[4] == KIND_DIR, r[4] == KIND_SYMLINK) for r in records]
+
+    def _forget_subtree(self, root_key: bytes, path: bytes) -> None:
+        """刪除某資料夾及其下所有項目 (以位元組範圍查詢 path/ 前綴)"""
+        low, high = path + b"/", path + b"0"
+        for table in ("entries", "dirs"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE root = ? AND (path = ? OR (path >= ? AND path < ?))",
+                (root_key, path, low, high)
+            )
+
+    def refresh(self, root: Path) -> IndexStats:
+        """
+        增量更新整個根目錄的索引
+
+        Args:
+            root: 根目錄
+
+        Returns:
+            本次更新的統計
+        """
+        before = IndexStats(**vars(self.stats))
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                for name, is_dir, _ in self.children(root, directory):
+                    if is_dir:
+                        stack.append(directory / name)
+            except OSError as e:
+                EVENT_LOG.error(INDEX_ERROR, str(e), directory)
+        self.commit()
+        return IndexStats(**{k: v - getattr(before, k) for k, v in vars(self.stats).items()})
+
+    def lookup(self, root: Path, path: Path) -> Optional[dict]:
+        """
+        查詢單一項目的索引記錄
+
+        Returns:
+            {"is_dir", "is_link", "size", "mtime_ns", "inode"}，不存在時為 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, size, mtime_ns, inode FROM entries WHERE root = ? AND path = ?",
+                (os.fsencode(str(root)), self._key(root, path))
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "is_dir": row[0] == KIND_DIR, "is_link": row[0] == KIND_SYMLINK,
+            "size": row[1], "mtime_ns": row[2], "inode": row[3]
+        }
@@ -0,0 +1,416 @@
+"""Job manifests - many rename jobs run concurrently across roots"""
+
+import json
+import os
+import re
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .executor import ProgressCallback, RenameControl
+from .journal import RenameJournal
+from .mapping import MappingIndex
+from .renamer import FileRenamer
+from ..utils.constants import DEFAULT_SYMLINK_POLICY
+
+# 預設同時執行的工作數上限
+DEFAULT_MAX_WORKERS = 4
+
+# 工作欄位 -> 允許的型別 (TOML / JSON 讀入的值)
+_JOB_FIELDS: Dict[str, Union[type, Tuple[type, ...]]] = {
+    "name": str, "root": str, "mode": str, "ext": (str, list), "operation": str, "find": str, "replace": str,
+    "prefix": str, "suffix": str, "symbols": str, "mapping": str, "symlinks": str, "one_filesystem": bool,
+    "companions": (str, dict), "group": str
+}
+
+
+@dataclass
+class JobSpec:
+    """One (root, filter, operation, formatting) job from a manifest"""
+
+    name: str
+    root: Path
+    mode: str = "files"
+    ext: List[str] = field(default_factory=list)
+    operation: str = "none"
+    find: str = ""
+    replace: str = ""
+    prefix: str = ""
+    suffix: str = ""
+    symbols: str = ""
+    mapping: Optional[Path] = None
+    symlinks: str = DEFAULT_SYMLINK_POLICY
+    one_filesystem: bool = False
+    companions: Optional[Union[str, Dict[str, List[str]]]] = None
+    # 並行限制群組 (例如同一顆磁碟上的工作)，上限由清單的 group_limits 指定
+    group: Optional[str] = None
+
+    def scan_settings(self) -> Dict[str, Any]:
+        """轉為 scan_directory / build_plan 的關鍵字參數 (對照表模式會在此讀入對照檔)"""
+        valid_exts = [e.lower() if e.startswith(".") else f".{e.lower()}" for e in self.ext]
+        settings = dict(
+            root_path=self.root,
+            rename_mode=self.mode,
+            filter_type="ext" if valid_exts else "all",
+            valid_exts=valid_exts,
+            operation=self.operation,
+            find_text=self.find,
+            replace_text=self.replace,
+            prefix=self.prefix,
+            suffix=self.suffix,
+            symbols=self.symbols,
+            symlinks=self.symlinks,
+            one_filesystem=self.one_filesystem,
+            companions=self.companions
+        )
+        if self.operation == "mapping":
+            if self.mapping is None:
+                raise ValueError(f"{self.name}: operation 'mapping' requires 'mapping'")
+            settings["mapping"] = MappingIndex.from_file(self.mapping)
+        return settings
+
+
+@dataclass
+class Manifest:
+    """Parsed job manifest"""
+
+    jobs: List[JobSpec]
+    journal_dir: Path
+    max_workers: int = DEFAULT_MAX_WORKERS
+    # 群組名稱 -> 同時執行的工作數上限
+    group_limits: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class JobResult:
+    """Outcome of one job"""
+
+    name: str
+    root: str
+    journal: str
+    total: int = 0
+    changed: int = 0
+    success: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    mapping: Optional[Dict[str, Any]] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.failed == 0
+
+
+@dataclass
+class BatchSummary:
+    """Combined summary of a manifest run"""
+
+    results: List[JobResult]
+    elapsed: float = 0.0
+
+    @property
+    def success(self) -> int:
+        return sum(r.success for r in self.results)
+
+    @property
+    def failed(self) -> int:
+        return sum(r.failed for r in self.results)
+
+    @property
+    def jobs_failed(self) -> int:
+        return sum(not r.ok for r in self.results)
+
+
+def _read_manifest_data(path: Path) -> Dict[str, Any]:
+    """依副檔名讀取 JSON 或 TOML"""
+    if path.suffix.lower() == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python 3.10
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError("TOML manifests need Python 3.11+ or the 'tomli' package")
+        with open(path, "rb") as fh:
+            return tomllib.load(fh)
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def parse_job(raw: Dict[str, Any], base: Path, default_name: str) -> JobSpec:
+    """
+    將一筆工作設定 (dict) 轉為 JobSpec
+
+    Args:
+        raw: 工作欄位 (ext 可為列表或以逗號分隔的字串)
+        base: 相對 root 的基準目錄
+        default_name: 未指定 name 時使用的名稱
+
+    Raises:
+        ValueError: 未知欄位、欄位型別錯誤或缺少 root
+    """
+    if not isinstance(raw, dict):
+        raise ValueError(f"{default_name}: a job must be a table / object, got {type(raw).__name__}")
+    name = raw.get("name", default_name)
+    unknown = set(raw) - set(_JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"{name}: unknown fields {sorted(unknown)}")
+    if "root" not in raw:
+        raise ValueError(f"{name}: missing 'root'")
+    for key, value in raw.items():
+        _check_type(name, key, value, _JOB_FIELDS[key])
+    ext = raw.get("ext")
+    if isinstance(ext, list) and not all(isinstance(e, str) for e in ext):
+        raise ValueError(f"{name}: 'ext' must be a string or a list of strings")
+
+    spec = dict(raw)
+    spec.setdefault("name", default_name)
+    ext = spec.get("ext", [])
+    spec["ext"] = [e.strip() for e in ext.split(",") if e.strip()] if isinstance(ext, str) else list(ext)
+    spec["root"] = Path(base) / Path(spec["root"]).expanduser()
+    if spec.get("mapping"):
+        spec["mapping"] = Path(base) / Path(spec["mapping"]).expanduser()
+    return JobSpec(**spec)
+
+
+def _check_type(name: str, key: str, value: Any, expected: Union[type, Tuple[type, ...]]) -> None:
+    """欄位型別不符時拋出 ValueError (bool 不視為 int)"""
+    types = expected if isinstance(expected, tuple) else (expected,)
+    if isinstance(value, bool) and bool not in types or not isinstance(value, types):
+        names = " or ".join(t.__name__ for t in types)
+        raise ValueError(f"{name}: '{key}' must be {names}, got {type(value).__name__} {value!r}")
+
+
+def _positive_int(name: str, key: str, value: Any) -> int:
+    _check_type(name, key, value, int)
+    if value < 1:
+        raise ValueError(f"{name}: '{key}' must be at least 1, got {value}")
+    return value
+
+
+def load_manifest(path: Path) -> Manifest:
+    """
+    讀取工作清單 (JSON 或 TOML)
+
+    格式:
+        {"max_workers": 4, "journal_dir": "journals", "group_limits": {"nas": 1},
+         "jobs": [{"name": "inbox", "root": "/drop/inbox", "ext": ["jpg"], "operation": "s2t", "group": "nas", ...}]}
+
+    相對路徑以清單所在目錄為基準。同一 group 的工作同時最多執行 group_limits 指定的數量。
+
+    Args:
+        path: 清單檔案路徑
+
+    Returns:
+        Manifest
+
+    Raises:
+        ValueError: 格式錯誤、未知欄位、欄位型別錯誤或工作名稱重複
+    """
+    path = Path(path)
+    data = _read_manifest_data(path)
+    base = path.resolve().parent
+    manifest_name = path.name
+    if not isinstance(data, dict):
+        raise ValueError(f"{manifest_name}: the manifest must be a table / object")
+    raw_jobs = data.get("jobs", [])
+    _check_type(manifest_name, "jobs", raw_jobs, list)
+    journal_dir = data.get("journal_dir", "journals")
+    _check_type(manifest_name, "journal_dir", journal_dir, str)
+    max_workers = _positive_int(manifest_name, "max_workers", data.get("max_workers", DEFAULT_MAX_WORKERS))
+    group_limits = data.get("group_limits", {})
+    _check_type(manifest_name, "group_limits", group_limits, dict)
+    group_limits = {
+        group: _positive_int(manifest_name, f"group_limits.{group}", limit) for group, limit in group_limits.items()
+    }
+
+    jobs = []
+    names = set()
+    for i, raw in enumerate(raw_jobs):
+        job = parse_job(raw, base, f"job{i + 1}")
+        if job.name in names:
+            raise ValueError(f"duplicate job name: {job.name}")
+        names.add(job.name)
+        jobs.append(job)
+
+    if not jobs:
+        raise ValueError("manifest has no jobs")
+
+    return Manifest(jobs=jobs, journal_dir=base / journal_dir, max_workers=max_workers, group_limits=group_limits)
+
+
+def journal_path(journal_dir: Path, job: JobSpec, run_id: str) -> Path:
+    """每個工作、每次執行各自獨立的 journal 檔案"""
+    safe = re.sub(r"[^\w.-]+", "_", job.name)
+    return Path(journal_dir) / f"{safe}-{run_id}.journal"
+
+
+def run_job(
+    job: JobSpec,
+    journal_file: Optional[Path],
+    durable: bool = False,
+    renamer: Optional[FileRenamer] = None,
+    control: Optional[RenameControl] = None,
+    progress: Optional[ProgressCallback] = None
+) -> JobResult:
+    """
+    執行單一工作 (在工作行程中呼叫，需可被 pickle)
+
+    Args:
+        job: 工作設定
+        journal_file: 此工作的 journal 路徑 (None = 不寫日誌)
+        durable: 是否使用持久模式
+        renamer: 要使用的 FileRenamer (預設建立新的；常駐服務會傳入共用索引的實例)
+        control: 取消控制 (掃描與執行期間皆會檢查)
+        progress: 進度回呼 (成功數量, 失敗數量, 總數量)
+
+    Returns:
+        JobResult (例外會記錄在 error 欄位，不會拋出)
+    """
+    result = JobResult(name=job.name, root=str(job.root), journal=str(journal_file or ""))
+    start = time.perf_counter()
+    try:
+        if not job.root.is_dir():
+            raise FileNotFoundError(f"not a directory: {job.root}")
+
+        renamer = renamer or FileRenamer()
+        cancel_check = (lambda: control.is_cancelled) if control is not None else None
+        settings = job.scan_settings()
+        plan = renamer.build_plan(settings, cancel_check=cancel_check)
+        if "mapping" in settings:
+            result.mapping = vars(settings["mapping"].report())
+        result.total = plan.total_count
+        result.changed = plan.changed_count
+        if plan.changed_count and not plan.cancelled:
+            renamer.execute_rename(
+                plan.changed,
+                journal=RenameJournal(journal_file) if journal_file is not None else None,
+                durable=durable, progress=progress, control=control
+            )
+            result.success = renamer.last_summary.success
+            result.failed = renamer.last_summary.failed
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _worker_error(job: JobSpec, journal_file: Path, error: Exception) -> JobResult:
+    """工作行程沒有傳回結果時的失敗結果"""
+    return JobResult(name=job.name, root=str(job.root), journal=str(journal_file), error=f"{type(error).__name__}: {error}")
+
+
+def roots_overlap(a: Path, b: Path) -> bool:
+    """兩個根目錄相同或互為上下層"""
+    return a == b or a in b.parents or b in a.parents
+
+
+def group_jobs(jobs: List[JobSpec]) -> List[List[JobSpec]]:
+    """
+    將根目錄相同或互為上下層的工作分在同一組 (組內依清單順序執行，避免同一棵樹同時被改名)
+
+    Returns:
+        [[JobSpec, ...], ...] (依首次出現順序)
+    """
+    roots = [Path(os.path.abspath(job.root)) for job in jobs]
+    group_of = list(range(len(jobs)))
+    for i in range(len(jobs)):
+        for j in range(i):
+            if group_of[i] != group_of[j] and roots_overlap(roots[i], roots[j]):
+                merged, into = group_of[i], group_of[j]
+                group_of = [into if g == merged else g for g in group_of]
+
+    groups: Dict[int, List[JobSpec]] = {}
+    for job, g in zip(jobs, group_of):
+        groups.setdefault(g, []).append(job)
+    return list(groups.values())
+
+
+def run_manifest(
+    manifest: Manifest,
+    max_workers: Optional[int] = None,
+    durable: bool = False,
+    on_result: Optional[Callable[[JobResult], None]] = None
+) -> BatchSummary:
+    """
+    以行程池同時執行清單中的工作
+
+    由主行程排程：根目錄重疊的工作依清單順序一個接一個執行，
+    同一 group 的工作同時執行數不超過 group_limits，整體不超過 max_workers。
+    工作行程崩潰 (BrokenProcessPool) 或結果無法傳回時，該工作記錄為失敗，其他結果照常收集。
+
+    Args:
+        manifest: 工作清單
+        max_workers: 同時執行的工作數上限 (預設使用清單中的 max_workers)
+        durable: 是否使用持久模式
+        on_result: 每完成一個工作時呼叫 (在主行程中)
+
+    Returns:
+        BatchSummary (依清單順序)
+    """
+    start = time.perf_counter()
+    run_id = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+    Path(manifest.journal_dir).mkdir(parents=True, exist_ok=True)
+    chains = [deque(group) for group in group_jobs(manifest.jobs)]
+    workers = max(1, min(max_workers or manifest.max_workers, len(chains)))
+    limits = manifest.group_limits
+
+    results: Dict[str, JobResult] = {}
+    # 執行中的工作：future -> (所屬組索引, 工作, journal 路徑)
+    running: Dict[Any, Tuple[int, JobSpec, Path]] = {}
+    busy_chains = set()
+    group_running: Counter = Counter()
+
+    def next_job() -> Optional[Tuple[int, JobSpec]]:
+        for index, chain in enumerate(chains):
+            if not chain or index in busy_chains:
+                continue
+            job = chain[0]
+            if job.group is not None and group_running[job.group] >= limits.get(job.group, workers):
+                continue
+            return index, chain.popleft()
+        return None
+
+    def finish(index: int, job: JobSpec, result: JobResult) -> None:
+        busy_chains.discard(index)
+        if job.group is not None:
+            group_running[job.group] -= 1
+        results[result.name] = result
+        if on_result is not None:
+            on_result(result)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            while len(running) < workers:
+                picked = next_job()
+                if picked is None:
+                    break
+                index, job = picked
+                busy_chains.add(index)
+                if job.group is not None:
+                    group_running[job.group] += 1
+                journal_file = journal_path(manifest.journal_dir, job, run_id)
+                try:
+                    running[pool.submit(run_job, job, journal_file, durable)] = (index, job, journal_file)
+                except Exception as e:
+                    # 行程池已損毀，之後的工作都無法送出
+                    finish(index, job, _worker_error(job, journal_file, e))
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, job, journal_file = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = _worker_error(job, journal_file, e)
+                finish(index, job, result)
+
+    return BatchSummary(
+        results=[results[job.name] for job in manifest.jobs],
+        elapsed=time.perf_counter() - start
+    )
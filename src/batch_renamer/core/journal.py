@@ -0,0 +1,184 @@
+"""Write-ahead rename journal - crash resume and bulk undo"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 日誌記錄類型
+OP_BEGIN = "begin"
+OP_PLAN = "plan"
+OP_DONE = "done"
+OP_FAIL = "fail"
+OP_END = "end"
+OP_UNDONE = "undone"
+OP_UNDO_END = "undo_end"
+
+# 預設每累積多少筆記錄執行一次 fsync
+DEFAULT_SYNC_EVERY = 512
+
+
+class JournalState:
+    """從日誌檔重建的執行狀態"""
+
+    def __init__(self):
+        self.planned: List[Tuple[Path, Path]] = []
+        self.done: List[int] = []
+        self.failed: Dict[int, str] = {}
+        self.undone: set = set()
+        self.completed = False
+        self.undo_completed = False
+
+    def pending(self) -> List[int]:
+        """尚未完成的計畫操作索引 (依計畫順序)"""
+        done = set(self.done)
+        return [i for i in range(len(self.planned)) if i not in done]
+
+    def interrupted(self) -> List[int]:
+        """已寫入計畫但沒有完成或失敗記錄的操作索引 (崩潰時可能已改名)"""
+        done = set(self.done)
+        return [i for i in range(len(self.planned)) if i not in done and i not in self.failed]
+
+    def undoable(self) -> List[int]:
+        """可撤銷的操作索引 (依完成順序倒序)"""
+        return [i for i in reversed(self.done) if i not in self.undone]
+
+
+class RenameJournal:
+    """
+    Append-only write-ahead journal for a rename run
+
+    一個日誌檔只描述一次執行：begin() 會清空舊內容，續跑與撤銷則在同一次執行後追加記錄。
+    路徑一律以絕對路徑記錄，從其他工作目錄續跑或撤銷時仍指向相同檔案。
+    """
+
+    def __init__(self, path: Path, sync_every: int = DEFAULT_SYNC_EVERY):
+        """
+        Args:
+            path: 日誌檔路徑
+            sync_every: 每累積多少筆記錄執行一次 fsync
+        """
+        self.path = Path(path)
+        self.sync_every = max(1, sync_every)
+        self._fh = None
+        self._unsynced = 0
+
+    def _open(self, truncate: bool = False) -> None:
+        if truncate and self._fh is not None:
+            self.close()
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "w" if truncate else "a", encoding="utf-8", buffering=1 << 20)
+            # 崩潰時最後一行可能未寫完，續寫前先換行以免與新記錄黏在一起
+            if self._fh.tell() > 0 and not _ends_with_newline(self.path):
+                self._fh.write("\n")
+
+    def _write(self, record: dict) -> None:
+        self._open()
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """將緩衝區內容寫入磁碟"""
+        if self._fh is None:
+            return
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        """同步並關閉日誌檔"""
+        if self._fh is not None:
+            self.sync()
+            self._fh.close()
+            self._fh = None
+
+    def begin(self, ops: List[Tuple[Path, Path]]) -> None:
+        """
+        寫入執行計畫，並在第一次重命名前落盤
+
+        日誌檔中先前的執行記錄會被清空，避免新計畫的索引與舊記錄混在一起。
+
+        Args:
+            ops: [(原始路徑, 目標路徑), ...] 列表 (執行順序)
+        """
+        self._open(truncate=True)
+        self._fh.write(json.dumps({"op": OP_BEGIN, "ts": time.time(), "count": len(ops)}) + "\n")
+        abspath = os.path.abspath
+        self._fh.writelines(
+            json.dumps({"op": OP_PLAN, "i": i, "src": abspath(src), "dst": abspath(dst)}, ensure_ascii=False) + "\n"
+            for i, (src, dst) in enumerate(ops)
+        )
+        self.sync()
+
+    def record(self, op: str, index: int, error: Optional[str] = None) -> None:
+        """記錄單筆操作結果 (批次 fsync)"""
+        record = {"op": op, "i": index}
+        if error is not None:
+            record["error"] = error
+        self._write(record)
+
+    def end(self, op: str = OP_END) -> None:
+        """寫入結束標記並關閉"""
+        self._write({"op": op, "ts": time.time()})
+        self.close()
+
+    @staticmethod
+    def load(path: Path) -> JournalState:
+        """
+        讀取日誌檔並重建狀態 (容忍崩潰時寫到一半的最後一行)
+
+        檔案中有多次執行時 (舊版本以追加方式寫入)，只採用最後一次 begin 之後的記錄。
+
+        Args:
+            path: 日誌檔路徑
+
+        Returns:
+            JournalState
+        """
+        state = JournalState()
+        for record in _iter_records(Path(path)):
+            op = record.get("op")
+            if op == OP_BEGIN:
+                state = JournalState()
+            elif op == OP_PLAN:
+                state.planned.append((Path(record["src"]), Path(record["dst"])))
+            elif op == OP_DONE:
+                state.done.append(record["i"])
+                state.failed.pop(record["i"], None)
+            elif op == OP_FAIL:
+                state.failed[record["i"]] = record.get("error", "")
+            elif op == OP_UNDONE:
+                state.undone.add(record["i"])
+            elif op == OP_END:
+                state.completed = True
+            elif op == OP_UNDO_END:
+                state.undo_completed = True
+        return state
+
+
+def _ends_with_newline(path: Path) -> bool:
+    """檢查檔案最後一個位元組是否為換行"""
+    with open(path, "rb") as fh:
+        fh.seek(-1, os.SEEK_END)
+        return fh.read(1) == b"\n"
+
+
+def _iter_records(path: Path) -> Iterator[dict]:
+    """逐行解析日誌記錄，略過損毀的行"""
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def iter_ops(state: JournalState, indices: Iterable[int], undo: bool = False) -> Iterator[Tuple[int, Path, Path]]:
+    """依索引產生 (索引, 來源, 目標) 操作；undo 時來源與目標互換"""
+    for i in indices:
+        src, dst = state.planned[i]
+        yield (i, dst, src) if undo else (i, src, dst)
@@ -0,0 +1,164 @@
+"""External old-to-new mapping files (CSV/TSV) applied during the scan"""
+
+import csv
+import os
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# 報告中保留的未配對樣本數
+MAPPING_SAMPLE_LIMIT = 100
+
+# 視為標題列的欄位名稱
+_HEADER_NAMES = {("old", "new"), ("source", "target"), ("from", "to"), ("src", "dst"), ("path", "new_name")}
+
+
+@dataclass
+class MappingReport:
+    """Match statistics of a mapping against the last scan"""
+
+    rows: int = 0
+    duplicates: int = 0
+    invalid_rows: int = 0
+    matched: int = 0
+    unmatched_rows: int = 0
+    unmatched_files: int = 0
+    invalid_samples: List[int] = field(default_factory=list)
+    unmatched_row_samples: List[str] = field(default_factory=list)
+    unmatched_file_samples: List[str] = field(default_factory=list)
+
+
+def normalize_key(path: str) -> str:
+    """將相對路徑統一為 posix 形式 (去掉 ./ 與多餘的斜線)"""
+    key = path.strip().replace("\\", "/")
+    while key.startswith("./"):
+        key = key[2:]
+    return key.strip("/")
+
+
+class MappingIndex:
+    """
+    Hash index of relative path -> new name, streamed from a CSV/TSV file
+
+    鍵值為相對於掃描根目錄的路徑字串 (不建立 Path)，每個項目以一次 dict 查詢配對。
+    新名稱可以是單純的名稱，或與舊路徑位於同一資料夾的相對路徑；移到其他資料夾的列視為無效。
+    """
+
+    def __init__(self):
+        self._index = {}
+        self._names: List[str] = []
+        self._hits = bytearray()
+        self._report = MappingReport()
+
+    @classmethod
+    def from_file(cls, path: Path, delimiter: Optional[str] = None) -> "MappingIndex":
+        """
+        逐列讀取對照檔
+
+        Args:
+            path: CSV / TSV 檔案 (第一列若為 old,new 等標題會略過)
+            delimiter: 分隔字元 (預設依副檔名：.tsv / .tab 為 Tab，其餘為逗號)
+
+        Returns:
+            MappingIndex
+        """
+        path = Path(path)
+        if delimiter is None:
+            delimiter = "\t" if path.suffix.lower() in (".tsv", ".tab") else ","
+
+        index = cls()
+        with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+            for line_no, row in enumerate(csv.reader(fh, delimiter=delimiter), 1):
+                if line_no == 1 and tuple(c.strip().lower() for c in row[:2]) in _HEADER_NAMES:
+                    continue
+                index.add(row, line_no)
+        return index
+
+    def add(self, row: List[str], line_no: int = 0) -> bool:
+        """
+        加入一列 (舊相對路徑, 新名稱)
+
+        Returns:
+            是否為有效列
+        """
+        report = self._report
+        if not row or not any(cell.strip() for cell in row):
+            return False
+
+        old = normalize_key(row[0]) if len(row) == 2 else ""
+        new = normalize_key(row[1]) if len(row) == 2 else ""
+        if "/" in new:
+            # 新值為路徑時，只允許與舊路徑同一資料夾
+            parent, _, new = new.rpartition("/")
+            if parent != old.rpartition("/")[0]:
+                new = ""
+        if not old or not new or new in (".", ".."):
+            report.invalid_rows += 1
+            if len(report.invalid_samples) < MAPPING_SAMPLE_LIMIT:
+                report.invalid_samples.append(line_no)
+            return False
+
+        report.rows += 1
+        slot = self._index.get(old)
+        if slot is not None:
+            # 重複的舊路徑：以最後一列為準
+            report.duplicates += 1
+            self._names[slot] = new
+        else:
+            self._index[old] = len(self._names)
+            self._names.append(new)
+            self._hits.append(0)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def reset(self) -> None:
+        """開始新的掃描前清除配對記錄"""
+        self._hits = bytearray(len(self._names))
+        self._report.matched = 0
+        self._report.unmatched_files = 0
+        self._report.unmatched_file_samples = []
+
+    def lookup(self, key: str, default: str) -> str:
+        """
+        取得新名稱並記錄配對結果
+
+        Args:
+            key: 相對於掃描根目錄的路徑 (posix 形式)
+            default: 未配對時回傳的名稱
+
+        Returns:
+            新名稱
+        """
+        slot = self._index.get(key)
+        if slot is None:
+            report = self._report
+            report.unmatched_files += 1
+            if len(report.unmatched_file_samples) < MAPPING_SAMPLE_LIMIT:
+                report.unmatched_file_samples.append(key)
+            return default
+        if not self._hits[slot]:
+            self._hits[slot] = 1
+            self._report.matched += 1
+        return self._names[slot]
+
+    def unmatched_rows(self) -> Iterator[Tuple[str, str]]:
+        """產生本次掃描中沒有配對到任何項目的列 (舊路徑, 新名稱)"""
+        hits, names = self._hits, self._names
+        for key, slot in self._index.items():
+            if not hits[slot]:
+                yield key, names[slot]
+
+    def report(self) -> MappingReport:
+        """取得目前的統計 (含未配對列的樣本)"""
+        report = self._report
+        report.unmatched_rows = len(self._names) - report.matched
+        report.unmatched_row_samples = [key for key, _ in islice(self.unmatched_rows(), MAPPING_SAMPLE_LIMIT)]
+        return report
+
+
+def relative_key(item: Path, root_path: Path) -> str:
+    """項目相對於掃描根目錄的 posix 路徑 (根目錄為 "." 等相對路徑時同樣正確)"""
+    return item.relative_to(root_path).as_posix()
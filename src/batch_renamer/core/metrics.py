@@ -0,0 +1,187 @@
+"""Prometheus textfile metrics - counters and histograms for unattended runs"""
+
+import bisect
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from ..utils.eventlog import EVENT_LOG, METRICS_FAILED
+
+# 兩次寫檔的最短間隔 (秒)；長時間執行時依此頻率更新，結束時一定寫入
+METRICS_INTERVAL = 15.0
+
+# 單筆重命名耗時的直方圖區間 (秒)
+RENAME_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+# 整次掃描耗時的直方圖區間 (秒)
+SCAN_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+METRIC_PREFIX = "batch_renamer_"
+
+# 名稱 -> (類型, 說明)
+_METRICS = {
+    "entries_scanned_total": ("counter", "Entries produced by scans"),
+    "scans_total": ("counter", "Completed or abandoned scans"),
+    "opencc_conversions_total": ("counter", "Names converted through OpenCC"),
+    "renames_total": ("counter", "Successful renames"),
+    "rename_failures_total": ("counter", "Failed renames"),
+    "rename_duration_seconds": ("histogram", "Latency of a single rename"),
+    "scan_duration_seconds": ("histogram", "Wall time of a whole scan"),
+    "last_update_timestamp_seconds": ("gauge", "Unix time of the last metrics write"),
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """記錄一個觀測值"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        """各區間 (含 +Inf) 的累計次數"""
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+def _escape(value: str) -> str:
+    """依文字格式規格跳脫標籤值中的反斜線、引號與換行"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """將標籤轉為 {k="v",...}"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in sorted(labels.items())) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class MetricsWriter:
+    """
+    Thread-safe counters and histograms written to a node-exporter textfile
+
+    先寫入同目錄的暫存檔再 os.replace，收集器不會讀到寫到一半的檔案。
+    暫存檔不以 .prom 結尾，因此不會被 textfile collector 讀取。
+    """
+
+    def __init__(self, path: Path, interval: float = METRICS_INTERVAL, labels: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            path: 輸出檔案 (通常位於 node-exporter 的 --collector.textfile.directory，副檔名 .prom)
+            interval: 兩次寫檔的最短間隔 (秒)
+            labels: 附加到所有指標的標籤 (例如 {"host": "nas01"})
+        """
+        self.path = Path(path)
+        self.interval = interval
+        self.labels = dict(labels or {})
+        self.counters: Dict[str, float] = {
+            name: 0 for name, (kind, _) in _METRICS.items() if kind == "counter"
+        }
+        self.histograms: Dict[str, Histogram] = {
+            "rename_duration_seconds": Histogram(RENAME_BUCKETS),
+            "scan_duration_seconds": Histogram(SCAN_BUCKETS),
+        }
+        self._lock = threading.Lock()
+        self._last_write = float("-inf")
+
+    def inc(self, name: str, amount: float = 1) -> None:
+        """增加計數器"""
+        with self._lock:
+            self.counters[name] += amount
+        self.maybe_flush()
+
+    def observe(self, name: str, value: float) -> None:
+        """記錄直方圖觀測值"""
+        with self._lock:
+            self.histograms[name].observe(value)
+        self.maybe_flush()
+
+    def scanned(self, opencc: bool = False) -> None:
+        """掃描產生一個項目 (opencc = 名稱經過 OpenCC 轉換)"""
+        with self._lock:
+            self.counters["entries_scanned_total"] += 1
+            if opencc:
+                self.counters["opencc_conversions_total"] += 1
+        self.maybe_flush()
+
+    def scan_finished(self, seconds: float) -> None:
+        """一次掃描結束 (含提早停止的惰性走訪)，並立即寫檔"""
+        with self._lock:
+            self.counters["scans_total"] += 1
+            self.histograms["scan_duration_seconds"].observe(seconds)
+        self.flush()
+
+    def renamed(self, seconds: float, ok: bool) -> None:
+        """記錄一筆重命名的結果與耗時"""
+        with self._lock:
+            self.counters["renames_total" if ok else "rename_failures_total"] += 1
+            self.histograms["rename_duration_seconds"].observe(seconds)
+        self.maybe_flush()
+
+    def maybe_flush(self) -> bool:
+        """距離上次寫檔超過 interval 時寫檔"""
+        if time.monotonic() - self._last_write < self.interval:
+            return False
+        self.flush()
+        return True
+
+    def render(self) -> str:
+        """產生 Prometheus 文字格式"""
+        labels = self.labels
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in _METRICS.items():
+                metric = METRIC_PREFIX + name
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} {kind}")
+                if kind == "counter":
+                    lines.append(f"{metric}{_format_labels(labels)} {_format_value(self.counters[name])}")
+                elif kind == "gauge":
+                    lines.append(f"{metric}{_format_labels(labels)} {_format_value(round(time.time(), 3))}")
+                else:
+                    histogram = self.histograms[name]
+                    bounds = list(histogram.buckets) + [float("inf")]
+                    for bound, count in zip(bounds, histogram.cumulative()):
+                        bucket_labels = dict(labels, le=_format_value(bound))
+                        lines.append(f"{metric}_bucket{_format_labels(bucket_labels)} {count}")
+                    lines.append(f"{metric}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> bool:
+        """
+        以暫存檔 + os.replace 原子地更新輸出檔
+
+        Returns:
+            是否寫入成功 (失敗只記錄事件，不中斷掃描或重命名)
+        """
+        self._last_write = time.monotonic()
+        text = self.render()
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(text)
+            os.replace(tmp, self.path)
+            return True
+        except OSError as ex:
+            EVENT_LOG.warning(METRICS_FAILED, str(ex), self.path)
+            return False
@@ -0,0 +1,244 @@
+"""Copy-rename mode - rebuild the renamed tree under an output root with hardlinks or kernel-side copies"""
+
+import errno
+import os
+import stat
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from ..utils.eventlog import EVENT_LOG, EventLog, MIRROR_FAILED
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MIRROR_METHODS = ("auto", "hardlink", "reflink", "copy")
+
+# Linux ioctl：讓目標檔案共用來源的資料區塊 (Btrfs / XFS / bcachefs 等)
+FICLONE = 0x40049409
+
+# 表示「此檔案系統組合不支援該方式」的錯誤碼；auto 模式遇到時之後的檔案都不再嘗試該方式
+# (ENOTTY：檔案系統不支援 FICLONE ioctl)
+_UNSUPPORTED = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOSYS, errno.ENOTTY}
+
+# 只與單一檔案有關的錯誤碼 (受保護的硬連結、連結數已達上限、reflink 對齊等)；
+# auto 模式只對該檔案改用下一種方式
+_PER_FILE = {errno.EPERM, errno.EMLINK, errno.EINVAL}
+
+# 每次 copy_file_range / sendfile 最多傳送的位元組數
+_CHUNK = 1 << 30
+
+
+@dataclass
+class MirrorStats:
+    """Counts for one mirror run"""
+
+    output: str
+    method: str
+    scanned: int = 0
+    dirs: int = 0
+    linked: int = 0
+    cloned: int = 0
+    copied: int = 0
+    symlinks: int = 0
+    failed: int = 0
+
+
+class TreeMirror:
+    """
+    Recreate scan targets under another root without touching the originals
+
+    檔案依序嘗試硬連結、reflink (FICLONE) 與核心內複製 (copy_file_range，
+    不支援時 sendfile)，資料一律不經過使用者空間的緩衝區；都不可用時該項目記為失敗。
+    輸出資料夾依來源資料夾快取，每個資料夾只建立一次 (上層先於下層)，不逐項檢查是否存在。
+    只處理本機檔案系統；已存在的目標檔案不會被覆蓋。
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        output_root: Path,
+        method: str = "auto",
+        follow_symlinks: bool = False,
+        event_log: Optional[EventLog] = None
+    ):
+        """
+        Args:
+            root: 掃描的根目錄
+            output_root: 輸出根目錄 (不可位於 root 之內)
+            method: "auto" / "hardlink" / "reflink" / "copy" (copy = 核心內複製)
+            follow_symlinks: 掃描時跟隨了符號連結 (對應 --symlinks follow)；
+                為 False 時連結本身以相同目標重建
+            event_log: 失敗事件的記錄 (預設為行程共用的 EVENT_LOG)
+        """
+        if method not in MIRROR_METHODS:
+            raise ValueError(f"unknown mirror method: {method}")
+        self.root = Path(root)
+        self.output_root = Path(output_root)
+        real_root, real_output = self.root.resolve(), self.output_root.resolve()
+        if real_output == real_root or real_root in real_output.parents:
+            raise ValueError(f"output folder must be outside the scanned root: {output_root}")
+
+        self.method = method
+        self.follow_symlinks = follow_symlinks
+        self.event_log = event_log if event_log is not None else EVENT_LOG
+        self.stats = MirrorStats(str(self.output_root), method)
+
+        # auto 模式依序嘗試的方式；遇到不支援的錯誤時移除，之後不再嘗試
+        self._methods = ["hardlink", "reflink", "copy"] if method == "auto" else [method]
+        if fcntl is None and "reflink" in self._methods and method == "auto":
+            self._methods.remove("reflink")
+        self._copy_file_range = getattr(os, "copy_file_range", None)
+
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        # 來源資料夾 -> 已建立的輸出資料夾
+        self._dirs: Dict[Path, Path] = {self.root: self.output_root}
+
+    def add(self, item: Path, new_name: str) -> bool:
+        """
+        在輸出目錄建立一個掃描結果
+
+        Returns:
+            是否成功 (失敗記錄於事件記錄與 stats.failed)
+        """
+        self.stats.scanned += 1
+        try:
+            st = os.lstat(item)
+            is_link = stat.S_ISLNK(st.st_mode)
+            if is_link and self.follow_symlinks and os.path.isdir(item):
+                is_link, is_dir = False, True
+            else:
+                is_dir = stat.S_ISDIR(st.st_mode)
+
+            target = self._output_dir(item.parent) / new_name
+            if is_dir:
+                self._mkdir(target)
+                self._dirs[item] = target
+            elif is_link:
+                os.symlink(os.readlink(item), target)
+                self.stats.symlinks += 1
+            else:
+                self._transfer(item, target, st)
+        except OSError as ex:
+            self.stats.failed += 1
+            self.event_log.error(MIRROR_FAILED, str(ex), item, target=new_name)
+            return False
+        return True
+
+    def _output_dir(self, directory: Path) -> Path:
+        """取得來源資料夾對應的輸出資料夾，尚未建立時連同上層一起建立"""
+        output = self._dirs.get(directory)
+        if output is None:
+            if directory.parent == directory:
+                # 以 OSError 回報，由 add() 記錄為單筆失敗
+                raise OSError(errno.EINVAL, f"not under the scanned root {self.root}", str(directory))
+            # 未出現在掃描結果中的資料夾 (例如只改檔案名稱) 保留原名
+            output = self._output_dir(directory.parent) / directory.name
+            self._mkdir(output)
+            self._dirs[directory] = output
+        return output
+
+    def _mkdir(self, path: Path) -> None:
+        try:
+            os.mkdir(path)
+            self.stats.dirs += 1
+        except FileExistsError:
+            if not os.path.isdir(path):
+                raise
+
+    def _transfer(self, src: Path, dst: Path, st: os.stat_result) -> None:
+        """依可用的方式建立檔案 (auto 模式遇到不支援時改用下一種)"""
+        methods = list(self._methods)
+        for position, method in enumerate(methods):
+            try:
+                if method == "hardlink":
+                    os.link(src, dst, follow_symlinks=False)
+                    self.stats.linked += 1
+                else:
+                    self._write_copy(src, dst, st, clone=method == "reflink")
+                    if method == "reflink":
+                        self.stats.cloned += 1
+                    else:
+                        self.stats.copied += 1
+                return
+            except OSError as ex:
+                last = position == len(methods) - 1
+                if self.method != "auto" or last or ex.errno not in _UNSUPPORTED | _PER_FILE:
+                    raise
+                if ex.errno in _UNSUPPORTED and len(self._methods) > 1:
+                    self._methods.remove(method)
+
+    def _write_copy(self, src: Path, dst: Path, st: os.stat_result, clone: bool) -> None:
+        """以 FICLONE 或核心內複製建立新檔案 (不覆蓋)，保留權限與修改時間"""
+        if clone and fcntl is None:
+            raise OSError(errno.EOPNOTSUPP, "reflink is not available on this platform", str(dst))
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            try:
+                if clone:
+                    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                else:
+                    self._kernel_copy(src_fd, dst_fd, st.st_size)
+                os.fchmod(dst_fd, stat.S_IMODE(st.st_mode))
+            except BaseException:
+                os.close(dst_fd)
+                os.unlink(dst)
+                raise
+            os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+        os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def _kernel_copy(self, src_fd: int, dst_fd: int, size: int) -> None:
+        """copy_file_range (不支援時改用 sendfile)；兩者都在核心內搬移資料"""
+        copied = 0
+        while copied < size:
+            count = min(size - copied, _CHUNK)
+            if self._copy_file_range is not None:
+                try:
+                    sent = self._copy_file_range(src_fd, dst_fd, count)
+                except OSError as ex:
+                    if ex.errno not in _UNSUPPORTED:
+                        raise
+                    # 舊核心不支援跨檔案系統；之後都用 sendfile
+                    self._copy_file_range = None
+                    continue
+            else:
+                sent = os.sendfile(dst_fd, src_fd, copied, count)
+            if sent == 0:
+                # 來源在複製期間變短
+                break
+            copied += sent
+
+
+def mirror_plan(
+    targets: Iterable[Tuple[Path, str]],
+    root: Path,
+    output_root: Path,
+    method: str = "auto",
+    follow_symlinks: bool = False,
+    cancel_check: Optional[Callable[[], bool]] = None
+) -> MirrorStats:
+    """
+    將掃描結果 (含名稱未變的項目) 重建於 output_root 之下
+
+    Args:
+        targets: scan_directory / iter_targets 的先序結果
+        root: 掃描的根目錄
+        output_root: 輸出根目錄
+        method: "auto" / "hardlink" / "reflink" / "copy"
+        follow_symlinks: 掃描時是否跟隨符號連結
+        cancel_check: 回傳 True 時停止
+
+    Returns:
+        MirrorStats
+    """
+    mirror = TreeMirror(root, output_root, method, follow_symlinks)
+    for item, new_name in targets:
+        if cancel_check is not None and cancel_check():
+            break
+        mirror.add(item, new_name)
+    return mirror.stats
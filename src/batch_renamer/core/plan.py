@@ -0,0 +1,81 @@
+"""Rename plan - one scan shared by preview, status and execute"""
+
+import itertools
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .fs import FileSystem, LOCAL_FS
+from .plan_store import CompactPlanStore, ChangedView
+
+_plan_versions = itertools.count(1)
+
+
+def plan_key(settings: Dict[str, Any]) -> Tuple:
+    """將掃描設定轉為可比較的鍵值 (列表轉為 tuple)"""
+    return tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else str(value) if isinstance(value, Path) else value)
+        for name, value in settings.items()
+    ))
+
+
+class RenamePlan:
+    """Scan result with its changed subset and counts, versioned against settings and directory mtimes"""
+
+    def __init__(self, settings: Dict[str, Any], store: Optional[Any] = None, fs: Optional[FileSystem] = None):
+        """
+        Args:
+            settings: 產生此計畫的 scan_directory 參數
+            store: 計畫儲存 (預設 CompactPlanStore；可傳入 SpillingPlanStore 以溢出到磁碟)
+            fs: 用於檢查目錄修改時間的檔案系統 (預設本機)
+        """
+        self.fs = fs if fs is not None else LOCAL_FS
+        self.settings = settings
+        self.key = plan_key(settings)
+        self.version = next(_plan_versions)
+        self.targets = store if store is not None else CompactPlanStore()
+        self.dir_mtimes: Dict[Path, int] = {}
+        self.cancelled = False
+
+    def add(self, item: Path, new_name: str) -> None:
+        """加入一個掃描結果"""
+        self.targets.append(item, new_name)
+
+    def record_directory(self, directory: Path) -> None:
+        """記錄已走訪目錄的修改時間，用於偵測檔案系統變化"""
+        try:
+            self.dir_mtimes[directory] = self.fs.stat(directory).st_mtime_ns
+        except OSError:
+            self.dir_mtimes[directory] = -1
+
+    @property
+    def changed(self) -> ChangedView:
+        """有變化的項目 (可直接傳給 execute_rename)"""
+        return self.targets.changed
+
+    @property
+    def total_count(self) -> int:
+        return len(self.targets)
+
+    @property
+    def changed_count(self) -> int:
+        return self.targets.changed_count
+
+    def matches(self, settings: Dict[str, Any]) -> bool:
+        """設定是否與產生此計畫時相同"""
+        return not self.cancelled and plan_key(settings) == self.key
+
+    def is_stale(self) -> bool:
+        """
+        檢查走訪過的目錄是否有新增、刪除或改名 (每個目錄一次 stat，不重新掃描)
+
+        Returns:
+            True = 檔案系統已變化，需要重新掃描
+        """
+        for directory, mtime in self.dir_mtimes.items():
+            try:
+                if self.fs.stat(directory).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                if mtime != -1:
+                    return True
+        return False
@@ -0,0 +1,200 @@
+"""Compact column store for large rename plans"""
+
+import os
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+# 旗標位元
+FLAG_CHANGED = 0x01
+
+
+class PlanEntry:
+    """Lightweight view of one plan entry; Path objects are built on demand"""
+
+    __slots__ = ("_store", "index")
+
+    def __init__(self, store: "CompactPlanStore", index: int):
+        self._store = store
+        self.index = index
+
+    @property
+    def parent(self) -> str:
+        return self._store.parent_of(self.index)
+
+    @property
+    def name(self) -> str:
+        return self._store.name_of(self.index)
+
+    @property
+    def new_name(self) -> str:
+        return self._store.new_name_of(self.index)
+
+    @property
+    def changed(self) -> bool:
+        return self._store.is_changed(self.index)
+
+    @property
+    def path(self) -> Path:
+        return Path(self.parent, self.name)
+
+
+class CompactPlanStore:
+    """
+    Column-oriented plan storage
+
+    - 上層目錄只存一次 (字串表 + 索引)
+    - 名稱以 UTF-8 串接於單一 bytearray，另以 offset 陣列定位
+    - 新名稱只為有變化的項目儲存
+    - 每筆一個旗標位元組 (是否變化)
+
+    迭代時產生 (Path, 新名稱)，與 scan_directory 回傳的列表介面相同。
+    """
+
+    def __init__(self):
+        self._dirs: List[str] = []
+        self._dir_ids: Dict[str, int] = {}
+        self._parents = array("I")
+        self._names = bytearray()
+        self._name_ends = array("Q")
+        self._new_names = bytearray()
+        self._new_name_ends = array("Q")
+        self.flags = bytearray()
+        self._changed = array("I")
+
+    def append(self, item: Path, new_name: str) -> None:
+        """加入一筆掃描結果"""
+        parent = str(item.parent)
+        dir_id = self._dir_ids.get(parent)
+        if dir_id is None:
+            dir_id = len(self._dirs)
+            self._dir_ids[parent] = dir_id
+            self._dirs.append(parent)
+
+        name = item.name
+        self._parents.append(dir_id)
+        self._names += os.fsencode(name)
+        self._name_ends.append(len(self._names))
+
+        if name != new_name:
+            self._changed.append(len(self.flags))
+            self.flags.append(FLAG_CHANGED)
+            self._new_names += os.fsencode(new_name)
+        else:
+            self.flags.append(0)
+        self._new_name_ends.append(len(self._new_names))
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def __getitem__(self, index: int) -> Tuple[Path, str]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return Path(self._dirs[self._parents[index]], self.name_of(index)), self.new_name_of(index)
+
+    def __iter__(self) -> Iterator[Tuple[Path, str]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reversed__(self) -> Iterator[Tuple[Path, str]]:
+        for i in range(len(self) - 1, -1, -1):
+            yield self[i]
+
+    def entry(self, index: int) -> PlanEntry:
+        """取得單筆的輕量視圖"""
+        return PlanEntry(self, index)
+
+    def parent_of(self, index: int) -> str:
+        return self._dirs[self._parents[index]]
+
+    def name_of(self, index: int) -> str:
+        start = self._name_ends[index - 1] if index else 0
+        return os.fsdecode(bytes(self._names[start:self._name_ends[index]]))
+
+    def new_name_of(self, index: int) -> str:
+        if not self.flags[index] & FLAG_CHANGED:
+            return self.name_of(index)
+        start = self._new_name_ends[index - 1] if index else 0
+        return os.fsdecode(bytes(self._new_names[start:self._new_name_ends[index]]))
+
+    def is_changed(self, index: int) -> bool:
+        return bool(self.flags[index] & FLAG_CHANGED)
+
+    @property
+    def dir_count(self) -> int:
+        return len(self._dirs)
+
+    @property
+    def changed(self) -> "ChangedView":
+        """僅包含有變化項目的視圖"""
+        return ChangedView(self)
+
+    @property
+    def changed_count(self) -> int:
+        return len(self._changed)
+
+    def changed_indices(self) -> array:
+        return self._changed
+
+    def execution_ops(self) -> "ExecutionOps":
+        """依執行順序 (由深至淺) 產生有變化項目的 (來源, 目標)"""
+        return ExecutionOps(self.changed)
+
+    def nbytes(self) -> int:
+        """欄位陣列本身佔用的位元組數 (不含目錄字串表)"""
+        return (
+            self._parents.itemsize * len(self._parents)
+            + len(self._names)
+            + self._name_ends.itemsize * len(self._name_ends)
+            + len(self._new_names)
+            + self._new_name_ends.itemsize * len(self._new_name_ends)
+            + len(self.flags)
+            + self._changed.itemsize * len(self._changed)
+        )
+
+
+class ChangedView:
+    """Sequence view over the changed entries of a CompactPlanStore"""
+
+    def __init__(self, store: CompactPlanStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return self._store.changed_count
+
+    def __getitem__(self, index: int) -> Tuple[Path, str]:
+        return self._store[self._store.changed_indices()[index]]
+
+    def names(self, index: int) -> Tuple[str, str]:
+        """取得 (原始名稱, 新名稱)，不建立 Path"""
+        i = self._store.changed_indices()[index]
+        return self._store.name_of(i), self._store.new_name_of(i)
+
+    def __iter__(self) -> Iterator[Tuple[Path, str]]:
+        for i in self._store.changed_indices():
+            yield self._store[i]
+
+    def __reversed__(self) -> Iterator[Tuple[Path, str]]:
+        indices = self._store.changed_indices()
+        for k in range(len(indices) - 1, -1, -1):
+            yield self._store[indices[k]]
+
+    def execution_ops(self) -> "ExecutionOps":
+        """依執行順序 (由深至淺) 產生 (來源, 目標) 的惰性序列"""
+        return ExecutionOps(self)
+
+
+class ExecutionOps:
+    """Sized, re-iterable (src, dst) operations in deepest-first order"""
+
+    def __init__(self, changed: ChangedView):
+        self._changed = changed
+
+    def __len__(self) -> int:
+        return len(self._changed)
+
+    def __iter__(self) -> Iterator[Tuple[Path, Path]]:
+        for old, new in reversed(self._changed):
+            yield old, old.parent / new
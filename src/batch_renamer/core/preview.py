@@ -0,0 +1,74 @@
+"""Paged access to a rename plan for the full-preview list"""
+
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+# 每頁顯示的列數
+DEFAULT_PAGE_SIZE = 200
+
+
+class PreviewPager:
+    """Serve changed entries one page at a time without copying a compact plan"""
+
+    def __init__(self, targets: Iterable[Tuple[Path, str]], page_size: int = DEFAULT_PAGE_SIZE):
+        """
+        Args:
+            targets: 計畫的 changed 視圖 (直接引用，不複製)，或 [(原始路徑, 新名稱), ...] (僅保留有變化的項目)
+            page_size: 每頁列數
+        """
+        self.page_size = max(1, page_size)
+        if hasattr(targets, "names"):
+            self._rows = targets
+            self._names = targets.names
+        else:
+            self._rows = [(item.name, new_name) for item, new_name in targets if item.name != new_name]
+            self._names = self._rows.__getitem__
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self) // self.page_size))
+
+    def page_of(self, index: int) -> int:
+        """取得某一列所在的頁碼 (0 起算)"""
+        return min(max(index, 0), max(len(self) - 1, 0)) // self.page_size
+
+    def page(self, number: int) -> List[Tuple[int, str, str]]:
+        """
+        取得指定頁的資料
+
+        Args:
+            number: 頁碼 (0 起算，超出範圍時夾到有效值)
+
+        Returns:
+            [(列索引, 原始名稱, 新名稱), ...]
+        """
+        number = min(max(number, 0), self.page_count - 1)
+        start = number * self.page_size
+        end = min(start + self.page_size, len(self))
+        return [(i, *self._names(i)) for i in range(start, end)]
+
+    def find(self, query: str, start: int = 0) -> Optional[int]:
+        """
+        從 start 開始搜尋原始或新名稱包含 query 的列 (不分大小寫，到底後從頭繼續)
+
+        Returns:
+            列索引，找不到時為 None
+        """
+        if not query or not len(self):
+            return None
+        if hasattr(self._rows, "find"):
+            # 磁碟計畫：在資料庫內搜尋，避免每列一次查詢
+            return self._rows.find(query, start)
+
+        query = query.lower()
+        total = len(self)
+        start = start % total
+        for offset in range(total):
+            i = (start + offset) % total
+            old_name, new_name = self._names(i)
+            if query in old_name.lower() or query in new_name.lower():
+                return i
+        return None
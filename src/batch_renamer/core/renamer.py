@@ -1,18 +1,98 @@
 """Core file renaming logic - independent of UI framework"""
 
 import os
+import time
+from itertools import islice
 from pathlib import Path
-from typing import List, Tuple, Optional
-from ..utils.constants import SIMPLIFIED_TO_TRADITIONAL
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple, Optional, Union
+from .durability import RenameSummary, DirectorySyncer
+from .fs import FileSystem, LOCAL_FS
+from .grouping import CompanionGrouper, parse_companion_rules
+from .executor import RenameControl, ProgressCallback
+from .inventory import InventoryIndex
+from .mapping import MappingIndex, relative_key
+from .metrics import MetricsWriter
+from .plan import RenamePlan
+from .reorganize import MkdirCache, ReorganizePattern, ReorganizePlan, plan_reorganize
+from .sqlite_store import SpillingPlanStore
+from .stats import PerfStats
+from .journal import RenameJournal, iter_ops, OP_DONE, OP_END, OP_FAIL, OP_UNDONE, OP_UNDO_END
+from ..utils.constants import SIMPLIFIED_TO_TRADITIONAL, DEFAULT_SYMLINK_POLICY, SYMLINK_POLICIES
 from ..utils.converter import has_opencc, get_opencc_converter
+from ..utils.eventlog import EVENT_LOG, EventLog, MKDIR_FAILED, RENAME_FAILED, SCAN_ERROR, SYMLINK_CYCLE
+
+
+# _DirectoryGuard.enter 的結果
+_ENTER = "enter"
+_VISITED = "visited"
+_SKIP = "skip"
+
+
+class _DirectoryGuard:
+    """Visited set keyed by (device, inode), optionally confined to the root's filesystem"""
+
+    def __init__(self, fs: FileSystem, root_stat: os.stat_result, one_filesystem: bool):
+        self.fs = fs
+        self.root_dev = root_stat.st_dev
+        self.one_filesystem = one_filesystem
+        self.visited = {(root_stat.st_dev, root_stat.st_ino)}
+
+    def enter(self, directory: Path) -> str:
+        """
+        判斷是否進入資料夾 (跟隨連結的 stat)
+
+        Returns:
+            _ENTER / _VISITED (已走訪，避免循環) / _SKIP (其他檔案系統或無法 stat，整個略過)
+        """
+        try:
+            st = self.fs.stat(directory)
+        except OSError:
+            return _SKIP
+        if self.one_filesystem and st.st_dev != self.root_dev:
+            return _SKIP
+        key = (st.st_dev, st.st_ino)
+        if key in self.visited:
+            return _VISITED
+        self.visited.add(key)
+        return _ENTER
 
 
 class FileRenamer:
     """File renaming engine - UI-agnostic business logic"""
 
-    def __init__(self):
-        """Initialize the file renamer"""
+    def __init__(
+        self,
+        spill_threshold: Optional[int] = None,
+        spill_dir: Optional[Path] = None,
+        inventory: Optional[InventoryIndex] = None,
+        stats: Optional[PerfStats] = None,
+        event_log: Optional[EventLog] = None,
+        metrics: Optional[MetricsWriter] = None,
+        fs: Optional[FileSystem] = None
+    ):
+        """
+        Initialize the file renamer
+
+        Args:
+            spill_threshold: 計畫超過此筆數時改存於本機 SQLite (None = 全部留在記憶體)
+            spill_dir: SQLite 暫存檔所在目錄
+            inventory: 持久化掃描索引 (可選)；未變化的資料夾直接讀索引，不重新列出
+            stats: 效能統計 (可選)；提供時記錄各階段耗時、快取命中率與系統呼叫次數
+            event_log: 掃描與重命名錯誤的事件記錄 (預設為行程共用的 EVENT_LOG)
+            metrics: Prometheus textfile 指標 (可選)；記錄掃描數量、重命名結果與耗時
+            fs: 掃描與重命名使用的檔案系統 (預設本機；MemoryFileSystem 用於測試與基準測試；
+                使用 inventory 時應以同一個檔案系統建立)
+        """
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self.inventory = inventory
+        self.stats = stats
+        self.event_log = event_log if event_log is not None else EVENT_LOG
+        self.metrics = metrics
+        self.fs = fs if fs is not None else LOCAL_FS
         self.targets: List[Tuple[Path, str]] = []
+        self.last_summary = RenameSummary()
+        self.plan: Optional[RenamePlan] = None
 
     def apply_conversion(self, name: str, operation: str, find_text: str = "", replace_text: str = "") -> str:
         """
@@ -43,7 +123,15 @@ class FileRenamer:
 
         return name
 
-    def apply_formatting(self, item: Path, name: str, prefix: str = "", suffix: str = "", symbols: str = "") -> str:
+    def apply_formatting(
+        self,
+        item: Path,
+        name: str,
+        prefix: str = "",
+        suffix: str = "",
+        symbols: str = "",
+        is_dir: Optional[bool] = None
+    ) -> str:
         """
         應用文件名格式化 (移除符號、添加前綴後綴)
 
@@ -53,6 +141,7 @@ class FileRenamer:
             prefix: 前綴
             suffix: 後綴
             symbols: 要移除的符號
+            is_dir: 已知的項目類型 (提供時不再 stat)
 
         Returns:
             格式化後的名稱
@@ -62,7 +151,10 @@ class FileRenamer:
             for char in symbols:
                 name = name.replace(char, "")
 
-        if item.is_file():
+        if is_dir is None:
+            is_dir = not item.is_file()
+
+        if not is_dir:
             # 文件：保持副檔名
             stem = Path(name).stem
             ext = Path(name).suffix
@@ -82,7 +174,13 @@ class FileRenamer:
         replace_text: str = "",
         prefix: str = "",
         suffix: str = "",
-        symbols: str = ""
+        symbols: str = "",
+        cancel_check: Optional[Callable[[], bool]] = None,
+        store: Optional[Any] = None,
+        mapping: Optional[MappingIndex] = None,
+        symlinks: str = DEFAULT_SYMLINK_POLICY,
+        one_filesystem: bool = False,
+        companions: Optional[Union[str, Mapping[str, Sequence[str]]]] = None
     ) -> List[Tuple[Path, str]]:
         """
         遞歸掃描目標資料夾及其子資料夾，生成重命名配對
@@ -98,39 +196,202 @@ class FileRenamer:
             prefix: 前綴
             suffix: 後綴
             symbols: 要移除的符號
+            cancel_check: 回傳 True 時中止掃描 (用於取消已過時的預覽計算)
+            store: 計畫儲存 (例如 SpillingPlanStore)；提供時結果寫入其中並回傳該儲存
+            mapping: operation 為 "mapping" 時使用的對照表 (相對路徑 -> 新名稱)
+            symlinks: 符號連結處理方式 ("skip" = 略過, "link" = 只重命名連結本身, "follow" = 跟隨)
+            one_filesystem: 不進入根目錄下其他檔案系統的掛載點
+            companions: 附屬檔案規則 (.xmp / .json / .srt 等隨主檔改名)；None = 不分組
+
+        Returns:
+            [(原始路徑, 新名稱), ...] 列表或 store (取消時為部分結果)
+        """
+        results = self.iter_targets(
+            root_path, rename_mode, filter_type, valid_exts, operation,
+            find_text, replace_text, prefix, suffix, symbols, cancel_check, mapping=mapping,
+            symlinks=symlinks, one_filesystem=one_filesystem, companions=companions
+        )
+        if store is None:
+            targets = list(results)
+        else:
+            for item, new_name in results:
+                store.append(item, new_name)
+            targets = store
+        if cancel_check is None or not cancel_check():
+            self.targets = targets
+        return targets
+
+    def build_plan(
+        self,
+        settings: Dict[str, Any],
+        cancel_check: Optional[Callable[[], bool]] = None
+    ) -> RenamePlan:
+        """
+        取得目前設定的重命名計畫；設定與檔案系統皆未變化時重用上一次的計畫
+
+        Args:
+            settings: scan_directory 的關鍵字參數
+            cancel_check: 回傳 True 時中止掃描
+
+        Returns:
+            RenamePlan (取消時 plan.cancelled 為 True，且不會被快取)
+        """
+        stats = self.stats
+        if self.plan is not None and self.plan.matches(settings):
+            if stats is not None:
+                stats.syscall("stat", len(self.plan.dir_mtimes))
+            if not self.plan.is_stale():
+                if stats is not None:
+                    stats.cache("plan", hits=1)
+                return self.plan
+
+        plan = RenamePlan(settings, self._new_store(), self.fs)
+        for item, new_name in self.iter_targets(
+            **settings, cancel_check=cancel_check, on_directory=plan.record_directory
+        ):
+            plan.add(item, new_name)
+
+        if stats is not None:
+            stats.cache("plan", misses=1)
+            stats.syscall("stat", len(plan.dir_mtimes))
+
+        if cancel_check is not None and cancel_check():
+            plan.cancelled = True
+            return plan
+
+        self.plan = plan
+        self.targets = plan.targets
+        return plan
+
+    def _new_store(self) -> Optional[SpillingPlanStore]:
+        """依設定建立可溢出到磁碟的計畫儲存 (未設定門檻時為 None，使用記憶體儲存)"""
+        if self.spill_threshold is None:
+            return None
+        return SpillingPlanStore(self.spill_threshold, self.spill_dir)
+
+    def sample_targets(self, limit: int, *args, **kwargs) -> List[Tuple[Path, str]]:
+        """
+        只取前 limit 個符合條件的項目，取得後立即停止走訪 (用於即時預覽)
+
+        Args:
+            limit: 最多取得的項目數
+            *args, **kwargs: 與 scan_directory 相同的參數
 
         Returns:
             [(原始路徑, 新名稱), ...] 列表
         """
-        if not root_path.exists():
-            return []
+        return list(islice(self.iter_targets(*args, **kwargs), limit))
+
+    def iter_targets(
+        self,
+        root_path: Path,
+        rename_mode: str,
+        filter_type: str,
+        valid_exts: List[str],
+        operation: str,
+        find_text: str = "",
+        replace_text: str = "",
+        prefix: str = "",
+        suffix: str = "",
+        symbols: str = "",
+        cancel_check: Optional[Callable[[], bool]] = None,
+        on_directory: Optional[Callable[[Path], None]] = None,
+        mapping: Optional[MappingIndex] = None,
+        symlinks: str = DEFAULT_SYMLINK_POLICY,
+        one_filesystem: bool = False,
+        companions: Optional[Union[str, Mapping[str, Sequence[str]]]] = None
+    ) -> Iterator[Tuple[Path, str]]:
+        """
+        以先序順序逐一產生重命名配對 (惰性走訪，停止迭代即停止掃描)
 
-        targets = []
+        參數同 scan_directory，另外：
+            on_directory: 每進入一個資料夾時呼叫 (含根目錄)
+            companions: 附屬檔案規則 ("default"、"xmp=jpg,cr2; srt=mkv" 或字典)；
+                設定時掃描完成後才開始產生結果，附屬檔改用主檔的新名稱
+
+        Yields:
+            (原始路徑, 新名稱)
+        """
+        if symlinks not in SYMLINK_POLICIES:
+            raise ValueError(f"unknown symlink policy: {symlinks}")
+        if companions:
+            yield from self._grouped_targets(
+                parse_companion_rules(companions), root_path, rename_mode, filter_type, valid_exts, operation,
+                find_text, replace_text, prefix, suffix, symbols, cancel_check, on_directory, mapping,
+                symlinks, one_filesystem
+            )
+            return
+        fs = self.fs
+        if not fs.exists(root_path):
+            return
+
+        # 跟隨連結或限制在同一檔案系統時，記錄已進入的資料夾 (裝置, inode) 以避免循環
+        guard = None
+        if symlinks == "follow" or one_filesystem:
+            guard = _DirectoryGuard(fs, fs.stat(root_path), one_filesystem)
+
+        if operation == "mapping":
+            if mapping is None:
+                raise ValueError("operation 'mapping' requires a MappingIndex")
+            mapping.reset()
+
+        # 啟用統計時改用計時版本 (只在此處判斷一次，未啟用時沒有額外成本)
+        stats = self.stats
+        if stats is None:
+            list_directory, new_name = self._list_directory, self._new_name
+        else:
+            list_directory, new_name = self._timed_list_directory, self._timed_new_name
+            index_before = vars(self.inventory.stats).copy() if self.inventory is not None else None
+        metrics = self.metrics
+        if metrics is not None:
+            new_name = self._metered_new_name(new_name, operation)
+            scan_start = time.perf_counter()
+
+        # 以迭代器堆疊取代遞歸，保持與遞歸相同的先序順序
+        if on_directory is not None:
+            on_directory(root_path)
+        stack = [(root_path, list_directory(root_path, root_path))]
+        try:
+            while stack:
+                directory, entries = stack[-1]
+                try:
+                    entry = next(entries, None)
+                    if entry is None:
+                        stack.pop()
+                        continue
+                    item, is_dir, is_link = entry
+
+                    if cancel_check is not None and cancel_check():
+                        return
 
-        def _scan_recursive(directory: Path) -> None:
-            """遞歸掃描資料夾及其所有子資料夾"""
-            try:
-                for item in directory.iterdir():
                     # 跳過隱藏文件和資料夾
                     if item.name.startswith('.'):
                         continue
 
-                    # 如果是資料夾，遞歸進入
-                    if item.is_dir():
+                    # 符號連結：依設定略過、視為單一項目 (不進入)，或依目標類型處理
+                    if is_link:
+                        if symlinks == "skip":
+                            continue
+                        is_dir = symlinks == "follow" and fs.is_dir(item)
+
+                    # 如果是資料夾，先產生自身再進入
+                    if is_dir:
+                        descend = True
+                        if guard is not None:
+                            status = guard.enter(item)
+                            if status == _SKIP:
+                                continue
+                            if status == _VISITED:
+                                self.event_log.warning(SYMLINK_CYCLE, "directory already visited, not descending", item)
+                                descend = False
                         if rename_mode != "files":
-                            # 如果需要重命名資料夾，則處理
-                            new_name = item.name
-
-                            # 1. 應用文字轉換
-                            new_name = self.apply_conversion(new_name, operation, find_text, replace_text)
-
-                            # 2. 應用格式化
-                            new_name = self.apply_formatting(item, new_name, prefix, suffix, symbols)
-
-                            targets.append((item, new_name))
-
-                        # 遞歸掃描子資料夾
-                        _scan_recursive(item)
+                            yield item, new_name(
+                                item, True, operation, find_text, replace_text, prefix, suffix, symbols, mapping, root_path
+                            )
+                        if descend:
+                            if on_directory is not None:
+                                on_directory(item)
+                            stack.append((item, list_directory(root_path, item)))
 
                     # 如果是文件
                     else:
@@ -139,45 +400,423 @@ class FileRenamer:
                             if item.suffix.lower() not in valid_exts:
                                 continue
 
-                        new_name = item.name
+                        yield item, new_name(
+                            item, False, operation, find_text, replace_text, prefix, suffix, symbols, mapping, root_path
+                        )
+
+                except Exception as e:
+                    self.event_log.error(SCAN_ERROR, str(e), directory)
+                    stack.pop()
+        finally:
+            if self.inventory is not None:
+                self.inventory.commit()
+                if stats is not None:
+                    self._record_index_stats(index_before)
+            if metrics is not None:
+                metrics.scan_finished(time.perf_counter() - scan_start)
+
+    def _grouped_targets(self, rules: Dict[str, Tuple[str, ...]], *args) -> Iterator[Tuple[Path, str]]:
+        """
+        掃描後套用附屬檔案分組 (參數依 iter_targets 的順序，不含 companions)
 
-                        # 1. 應用文字轉換
-                        new_name = self.apply_conversion(new_name, operation, find_text, replace_text)
+        有副檔名篩選時，附屬副檔名也一併掃描，沒有主檔的附屬檔再移除。
+        掃描時經由 on_directory 記錄資料夾，分組時略過 (資料夾不當主檔)。
+        """
+        root_path, rename_mode, filter_type, valid_exts = args[:4]
+        original_exts = None
+        if filter_type == "ext" and valid_exts:
+            original_exts = list(valid_exts)
+            valid_exts = original_exts + [ext for ext in rules if ext not in original_exts]
+
+        directories = set()
+        on_directory = args[11]
+
+        def track_directory(directory: Path) -> None:
+            directories.add(str(directory))
+            if on_directory is not None:
+                on_directory(directory)
+
+        targets = list(self.iter_targets(
+            root_path, rename_mode, filter_type, valid_exts, *args[4:11], track_directory, *args[12:]
+        ))
+
+        grouper = CompanionGrouper(rules)
+        if self.stats is None:
+            yield from grouper.group(targets, original_exts, directories)
+        else:
+            with self.stats.phase("group"):
+                targets = grouper.group(targets, original_exts, directories)
+            yield from targets
 
-                        # 2. 應用格式化
-                        new_name = self.apply_formatting(item, new_name, prefix, suffix, symbols)
+    def _list_directory(self, root_path: Path, directory: Path) -> Iterator[Tuple[Path, bool, bool]]:
+        """
+        列出資料夾內容 (惰性；錯誤在第一次迭代時拋出)
 
-                        targets.append((item, new_name))
+        類型取自檔案系統的目錄項 (本機為 scandir，通常不需 stat)，不跟隨符號連結。
 
-            except Exception as e:
-                print(f"掃描錯誤 ({directory}): {e}")
+        Yields:
+            (路徑, 是否為資料夾, 是否為符號連結)
+        """
+        if self.inventory is not None:
+            for name, is_dir, is_link in self.inventory.children(root_path, directory):
+                yield directory / name, is_dir, is_link
+        else:
+            for name, is_dir, is_link in self.fs.list_dir(directory):
+                yield directory / name, is_dir, is_link
 
-        # 開始遞歸掃描
-        _scan_recursive(root_path)
-        self.targets = targets
-        return targets
+    def _timed_list_directory(self, root_path: Path, directory: Path) -> Iterator[Tuple[Path, bool, bool]]:
+        """
+        計時版 _list_directory：累計走訪耗時，不含呼叫端處理項目的時間
 
-    def execute_rename(self, targets: List[Tuple[Path, str]]) -> Tuple[int, int]:
+        Yields:
+            (路徑, 是否為資料夾, 是否為符號連結)
+        """
+        stats = self.stats
+        clock = time.perf_counter
+        walk = 0.0
+        if self.inventory is None:
+            stats.syscall("listdir")
+        try:
+            start = clock()
+            for entry in self._list_directory(root_path, directory):
+                walk += clock() - start
+                yield entry
+                start = clock()
+            walk += clock() - start
+        finally:
+            stats.add_time("walk", walk)
+
+    def _metered_new_name(self, new_name: Callable[..., str], operation: str) -> Callable[..., str]:
+        """包裝名稱計算函式，每個項目記錄一次掃描指標"""
+        metrics = self.metrics
+        opencc = operation == "s2t" and has_opencc()
+
+        def metered(*args) -> str:
+            metrics.scanned(opencc)
+            return new_name(*args)
+        return metered
+
+    def _record_index_stats(self, before: Dict[str, int]) -> None:
+        """將本次走訪的索引使用量記入統計 (重用的資料夾視為快取命中)"""
+        after = vars(self.inventory.stats)
+        delta = {name: after[name] - before[name] for name in before}
+        self.stats.cache("inventory", hits=delta["dirs_reused"], misses=delta["dirs_rescanned"])
+        self.stats.syscall("stat", delta["dirs_checked"])
+        self.stats.syscall("listdir", delta["dirs_rescanned"])
+
+    def _new_name(
+        self,
+        item: Path,
+        is_dir: bool,
+        operation: str,
+        find_text: str,
+        replace_text: str,
+        prefix: str,
+        suffix: str,
+        symbols: str,
+        mapping: Optional[MappingIndex] = None,
+        root_path: Optional[Path] = None
+    ) -> str:
+        """計算單一項目的新名稱"""
+        # 1. 應用文字轉換
+        new_name = self._convert_name(item, operation, find_text, replace_text, mapping, root_path)
+
+        # 2. 應用格式化
+        return self.apply_formatting(item, new_name, prefix, suffix, symbols, is_dir)
+
+    def _timed_new_name(
+        self,
+        item: Path,
+        is_dir: bool,
+        operation: str,
+        find_text: str,
+        replace_text: str,
+        prefix: str,
+        suffix: str,
+        symbols: str,
+        mapping: Optional[MappingIndex] = None,
+        root_path: Optional[Path] = None
+    ) -> str:
+        """計時版 _new_name：分別累計轉換與格式化耗時"""
+        stats = self.stats
+        clock = time.perf_counter
+        start = clock()
+        new_name = self._convert_name(item, operation, find_text, replace_text, mapping, root_path)
+        converted = clock()
+        new_name = self.apply_formatting(item, new_name, prefix, suffix, symbols, is_dir)
+        stats.add_time("convert", converted - start)
+        stats.add_time("format", clock() - converted)
+        stats.entries += 1
+        return new_name
+
+    def _convert_name(
+        self,
+        item: Path,
+        operation: str,
+        find_text: str,
+        replace_text: str,
+        mapping: Optional[MappingIndex],
+        root_path: Optional[Path]
+    ) -> str:
+        """文字轉換 (對照表：以相對路徑字串查詢，不建立 Path)"""
+        if operation == "mapping":
+            return mapping.lookup(relative_key(item, root_path), item.name)
+        return self.apply_conversion(item.name, operation, find_text, replace_text)
+
+    def execute_rename(
+        self,
+        targets: List[Tuple[Path, str]],
+        journal: Optional[RenameJournal] = None,
+        durable: bool = False,
+        sync_every: int = 0,
+        progress: Optional[ProgressCallback] = None,
+        control: Optional[RenameControl] = None
+    ) -> Tuple[int, int]:
         """
         執行實際的文件重命名操作
 
         Args:
             targets: [(原始路徑, 新名稱), ...] 列表
+            journal: 預寫日誌 (可選)，用於崩潰後續跑與撤銷
+            durable: 是否對受影響的上層目錄執行 fsync，確保斷電後改名仍然有效
+            sync_every: 耐久模式下每多少筆操作同步一次 (0 = 僅在結束時同步)
+            progress: 進度回呼 (成功數量, 失敗數量, 總數量)，每筆操作後呼叫
+            control: 暫停/繼續/取消控制，於兩筆操作之間檢查
 
         Returns:
             (成功數量, 失敗數量)
         """
-        success = 0
-        failed = 0
+        # 檔案系統即將變化，上一次的計畫不再有效
+        self.plan = None
+
+        # 由深至淺執行：掃描結果為先序，倒序後子項目先於其所在資料夾重命名
+        if hasattr(targets, "execution_ops"):
+            # 緊湊計畫：惰性產生操作，不一次建立所有 Path
+            ops = targets.execution_ops()
+        else:
+            ops = [(old, old.parent / new) for old, new in targets if old.name != new]
+            ops.reverse()
+
+        if journal is not None:
+            journal.begin(ops)
+
+        try:
+            return self._rename_ops(
+                ((i, src, dst) for i, (src, dst) in enumerate(ops)), journal,
+                durable=durable, sync_every=sync_every,
+                total=len(ops), progress=progress, control=control
+            )
+        finally:
+            if journal is not None:
+                self._close_journal(journal)
+
+    def build_reorganize_plan(
+        self,
+        settings: Dict[str, Any],
+        pattern: str,
+        dest_root: Optional[Path] = None,
+        cancel_check: Optional[Callable[[], bool]] = None
+    ) -> ReorganizePlan:
+        """
+        計算整理計畫：每個檔案移到依樣式產生的子資料夾 (同時套用新名稱)
+
+        Args:
+            settings: scan_directory 的關鍵字參數
+            pattern: 目標資料夾樣式，例如 "{mtime:%Y}/{mtime:%m}" 或 "{ext}"
+            dest_root: 目標根目錄 (預設為掃描的根目錄；須位於同一檔案系統)
+            cancel_check: 回傳 True 時中止
+
+        Returns:
+            ReorganizePlan (尚未修改檔案系統)
+        """
+        return plan_reorganize(
+            self.iter_targets(**settings, cancel_check=cancel_check), settings["root_path"],
+            ReorganizePattern(pattern), dest_root, self.fs, cancel_check
+        )
 
-        for old, new in targets:
-            if old.name == new:
-                continue
+    def reorganize(
+        self,
+        plan: ReorganizePlan,
+        journal: Optional[RenameJournal] = None,
+        durable: bool = False,
+        sync_every: int = 0,
+        progress: Optional[ProgressCallback] = None,
+        control: Optional[RenameControl] = None
+    ) -> Tuple[int, int]:
+        """
+        執行整理計畫：先一次建立所有目標資料夾 (每個只建立一次)，再以同一檔案系統內的重命名移動
+
+        參數同 execute_rename；日誌可同樣用於續跑與撤銷 (撤銷不移除建立的資料夾)。
+
+        Returns:
+            (成功數量, 失敗數量)
+        """
+        self.plan = None
+        stats = self.stats
+        start = time.perf_counter()
+        mkdirs = MkdirCache(self.fs)
+        for directory in plan.new_dirs:
             try:
-                os.rename(old, old.parent / new)
-                success += 1
-            except Exception as ex:
-                failed += 1
-                print(f"[ERR] {old.name}: {ex}")
+                mkdirs.ensure(directory)
+            except OSError as ex:
+                # 移入此資料夾的項目會各自記錄為重命名失敗
+                self.event_log.error(MKDIR_FAILED, str(ex), directory)
+        if durable:
+            for parent in {directory.parent for directory in mkdirs.created}:
+                self.fs.sync_dir(parent)
+        if stats is not None:
+            stats.add_time("mkdir", time.perf_counter() - start)
+            stats.syscall("mkdir", len(mkdirs.created))
+
+        ops = plan.moves
+        if journal is not None:
+            journal.begin(ops)
+        try:
+            return self._rename_ops(
+                ((i, src, dst) for i, (src, dst) in enumerate(ops)), journal,
+                durable=durable, sync_every=sync_every,
+                total=len(ops), progress=progress, control=control
+            )
+        finally:
+            if journal is not None:
+                self._close_journal(journal)
+
+    def resume_journal(self, journal_path: Path, durable: bool = False) -> Tuple[int, int]:
+        """
+        續跑中斷的重命名 (執行日誌中尚未完成的操作)
+
+        Args:
+            journal_path: 日誌檔路徑
+            durable: 是否對受影響的上層目錄執行 fsync
+
+        Returns:
+            (成功數量, 失敗數量)
+        """
+        state = RenameJournal.load(journal_path)
+        journal = RenameJournal(journal_path)
+        pending = state.pending()
+        try:
+            return self._rename_ops(
+                iter_ops(state, pending), journal, durable=durable, total=len(pending),
+                recover=set(state.interrupted())
+            )
+        finally:
+            self._close_journal(journal)
+
+    def undo_journal(self, journal_path: Path, durable: bool = False) -> Tuple[int, int]:
+        """
+        依完成順序倒序撤銷日誌中已完成的重命名
+
+        Args:
+            journal_path: 日誌檔路徑
+            durable: 是否對受影響的上層目錄執行 fsync
+
+        Returns:
+            (成功數量, 失敗數量)
+        """
+        state = RenameJournal.load(journal_path)
+        journal = RenameJournal(journal_path)
+        undoable = state.undoable()
+        try:
+            return self._rename_ops(
+                iter_ops(state, undoable, undo=True), journal, OP_UNDONE,
+                durable=durable, total=len(undoable)
+            )
+        finally:
+            self._close_journal(journal, OP_UNDO_END)
+
+    def _close_journal(self, journal: RenameJournal, end_op: str = OP_END) -> None:
+        """結束日誌；取消時不寫結束標記，保留為可續跑狀態"""
+        if self.last_summary.cancelled:
+            journal.close()
+        else:
+            journal.end(end_op)
 
-        return success, failed
+    def _rename_ops(
+        self,
+        ops: Iterable[Tuple[int, Path, Path]],
+        journal: Optional[RenameJournal] = None,
+        done_op: str = OP_DONE,
+        durable: bool = False,
+        sync_every: int = 0,
+        total: int = 0,
+        progress: Optional[ProgressCallback] = None,
+        control: Optional[RenameControl] = None,
+        recover: Collection[int] = ()
+    ) -> Tuple[int, int]:
+        """
+        依序執行 (索引, 來源, 目標) 操作並寫入日誌，結果摘要存於 last_summary
+
+        Args:
+            recover: 續跑時日誌中只有計畫、沒有結果的操作索引；
+                僅這些操作會將「來源已不存在且目標已存在」視為崩潰前已完成
+
+        Returns:
+            (成功數量, 失敗數量)
+        """
+        summary = RenameSummary(durable=durable, total=total)
+        syncer = DirectorySyncer(summary, sync_every, self.fs.sync_dir) if durable else None
+        self.last_summary = summary
+        metrics = self.metrics
+        clock = time.perf_counter
+        start = clock()
+
+        try:
+            for i, src, dst in ops:
+                if control is not None and not control.wait():
+                    summary.cancelled = True
+                    break
+
+                op_start = clock()
+                error = self._rename_one(src, dst, recover=i in recover)
+                if metrics is not None:
+                    metrics.renamed(clock() - op_start, error is None)
+                if error is None:
+                    summary.success += 1
+                    if syncer is not None:
+                        syncer.touch(src, dst)
+                    if journal is not None:
+                        journal.record(done_op, i)
+                else:
+                    summary.failed += 1
+                    if journal is not None:
+                        journal.record(OP_FAIL, i, str(error))
+                    self.event_log.error(RENAME_FAILED, str(error), src, target=str(dst))
+
+                if progress is not None:
+                    progress(summary.success, summary.failed, total)
+        finally:
+            if syncer is not None:
+                syncer.flush()
+            summary.elapsed = clock() - start
+            if metrics is not None:
+                metrics.flush()
+            if self.stats is not None:
+                self.stats.add_time("rename", summary.elapsed)
+                self.stats.syscall("rename", summary.success + summary.failed)
+                if summary.fsync_calls:
+                    self.stats.syscall("fsync", summary.fsync_calls)
+
+        return summary.success, summary.failed
+
+    def _rename_one(self, src: Path, dst: Path, recover: bool = False) -> Optional[Exception]:
+        """
+        重命名單一項目
+
+        Args:
+            src: 來源路徑
+            dst: 目標路徑
+            recover: 續跑時將「來源已不存在且目標已存在」視為崩潰前已完成
+
+        Returns:
+            None = 成功, 否則為錯誤
+        """
+        try:
+            self.fs.rename(src, dst)
+        except FileNotFoundError as ex:
+            if recover and self.fs.exists(dst) and not self.fs.exists(src):
+                return None
+            return ex
+        except Exception as ex:
+            return ex
+        return None
@@ -0,0 +1,210 @@
+"""Reorganize mode - move files into folders computed from a pattern such as {mtime:%Y}/{ext}"""
+
+import os
+import stat
+import string
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .fs import FileSystem, LOCAL_FS
+
+# 樣式可用的欄位
+REORGANIZE_FIELDS = ("mtime", "ext")
+
+# 沒有副檔名的檔案在 {ext} 中使用的名稱
+NO_EXT = "no_ext"
+
+# 樣式結果快取的上限 (超過時清空)
+PATTERN_CACHE_SIZE = 65536
+
+
+class ReorganizePattern:
+    """
+    Destination folder pattern, parsed once
+
+    {mtime:格式} 為修改時間 (strftime 格式，例如 %Y、%m)，{ext} 為小寫、不含點的副檔名。
+    以 / 分隔子資料夾；結果一律相對於目標根目錄。
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern.strip().strip("/")
+        if not self.pattern:
+            raise ValueError("reorganize pattern is empty")
+        self.fields: Set[str] = set()
+        for _, name, _, _ in string.Formatter().parse(self.pattern):
+            if name is None:
+                continue
+            if name not in REORGANIZE_FIELDS:
+                raise ValueError(f"unknown field '{{{name}}}' in pattern, use one of {REORGANIZE_FIELDS}")
+            self.fields.add(name)
+        # (修改時間秒數, 副檔名) -> 結果；同一秒、同副檔名的檔案不重新格式化
+        self._cache: Dict[Tuple[int, str], str] = {}
+
+    def render(self, name: str, mtime_ns: int = 0) -> str:
+        """
+        產生相對資料夾路徑 (POSIX 分隔)
+
+        Raises:
+            ValueError: 結果為空、絕對路徑或含有 ..
+        """
+        ext = ""
+        if "ext" in self.fields:
+            ext = os.path.splitext(name)[1]
+            ext = ext[1:].lower() if len(ext) > 1 else NO_EXT
+        seconds = mtime_ns // 1_000_000_000 if "mtime" in self.fields else 0
+        key = (seconds, ext)
+        rendered = self._cache.get(key)
+        if rendered is None:
+            rendered = self.pattern.format(ext=ext, mtime=datetime.fromtimestamp(seconds))
+            parts = PurePosixPath(rendered).parts
+            if not parts or rendered.startswith("/") or ".." in parts:
+                raise ValueError(f"pattern produced an invalid folder: {rendered!r}")
+            if len(self._cache) >= PATTERN_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = rendered
+        return rendered
+
+
+@dataclass
+class ReorganizePlan:
+    """Moves for one reorganize run, plus the folders they need"""
+
+    root: Path
+    dest_root: Path
+    moves: List[Tuple[Path, Path]] = field(default_factory=list)
+    # 需要建立的資料夾 (上層在前)
+    new_dirs: List[Path] = field(default_factory=list)
+    scanned: int = 0
+    unchanged: int = 0
+    # 掃描結果中的資料夾數 (資料夾不移動)
+    skipped_dirs: int = 0
+    conflicts: List[Tuple[Path, Path]] = field(default_factory=list)
+
+
+class MkdirCache:
+    """Create folders through a backend, each at most once, parents first"""
+
+    def __init__(self, fs: FileSystem, known: Iterable[Path] = ()):
+        """
+        Args:
+            fs: 檔案系統
+            known: 已知存在的資料夾
+        """
+        self.fs = fs
+        self.known: Set[Path] = set(known)
+        self.created: List[Path] = []
+
+    def ensure(self, directory: Path) -> None:
+        """
+        確保資料夾存在 (快取命中時不呼叫檔案系統)
+
+        先直接建立；只有上層不存在時才往上建立，上層已存在的常見情況每個資料夾一次 mkdir。
+        """
+        if directory in self.known:
+            return
+        try:
+            self._mkdir(directory)
+        except FileNotFoundError:
+            parent = directory.parent
+            if parent == directory:
+                raise
+            self.ensure(parent)
+            self._mkdir(directory)
+        self.known.add(directory)
+
+    def _mkdir(self, directory: Path) -> None:
+        try:
+            self.fs.mkdir(directory)
+            self.created.append(directory)
+        except FileExistsError:
+            if not self.fs.is_dir(directory):
+                raise
+
+
+def check_same_filesystem(root: Path, dest_root: Path, fs: FileSystem = LOCAL_FS) -> None:
+    """
+    確認目標根目錄 (尚未建立時以最近的已存在上層判斷) 與來源位於同一檔案系統
+
+    Raises:
+        ValueError: 位於不同檔案系統 (否則每次移動都會以 EXDEV 失敗，執行到一半才停止)
+    """
+    existing = Path(dest_root)
+    while not fs.exists(existing) and existing.parent != existing:
+        existing = existing.parent
+    if fs.stat(existing).st_dev != fs.stat(root).st_dev:
+        raise ValueError(f"destination {dest_root} is not on the same filesystem as {root}")
+
+
+def plan_reorganize(
+    targets: Iterable[Tuple[Path, str]],
+    root: Path,
+    pattern: ReorganizePattern,
+    dest_root: Optional[Path] = None,
+    fs: FileSystem = LOCAL_FS,
+    cancel_check: Optional[Callable[[], bool]] = None
+) -> ReorganizePlan:
+    """
+    計算整個計畫的目標路徑與需要建立的資料夾 (不修改檔案系統)
+
+    每個檔案一次 stat (取得類型與修改時間，跟隨符號連結)；每個不同的目標資料夾只檢查一次是否存在，
+    不存在的資料夾之後才建立，其中的目標必然不衝突，不需逐項檢查。
+    資料夾本身不移動 (計入 skipped_dirs)；目標已存在或多個檔案指向同一目標時記為衝突並略過。
+    指定 dest_root 時先確認與來源位於同一檔案系統。
+
+    Args:
+        targets: scan_directory / iter_targets 的結果 (新名稱一併套用)
+        root: 掃描的根目錄
+        pattern: 目標資料夾樣式
+        dest_root: 目標根目錄 (預設 root；須與來源位於同一檔案系統)
+        fs: 檔案系統
+        cancel_check: 回傳 True 時停止
+
+    Returns:
+        ReorganizePlan
+
+    Raises:
+        ValueError: dest_root 與來源位於不同檔案系統
+    """
+    if dest_root is not None and Path(dest_root) != Path(root):
+        check_same_filesystem(Path(root), Path(dest_root), fs)
+    dest_root = Path(dest_root) if dest_root is not None else Path(root)
+    plan = ReorganizePlan(Path(root), dest_root)
+    # 樣式結果 -> (目標資料夾, 是否已存在)
+    folders: Dict[str, Tuple[Path, bool]] = {}
+    destinations: Set[Path] = set()
+
+    for item, new_name in targets:
+        if cancel_check is not None and cancel_check():
+            break
+        try:
+            st = fs.stat(item)
+        except OSError:
+            # 掃描後已被移除
+            continue
+        if stat.S_ISDIR(st.st_mode):
+            plan.skipped_dirs += 1
+            continue
+        plan.scanned += 1
+
+        folder = pattern.render(new_name, st.st_mtime_ns)
+        cached = folders.get(folder)
+        if cached is None:
+            target_dir = dest_root / folder
+            cached = folders[folder] = (target_dir, fs.is_dir(target_dir))
+            if not cached[1]:
+                plan.new_dirs.append(target_dir)
+        target_dir, exists = cached
+        target = target_dir / new_name
+        if target == item:
+            plan.unchanged += 1
+            continue
+        if target in destinations or (exists and fs.exists(target)):
+            plan.conflicts.append((item, target))
+            continue
+        destinations.add(target)
+        plan.moves.append((item, target))
+
+    plan.new_dirs.sort()
+    return plan
@@ -0,0 +1,322 @@
+"""Disk-backed plan store (SQLite) for trees larger than RAM"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from .plan_store import CompactPlanStore, ExecutionOps, PlanEntry
+
+# 批次寫入的筆數 / 讀取時每批筆數
+WRITE_BATCH = 10_000
+READ_BATCH = 2_000
+# 上層目錄 id 快取上限 (超過即清空)
+DIR_CACHE_LIMIT = 4_096
+# 預設溢出門檻：超過此筆數改用 SQLite
+DEFAULT_SPILL_THRESHOLD = 500_000
+
+_SCHEMA = """
+CREATE TABLE dirs (id INTEGER PRIMARY KEY, path BLOB NOT NULL UNIQUE);
+CREATE TABLE entries (id INTEGER PRIMARY KEY, dir INTEGER NOT NULL, name BLOB NOT NULL, new_name BLOB);
+CREATE TABLE changed (k INTEGER PRIMARY KEY, entry INTEGER NOT NULL);
+"""
+
+
+def _name_contains(name: Optional[bytes], query: str) -> bool:
+    """SQL 函式：名稱 (fsencode 後的位元組) 是否包含已轉小寫的 query；與 str.lower() 相同的大小寫規則"""
+    return name is not None and query in os.fsdecode(name).lower()
+
+
+def _cleanup(conn: sqlite3.Connection, path: str) -> None:
+    """關閉連線並刪除暫存資料庫"""
+    try:
+        conn.close()
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class SqlitePlanStore:
+    """
+    Plan store backed by a temporary SQLite file
+
+    介面與 CompactPlanStore 相同：append / len / 索引 / 迭代 / changed / execution_ops。
+    寫入以批次進行，讀取以 id 分段查詢，記憶體用量與計畫大小無關。
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        """
+        Args:
+            directory: 暫存資料庫所在目錄 (預設為系統暫存目錄)
+        """
+        fd, self.path = tempfile.mkstemp(prefix="batch_renamer_plan_", suffix=".db", dir=directory)
+        os.close(fd)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            "PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF; PRAGMA temp_store=FILE;" + _SCHEMA
+        )
+        self._conn.create_function("name_contains", 2, _name_contains, deterministic=True)
+        self._lock = threading.RLock()
+        self._pending: List[Tuple[int, int, bytes, Optional[bytes]]] = []
+        self._dir_cache = {}
+        self._count = 0
+        self._changed_count = 0
+        self._dir_count = 0
+        self._finalizer = weakref.finalize(self, _cleanup, self._conn, self.path)
+
+    def close(self) -> None:
+        """關閉並刪除暫存資料庫"""
+        self._finalizer()
+
+    # ------------------------------------------------------------------
+    # 寫入
+    # ------------------------------------------------------------------
+
+    def append(self, item: Path, new_name: str) -> None:
+        """加入一筆掃描結果 (緩衝後批次寫入)"""
+        with self._lock:
+            dir_id = self._dir_id(os.fsencode(str(item.parent)))
+            name = item.name
+            changed = os.fsencode(new_name) if name != new_name else None
+            self._pending.append((self._count, dir_id, os.fsencode(name), changed))
+            if changed is not None:
+                self._changed_count += 1
+            self._count += 1
+            if len(self._pending) >= WRITE_BATCH:
+                self._flush()
+
+    def _dir_id(self, parent: bytes) -> int:
+        dir_id = self._dir_cache.get(parent)
+        if dir_id is not None:
+            return dir_id
+
+        row = self._conn.execute("SELECT id FROM dirs WHERE path = ?", (parent,)).fetchone()
+        if row is None:
+            dir_id = self._dir_count
+            self._conn.execute("INSERT INTO dirs (id, path) VALUES (?, ?)", (dir_id, parent))
+            self._dir_count += 1
+        else:
+            dir_id = row[0]
+
+        if len(self._dir_cache) >= DIR_CACHE_LIMIT:
+            self._dir_cache.clear()
+        self._dir_cache[parent] = dir_id
+        return dir_id
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        first_changed = self._changed_count - sum(1 for row in self._pending if row[3] is not None)
+        self._conn.executemany("INSERT INTO entries (id, dir, name, new_name) VALUES (?, ?, ?, ?)", self._pending)
+        self._conn.executemany(
+            "INSERT INTO changed (k, entry) VALUES (?, ?)",
+            ((first_changed + k, row[0]) for k, row in enumerate(r for r in self._pending if r[3] is not None))
+        )
+        self._conn.commit()
+        self._pending.clear()
+
+    # ------------------------------------------------------------------
+    # 讀取
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def changed_count(self) -> int:
+        return self._changed_count
+
+    @property
+    def dir_count(self) -> int:
+        return self._dir_count
+
+    def _query(self, sql: str, params: tuple) -> list:
+        with self._lock:
+            self._flush()
+            return self._conn.execute(sql, params).fetchall()
+
+    def _row(self, index: int) -> Tuple[bytes, bytes, Optional[bytes]]:
+        if index < 0:
+            index += self._count
+        rows = self._query(
+            "SELECT d.path, e.name, e.new_name FROM entries e JOIN dirs d ON d.id = e.dir WHERE e.id = ?",
+            (index,)
+        )
+        if not rows:
+            raise IndexError(index)
+        return rows[0]
+
+    @staticmethod
+    def _target(row: Tuple[bytes, bytes, Optional[bytes]]) -> Tuple[Path, str]:
+        parent, name, new_name = row
+        name = os.fsdecode(name)
+        return Path(os.fsdecode(parent), name), os.fsdecode(new_name) if new_name is not None else name
+
+    def __getitem__(self, index: int) -> Tuple[Path, str]:
+        return self._target(self._row(index))
+
+    def _scan(self, table_sql: str, descending: bool = False) -> Iterator[tuple]:
+        """以 id 分段讀取，避免長時間持有游標與鎖"""
+        op, order = ("<", "DESC") if descending else (">", "ASC")
+        last = (1 << 62) if descending else -1
+        while True:
+            rows = self._query(f"{table_sql} AND key {op} ? ORDER BY key {order} LIMIT ?", (last, READ_BATCH))
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][0]
+
+    _ENTRIES_SQL = (
+        "SELECT * FROM (SELECT e.id AS key, d.path, e.name, e.new_name "
+        "FROM entries e JOIN dirs d ON d.id = e.dir) WHERE 1"
+    )
+
+    def __iter__(self) -> Iterator[Tuple[Path, str]]:
+        for row in self._scan(self._ENTRIES_SQL):
+            yield self._target(row[1:])
+
+    def __reversed__(self) -> Iterator[Tuple[Path, str]]:
+        for row in self._scan(self._ENTRIES_SQL, descending=True):
+            yield self._target(row[1:])
+
+    def parent_of(self, index: int) -> str:
+        return os.fsdecode(self._row(index)[0])
+
+    def name_of(self, index: int) -> str:
+        return os.fsdecode(self._row(index)[1])
+
+    def new_name_of(self, index: int) -> str:
+        return self[index][1]
+
+    def is_changed(self, index: int) -> bool:
+        return self._row(index)[2] is not None
+
+    def entry(self, index: int) -> PlanEntry:
+        return PlanEntry(self, index)
+
+    @property
+    def changed(self) -> "SqliteChangedView":
+        return SqliteChangedView(self)
+
+    def execution_ops(self) -> ExecutionOps:
+        """依執行順序 (由深至淺) 產生有變化項目的 (來源, 目標)"""
+        return ExecutionOps(self.changed)
+
+
+class SqliteChangedView:
+    """Sequence view over the changed entries of a SqlitePlanStore"""
+
+    _CHANGED_SQL = (
+        "SELECT * FROM (SELECT c.k AS key, d.path, e.name, e.new_name FROM changed c "
+        "JOIN entries e ON e.id = c.entry JOIN dirs d ON d.id = e.dir) WHERE 1"
+    )
+
+    def __init__(self, store: SqlitePlanStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return self._store.changed_count
+
+    def _row(self, index: int) -> tuple:
+        if index < 0:
+            index += len(self)
+        rows = self._store._query(self._CHANGED_SQL + " AND key = ?", (index,))
+        if not rows:
+            raise IndexError(index)
+        return rows[0][1:]
+
+    def __getitem__(self, index: int) -> Tuple[Path, str]:
+        return self._store._target(self._row(index))
+
+    def names(self, index: int) -> Tuple[str, str]:
+        """取得 (原始名稱, 新名稱)，不建立 Path"""
+        _, name, new_name = self._row(index)
+        return os.fsdecode(name), os.fsdecode(new_name)
+
+    def find(self, query: str, start: int = 0) -> Optional[int]:
+        """
+        從 start 開始搜尋原始或新名稱包含 query 的項目 (不分大小寫，到底後從頭繼續)
+
+        比對在資料庫內完成：每段範圍一次查詢，不逐筆取回。
+
+        Returns:
+            索引，找不到時為 None
+        """
+        total = len(self)
+        if not query or not total:
+            return None
+        query = query.lower()
+        start = start % total
+        sql = (
+            "SELECT c.k FROM changed c JOIN entries e ON e.id = c.entry "
+            "WHERE c.k >= ? AND c.k < ? AND (name_contains(e.name, ?) OR name_contains(e.new_name, ?)) "
+            "ORDER BY c.k LIMIT 1"
+        )
+        for low, high in ((start, total), (0, start)):
+            rows = self._store._query(sql, (low, high, query, query))
+            if rows:
+                return rows[0][0]
+        return None
+
+    def __iter__(self) -> Iterator[Tuple[Path, str]]:
+        for row in self._store._scan(self._CHANGED_SQL):
+            yield self._store._target(row[1:])
+
+    def __reversed__(self) -> Iterator[Tuple[Path, str]]:
+        for row in self._store._scan(self._CHANGED_SQL, descending=True):
+            yield self._store._target(row[1:])
+
+    def execution_ops(self) -> ExecutionOps:
+        return ExecutionOps(self)
+
+
+class SpillingPlanStore:
+    """
+    Start in memory and move to SQLite once a threshold is passed
+
+    筆數未超過門檻時與 CompactPlanStore 完全相同；超過時將既有項目搬到
+    SqlitePlanStore，之後的寫入與讀取都直接走資料庫。
+    """
+
+    def __init__(self, threshold: int = DEFAULT_SPILL_THRESHOLD, directory: Optional[Path] = None):
+        """
+        Args:
+            threshold: 超過此筆數改用 SQLite
+            directory: 暫存資料庫所在目錄
+        """
+        self.threshold = threshold
+        self.directory = directory
+        self._store = CompactPlanStore()
+
+    @property
+    def spilled(self) -> bool:
+        return isinstance(self._store, SqlitePlanStore)
+
+    def append(self, item: Path, new_name: str) -> None:
+        self._store.append(item, new_name)
+        if not self.spilled and len(self._store) > self.threshold:
+            disk = SqlitePlanStore(self.directory)
+            for old, new in self._store:
+                disk.append(old, new)
+            self._store = disk
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index: int) -> Tuple[Path, str]:
+        return self._store[index]
+
+    def __iter__(self) -> Iterator[Tuple[Path, str]]:
+        return iter(self._store)
+
+    def __reversed__(self) -> Iterator[Tuple[Path, str]]:
+        return reversed(self._store)
+
+    def __getattr__(self, name: str):
+        # changed / changed_count / dir_count / entry / execution_ops ... 交由實際的儲存處理
+        return getattr(self._store, name)
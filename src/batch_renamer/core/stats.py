@@ -0,0 +1,114 @@
+"""Per-phase timing and counters for scans, renders and renames"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+# 階段名稱 (依顯示順序)
+PHASES = ("walk", "convert", "format", "render", "rename")
+
+# 設定此環境變數 (非空值) 時，圖形介面啟用統計並顯示於狀態列
+STATS_ENV = "BATCH_RENAMER_STATS"
+
+
+class PerfStats:
+    """
+    Wall time per phase, entries per second, cache hit rates and syscall counts
+
+    只在呼叫端傳入時才收集；FileRenamer 未設定 stats 時走原本的程式路徑，不額外計時。
+    數值持續累加，呼叫 reset() 開始新的量測。
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """清除所有數值"""
+        self.phases: Dict[str, float] = {}
+        self.entries = 0
+        self.syscalls: Dict[str, int] = {}
+        self.caches: Dict[str, Tuple[int, int]] = {}
+        self.started = time.perf_counter()
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """累加某階段的耗時 (秒)"""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """計時區塊：with stats.phase("render"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def syscall(self, name: str, count: int = 1) -> None:
+        """記錄系統呼叫次數 (例如 "listdir" / "stat" / "rename")"""
+        self.syscalls[name] = self.syscalls.get(name, 0) + count
+
+    def cache(self, name: str, hits: int = 0, misses: int = 0) -> None:
+        """記錄快取命中與未命中次數"""
+        old_hits, old_misses = self.caches.get(name, (0, 0))
+        self.caches[name] = (old_hits + hits, old_misses + misses)
+
+    def hit_rate(self, name: str) -> Optional[float]:
+        """快取命中率 (0~1)，沒有紀錄時為 None"""
+        hits, misses = self.caches.get(name, (0, 0))
+        total = hits + misses
+        return hits / total if total else None
+
+    @property
+    def elapsed(self) -> float:
+        """自 reset() 起經過的時間"""
+        return time.perf_counter() - self.started
+
+    @property
+    def entries_per_second(self) -> Optional[float]:
+        """掃描速度 (以走訪、轉換與格式化的合計耗時計算)"""
+        busy = sum(self.phases.get(name, 0.0) for name in ("walk", "convert", "format"))
+        return self.entries / busy if busy > 0 and self.entries else None
+
+    def as_dict(self) -> Dict[str, object]:
+        """轉為可 JSON 序列化的字典"""
+        rate = self.entries_per_second
+        return {
+            "elapsed": round(self.elapsed, 6),
+            "phases": {name: round(seconds, 6) for name, seconds in self._ordered_phases()},
+            "entries": self.entries,
+            "entries_per_second": round(rate, 1) if rate is not None else None,
+            "caches": {
+                name: {"hits": hits, "misses": misses, "hit_rate": round(self.hit_rate(name), 4)}
+                for name, (hits, misses) in list(self.caches.items()) if hits + misses
+            },
+            "syscalls": dict(self.syscalls),
+        }
+
+    def summary(self) -> str:
+        """單行摘要 (用於狀態列)，例如 "walk 120ms · convert 30ms · 52k/s" """
+        parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self._ordered_phases()]
+        rate = self.entries_per_second
+        if rate is not None:
+            parts.append(f"{rate / 1000:.1f}k/s" if rate >= 1000 else f"{rate:.0f}/s")
+        for name in list(self.caches):
+            hit_rate = self.hit_rate(name)
+            if hit_rate is not None:
+                parts.append(f"{name} {hit_rate:.0%}")
+        return " · ".join(parts)
+
+    def _ordered_phases(self) -> Iterator[Tuple[str, float]]:
+        """依 PHASES 順序產生階段，其他自訂階段排在後面"""
+        # 先複製一份：介面執行緒讀取時，背景掃描可能仍在寫入
+        phases = dict(self.phases)
+        for name in PHASES:
+            if name in phases:
+                yield name, phases[name]
+        for name, seconds in phases.items():
+            if name not in PHASES:
+                yield name, seconds
+
+
+def stats_from_env() -> Optional[PerfStats]:
+    """依環境變數 BATCH_RENAMER_STATS 決定是否建立統計物件"""
+    return PerfStats() if os.environ.get(STATS_ENV) else None
@@ -0,0 +1,475 @@
+"""Long-running rename service - JSON-RPC job queue over a Unix domain socket"""
+
+import itertools
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .core.executor import RenameControl, ThrottledProgress
+from .core.inventory import InventoryIndex
+from .core.jobs import JobResult, JobSpec, journal_path, parse_job, roots_overlap, run_job
+from .core.metrics import MetricsWriter
+from .core.renamer import FileRenamer
+from .utils.converter import get_opencc_status
+
+# 同時執行的工作數上限
+DEFAULT_SERVICE_WORKERS = 2
+# 進度通知的最短間隔 (秒)
+SERVICE_PROGRESS_INTERVAL = 0.2
+# 保留多少個已結束的工作供 status / list / watch 查詢 (更早的依結束順序移除)
+DEFAULT_JOB_RETENTION = 1000
+
+# JSON-RPC 2.0 錯誤代碼
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+# 工作狀態
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+STATE_CANCELLED = "cancelled"
+
+Notify = Callable[[dict], None]
+
+
+class ServiceError(RuntimeError):
+    """JSON-RPC error returned by the service"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _notification(method: str, params: dict) -> dict:
+    return {"jsonrpc": "2.0", "method": method, "params": params}
+
+
+class ServiceJob:
+    """A submitted job and its live state"""
+
+    def __init__(self, job_id: str, spec: JobSpec):
+        self.id = job_id
+        self.spec = spec
+        self.state = STATE_QUEUED
+        self.control = RenameControl()
+        self.progress = (0, 0, 0)
+        self.result: Optional[JobResult] = None
+        self.subscribers: List[Notify] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (STATE_DONE, STATE_FAILED, STATE_CANCELLED)
+
+    def snapshot(self) -> dict:
+        """目前狀態 (可直接序列化為 JSON)"""
+        success, failed, total = self.progress
+        return {
+            "job": self.id,
+            "name": self.spec.name,
+            "root": str(self.spec.root),
+            "state": self.state,
+            "progress": {"success": success, "failed": failed, "total": total},
+            "result": vars(self.result) if self.result is not None else None
+        }
+
+
+class RenameService:
+    """
+    Keep converters and the scan index warm and run submitted jobs from a bounded queue
+
+    每行一個 JSON-RPC 2.0 請求 / 回應。方法: ping, submit, status, list, watch, cancel, shutdown。
+    submit (stream=true) 與 watch 在回應之後持續送出 state / progress 通知，直到 done。
+    根目錄相同或互為上下層的工作依序執行：等待中的工作不佔用執行緒，根目錄空出後才送進執行緒池，
+    因此排在忙碌樹後面的工作不會擋住其他樹。只保留最近 job_retention 個已結束的工作。
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        max_workers: int = DEFAULT_SERVICE_WORKERS,
+        index_path: Optional[Path] = None,
+        journal_dir: Optional[Path] = None,
+        durable: bool = False,
+        metrics: Optional[MetricsWriter] = None,
+        job_retention: int = DEFAULT_JOB_RETENTION
+    ):
+        """
+        Args:
+            socket_path: Unix domain socket 路徑
+            max_workers: 同時執行的工作數上限 (其餘排隊)
+            index_path: 持久掃描索引 (所有工作共用)
+            journal_dir: 每個工作的 journal 存放目錄 (None = 不寫日誌)
+            durable: 是否使用持久模式
+            metrics: Prometheus textfile 指標 (所有工作共用，可選)
+            job_retention: 保留的已結束工作數
+        """
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise RuntimeError("Unix domain sockets are not available on this platform")
+
+        self.socket_path = Path(socket_path)
+        self.journal_dir = Path(journal_dir) if journal_dir is not None else None
+        self.durable = durable
+        self.inventory = InventoryIndex(index_path) if index_path is not None else None
+        self.metrics = metrics
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="rename-job")
+        self._jobs: Dict[str, ServiceJob] = {}
+        self.job_retention = max(0, job_retention)
+        # 已結束工作的編號 (依結束順序)
+        self._finished: "deque[str]" = deque()
+        self._ids = itertools.count(1)
+        # journal 檔名加上服務啟動時間，重啟後工作編號重來也不會寫到舊檔
+        self._run_id = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+        self._cond = threading.Condition()
+        self._active_roots: List[Path] = []
+        # 等待根目錄空出的工作 (依提交順序)
+        self._waiting: List[Tuple[ServiceJob, Path]] = []
+        self._server: Optional[socketserver.BaseServer] = None
+        self._stopped = threading.Event()
+
+        # 預先載入 OpenCC，之後每個工作都不再付出初始化成本
+        get_opencc_status()
+
+    # ------------------------------------------------------------------
+    # 伺服器
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """開始監聽 (背景執行緒)"""
+        if self.socket_path.exists():
+            # 上次未正常結束留下的 socket 檔
+            self.socket_path.unlink()
+        self._server = _UnixServer(str(self.socket_path), _RpcHandler)
+        self._server.service = self
+        threading.Thread(target=self._server.serve_forever, name="rename-service", daemon=True).start()
+
+    def serve_forever(self) -> None:
+        """開始監聽並阻塞直到 shutdown"""
+        self.start()
+        self._stopped.wait()
+
+    def shutdown(self) -> None:
+        """停止接受請求、取消排隊中與執行中的工作 (執行中的於目前操作完成後停止) 並釋放資源"""
+        with self._cond:
+            if self._stopped.is_set():
+                return
+            for job in self._jobs.values():
+                if not job.finished:
+                    job.control.cancel()
+            self._start_ready()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self._pool.shutdown(wait=True)
+        if self.inventory is not None:
+            self.inventory.close()
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+        self._stopped.set()
+
+    # ------------------------------------------------------------------
+    # 工作佇列
+    # ------------------------------------------------------------------
+
+    def submit(self, params: Dict[str, Any], subscriber: Optional[Notify] = None) -> ServiceJob:
+        """
+        加入一個工作 (欄位與工作清單相同)
+
+        Args:
+            params: 工作欄位 (root 建議使用絕對路徑)
+            subscriber: 在工作開始前即訂閱的通知接收者
+
+        Raises:
+            ValueError: 欄位錯誤
+        """
+        with self._cond:
+            job_id = str(next(self._ids))
+            job = ServiceJob(job_id, parse_job(params, Path.cwd(), f"job{job_id}"))
+            self._jobs[job_id] = job
+            if subscriber is not None:
+                job.subscribers.append(subscriber)
+            self._waiting.append((job, Path(os.path.abspath(job.spec.root))))
+            self._start_ready()
+        return job
+
+    def get(self, job_id: Any) -> ServiceJob:
+        job = self._jobs.get(str(job_id))
+        if job is None:
+            raise ServiceError(INVALID_PARAMS, f"unknown job: {job_id}")
+        return job
+
+    def cancel(self, job: ServiceJob) -> None:
+        """取消工作 (排隊中直接取消，執行中於目前操作完成後停止)"""
+        job.control.cancel()
+        with self._cond:
+            self._start_ready()
+
+    def subscribe(self, job: ServiceJob, subscriber: Notify) -> None:
+        """訂閱工作通知；工作已結束時立即送出 done"""
+        with self._cond:
+            if not job.finished:
+                job.subscribers.append(subscriber)
+                return
+        subscriber(_notification("done", job.snapshot()))
+
+    def _notify(self, job: ServiceJob, method: str, params: dict) -> None:
+        with self._cond:
+            subscribers = list(job.subscribers)
+        for send in subscribers:
+            send(_notification(method, params))
+
+    def _start_ready(self) -> None:
+        """
+        將根目錄已空出的等待工作送進執行緒池 (呼叫時需持有 _cond)
+
+        同一棵樹一次只跑一個工作；與較早等待的工作重疊時也繼續等待，保持提交順序。
+        已取消的等待工作直接結束。
+        """
+        blocked = list(self._active_roots)
+        waiting = []
+        for job, root in self._waiting:
+            if job.control.is_cancelled:
+                self._finish(job, STATE_CANCELLED)
+            elif any(roots_overlap(root, r) for r in blocked):
+                waiting.append((job, root))
+                blocked.append(root)
+            else:
+                self._active_roots.append(root)
+                blocked.append(root)
+                self._pool.submit(self._run, job, root)
+        self._waiting = waiting
+
+    def _release(self, root: Path) -> None:
+        """釋放根目錄並啟動等待它的工作 (呼叫時需持有 _cond)"""
+        self._active_roots.remove(root)
+        self._start_ready()
+
+    def _run(self, job: ServiceJob, root: Path) -> None:
+        with self._cond:
+            # 送進執行緒池後、開始前被取消
+            if job.control.is_cancelled:
+                self._finish(job, STATE_CANCELLED)
+                self._release(root)
+                return
+            job.state = STATE_RUNNING
+        self._notify(job, "state", {"job": job.id, "state": job.state})
+
+        def on_progress(success: int, failed: int, total: int) -> None:
+            job.progress = (success, failed, total)
+            self._notify(job, "progress", {"job": job.id, "success": success, "failed": failed, "total": total})
+
+        try:
+            job.result = run_job(
+                job.spec,
+                journal_path(self.journal_dir, job.spec, f"{self._run_id}-{job.id}") if self.journal_dir is not None else None,
+                self.durable,
+                renamer=FileRenamer(inventory=self.inventory, metrics=self.metrics),
+                control=job.control,
+                progress=ThrottledProgress(on_progress, SERVICE_PROGRESS_INTERVAL)
+            )
+        finally:
+            with self._cond:
+                self._release(root)
+
+        if job.control.is_cancelled:
+            state = STATE_CANCELLED
+        else:
+            state = STATE_DONE if job.result.ok else STATE_FAILED
+        with self._cond:
+            self._finish(job, state)
+
+    def _finish(self, job: ServiceJob, state: str) -> None:
+        """標記結束並通知訂閱者 (呼叫時需持有 _cond)"""
+        job.state = state
+        subscribers, job.subscribers = job.subscribers, []
+        message = _notification("done", job.snapshot())
+        for send in subscribers:
+            send(message)
+
+        self._finished.append(job.id)
+        while len(self._finished) > self.job_retention:
+            self._jobs.pop(self._finished.popleft(), None)
+
+    # ------------------------------------------------------------------
+    # JSON-RPC
+    # ------------------------------------------------------------------
+
+    def dispatch(self, method: str, params: Dict[str, Any], events: Optional[Notify] = None) -> Any:
+        """
+        執行一個 RPC 方法
+
+        Args:
+            method: 方法名稱
+            params: 參數
+            events: 串流通知的接收者 (submit stream=true / watch)
+
+        Returns:
+            回應的 result
+        """
+        if method == "ping":
+            return {"opencc": get_opencc_status(), "jobs": len(self._jobs)}
+        if method == "submit":
+            params = dict(params)
+            stream = params.pop("stream", False)
+            try:
+                job = self.submit(params, events if stream else None)
+            except (TypeError, ValueError) as e:
+                raise ServiceError(INVALID_PARAMS, str(e))
+            return job.snapshot()
+        if method == "status":
+            return self.get(params.get("job")).snapshot()
+        if method == "list":
+            with self._cond:
+                jobs = list(self._jobs.values())
+            return [job.snapshot() for job in jobs]
+        if method == "watch":
+            job = self.get(params.get("job"))
+            self.subscribe(job, events)
+            return job.snapshot()
+        if method == "cancel":
+            job = self.get(params.get("job"))
+            self.cancel(job)
+            return job.snapshot()
+        if method == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return True
+        raise ServiceError(METHOD_NOT_FOUND, f"unknown method: {method}")
+
+    def handle_line(self, line: bytes, send: Notify) -> None:
+        """處理一行請求；串流請求會在回應後持續送出通知直到 done"""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict) or "method" not in request:
+                raise ServiceError(INVALID_REQUEST, "invalid request")
+        except ValueError as e:
+            send({"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(e)}})
+            return
+        except ServiceError as e:
+            send({"jsonrpc": "2.0", "id": None, "error": {"code": e.code, "message": str(e)}})
+            return
+
+        request_id = request.get("id")
+        params = request.get("params")
+        if params is None:
+            params = {}
+        elif not isinstance(params, dict):
+            # 只支援具名參數
+            if request_id is not None:
+                send({"jsonrpc": "2.0", "id": request_id,
+                      "error": {"code": INVALID_PARAMS, "message": "params must be an object"}})
+            return
+        # 通知先進佇列，回應送出後才依序寫出 (所有寫入都在此連線的執行緒)
+        events: "queue.Queue[dict]" = queue.Queue()
+        streaming = request["method"] == "watch" or (request["method"] == "submit" and params.get("stream"))
+
+        try:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": self.dispatch(request["method"], params, events.put)}
+        except ServiceError as e:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": str(e)}}
+            streaming = False
+        if request_id is not None:
+            send(response)
+
+        while streaming:
+            message = events.get()
+            send(message)
+            streaming = message["method"] != "done"
+
+
+# Windows 沒有 UnixStreamServer (RenameService 建構時即會報錯)
+class _UnixServer(socketserver.ThreadingMixIn, getattr(socketserver, "UnixStreamServer", object)):
+    daemon_threads = True
+    service: RenameService
+
+
+class _RpcHandler(socketserver.StreamRequestHandler):
+    """One client connection: newline-delimited JSON-RPC"""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if line.strip():
+                try:
+                    self.server.service.handle_line(line, self._send)
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+
+    def _send(self, message: dict) -> None:
+        self.wfile.write((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+class ServiceClient:
+    """Minimal blocking client for RenameService"""
+
+    def __init__(self, socket_path: Path, timeout: Optional[float] = None):
+        """
+        Args:
+            socket_path: 服務的 Unix domain socket 路徑
+            timeout: 讀寫逾時 (秒，None = 不逾時)
+        """
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(str(socket_path))
+        self._file = self._sock.makefile("rwb")
+        self._ids = itertools.count(1)
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "ServiceClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _read(self) -> dict:
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("service closed the connection")
+        return json.loads(line)
+
+    def call(self, method: str, on_notify: Optional[Callable[[str, dict], None]] = None, **params: Any) -> Any:
+        """
+        呼叫一個方法
+
+        Args:
+            method: 方法名稱
+            on_notify: 提供時持續讀取通知 (方法名稱, 參數) 直到 done (用於 submit stream=True / watch)
+            **params: 方法參數
+
+        Returns:
+            回應的 result
+
+        Raises:
+            ServiceError: 服務回傳錯誤
+        """
+        request_id = next(self._ids)
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        self._file.write((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._file.flush()
+
+        response = self._read()
+        if "error" in response:
+            raise ServiceError(response["error"]["code"], response["error"]["message"])
+
+        if on_notify is not None:
+            while True:
+                message = self._read()
+                on_notify(message["method"], message["params"])
+                if message["method"] == "done":
+                    break
+        return response["result"]
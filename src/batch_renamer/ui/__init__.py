@@ -1,4 +1,11 @@
 """UI module for Flet-based GUI"""
-from .app import create_app
 
 __all__ = ['create_app']
+
+
+def __getattr__(name: str):
+    # 延遲載入：匯入 batch_renamer.ui 時不會載入 Flet
+    if name == "create_app":
+        from .app import create_app
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,19 +1,30 @@
 """Flet GUI application - Main entry point and UI layout"""
 
+import threading
+from contextlib import nullcontext
 import flet as ft
 from flet import app as flet_app
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 from ..core.renamer import FileRenamer
-from ..utils.constants import COLORS
+from ..core.executor import RenameWorker
+from ..core.durability import RenameSummary
+from ..core.plan import RenamePlan
+from ..core.preview import PreviewPager
+from ..core.stats import stats_from_env
+from ..utils.constants import COLORS, UI_REFRESH_INTERVAL, PREVIEW_DEBOUNCE_DELAY, PREVIEW_SAMPLE_SIZE, UI_LOG_LINES
 from ..utils.converter import get_opencc_status
+from ..utils.eventlog import EVENT_LOG, EXECUTION_PAUSED, INFO, ERROR, WARNING
+from ..utils.scheduler import DebouncedScheduler, CancelToken
+from ..utils.startup import STARTUP
 from ..utils.strings import get_string, LANGUAGES
+from .components import PreviewList
 
 
 def create_app() -> None:
     """Create and run the Flet application"""
 
-    renamer = FileRenamer()
+    renamer = FileRenamer(stats=stats_from_env())
 
     def main(page: ft.Page):
         """Main application entry point"""
@@ -26,11 +37,17 @@ def create_app() -> None:
         current_language = ["en"]
         app_state: Dict[str, Any] = {
             "confirming": False,
-            "targets": [],
+            "plan": None,
             "is_executing": False,
-            "is_loading": False
+            "is_loading": False,
+            "worker": None,
+            "ui_ready": False,
+            "log_since": 0
         }
         refs = {}
+        scheduler = DebouncedScheduler(PREVIEW_DEBOUNCE_DELAY)
+        # renamer 的計畫快取不是執行緒安全的；被取消的舊計算可能尚未結束，背景計算依序持有此鎖
+        plan_lock = threading.Lock()
 
         # =====================================================================
         # HELPER FUNCTIONS
@@ -47,61 +64,70 @@ def create_app() -> None:
             if not targets:
                 controls.append(ft.Text(_get_text("alert_no_files"), color="orange"))
             else:
-                item, new_name = targets[0]
+                operation = refs["op_mode"].value
+                find_text = refs["replace_from"].value if operation == "replace" else ""
 
-                if item.name == new_name:
-                    controls.append(
-                        ft.Text(item.name, color="grey", font_family="monospace")
-                    )
-                else:
-                    operation = refs["op_mode"].value
-                    find_text = refs["replace_from"].value if operation == "replace" else ""
-
-                    if operation == "replace" and find_text and find_text in item.name:
-                        parts = item.name.split(find_text)
-                        preview_parts = []
-
-                        for i, part in enumerate(parts):
-                            if part:
-                                preview_parts.append(
-                                    ft.Text(part, color="grey", font_family="monospace", size=11)
-                                )
-                            if i < len(parts) - 1:
-                                preview_parts.append(
-                                    ft.Text(find_text, color=COLORS["accent"], font_family="monospace", size=11, weight="bold")
-                                )
-
-                        controls.append(ft.Row(preview_parts, spacing=0))
-                    else:
-                        controls.append(
-                            ft.Text(item.name, color="grey", font_family="monospace", size=11)
-                        )
-
-                    controls.append(
-                        ft.Row([
-                            ft.Text(" → ", color=COLORS["accent"], size=11),
-                            ft.Text(new_name, color=COLORS["accent"], weight="bold", font_family="monospace", size=11)
-                        ], spacing=0)
-                    )
+                for item, new_name in targets[:PREVIEW_SAMPLE_SIZE]:
+                    controls.extend(_build_preview_sample(item, new_name, operation, find_text))
 
             refs["live_preview_container"].controls = controls
             refs["live_preview_container"].update()
 
-        def _update_status_banner(targets: List[Tuple[Path, str]]) -> None:
+        def _build_preview_sample(item: Path, new_name: str, operation: str, find_text: str) -> List[ft.Control]:
+            """Build preview controls for one sampled entry"""
+            if item.name == new_name:
+                return [ft.Text(item.name, color="grey", font_family="monospace")]
+
+            controls = []
+            if operation == "replace" and find_text and find_text in item.name:
+                parts = item.name.split(find_text)
+                preview_parts = []
+
+                for i, part in enumerate(parts):
+                    if part:
+                        preview_parts.append(
+                            ft.Text(part, color="grey", font_family="monospace", size=11)
+                        )
+                    if i < len(parts) - 1:
+                        preview_parts.append(
+                            ft.Text(find_text, color=COLORS["accent"], font_family="monospace", size=11, weight="bold")
+                        )
+
+                controls.append(ft.Row(preview_parts, spacing=0))
+            else:
+                controls.append(
+                    ft.Text(item.name, color="grey", font_family="monospace", size=11)
+                )
+
+            controls.append(
+                ft.Row([
+                    ft.Text(" → ", color=COLORS["accent"], size=11),
+                    ft.Text(new_name, color=COLORS["accent"], weight="bold", font_family="monospace", size=11)
+                ], spacing=0)
+            )
+            return controls
+
+        def _update_status_banner(plan: Optional[RenamePlan]) -> None:
             """Update status banner"""
-            changed_count = sum(1 for t in targets if t[0].name != t[1])
-            total_count = len(targets)
+            changed_count = plan.changed_count if plan is not None else 0
+            total_count = plan.total_count if plan is not None else 0
 
             if total_count > 300:
                 status_msg = _get_text("status_warning", total_count, changed_count)
-                _set_status_banner("warning", status_msg)
+                _set_status_banner("warning", _status_with_stats(status_msg))
             elif changed_count > 0:
                 status_msg = _get_text("status_ready", changed_count)
-                _set_status_banner("ready", status_msg)
+                _set_status_banner("ready", _status_with_stats(status_msg))
             else:
                 opencc_status = get_opencc_status()
                 status_msg = _get_text("status_idle") + f" ({opencc_status})"
-                _set_status_banner("idle", status_msg)
+                _set_status_banner("idle", _status_with_stats(status_msg))
+
+        def _status_with_stats(message: str) -> str:
+            """Append the timing summary to a banner message when stats are enabled"""
+            if renamer.stats is None:
+                return message
+            return f"{message}  [{renamer.stats.summary()}]"
 
         def _update_input_states() -> None:
             """Dynamically enable/disable input fields based on operation mode"""
@@ -130,6 +156,20 @@ def create_app() -> None:
             refs["status_banner"].bgcolor = config["color"]
             refs["status_banner"].update()
 
+        def _render_log(*lines: ft.Control) -> None:
+            """Show status lines followed by the newest events of this run (read from the ring buffer)"""
+            level_colors = {ERROR: COLORS["red"], WARNING: "orange", INFO: COLORS["text_dim"]}
+            events = EVENT_LOG.events(since=app_state["log_since"], level=INFO, limit=UI_LOG_LINES)
+            refs["preview_log"].controls = list(lines) + [
+                ft.Text(
+                    f"[{event.code}] {Path(event.path).name}: {event.message}" if event.path
+                    else f"[{event.code}] {event.message}",
+                    color=level_colors.get(event.level, COLORS["text_dim"]), size=12
+                )
+                for event in events
+            ]
+            refs["preview_log"].update()
+
         def _reset_execute_button() -> None:
             """Reset execute button to initial state"""
             app_state["confirming"] = False
@@ -140,6 +180,14 @@ def create_app() -> None:
             refs["btn_execute"].disabled = False
             refs["btn_execute"].update()
 
+        def _set_execution_controls(running: bool) -> None:
+            """Show pause/cancel buttons while a rename is running"""
+            refs["btn_pause"].text = _get_text("exec_btn_pause")
+            refs["btn_pause"].icon = ft.Icons.PAUSE
+            refs["btn_cancel"].disabled = False
+            refs["execution_controls"].visible = running
+            refs["execution_controls"].update()
+
         def _show_step3_loading() -> None:
             """Show loading indicator for Step 3"""
             if "step3_loading_indicator" in refs:
@@ -156,21 +204,21 @@ def create_app() -> None:
                 indicator.controls[1].value = ""
                 indicator.update()
 
-        def _get_targets() -> List[Tuple[Path, str]]:
-            """Get target files list based on current settings"""
+        def _collect_scan_settings() -> Optional[Dict[str, Any]]:
+            """Snapshot current settings as scan_directory keyword arguments"""
             raw_path = refs["selected_path"].value
             if not raw_path:
-                return []
+                return None
 
             p = Path(raw_path.strip())
             if not p.exists():
-                return []
+                return None
 
             valid_exts = []
             if refs["filter_ext"].value:
                 valid_exts = [e.strip().lower() for e in refs["filter_ext"].value.split(',')]
 
-            return renamer.scan_directory(
+            return dict(
                 root_path=p,
                 rename_mode=refs["rename_mode"].value,
                 filter_type=refs["filter_type"].value,
@@ -183,23 +231,75 @@ def create_app() -> None:
                 symbols=refs["remove_sym_input"].value
             )
 
-        def update_ui(e=None) -> None:
-            """Main UI update function"""
+        def _apply_sample(sample: List[Tuple[Path, str]]) -> None:
+            """Show the first sampled entries while the full count is still running"""
+            with _render_phase():
+                _update_live_preview(sample)
+                if sample:
+                    _set_status_banner("idle", _get_text("status_counting"))
+                page.update()
+
+        def _apply_plan(plan: Optional[RenamePlan]) -> None:
+            """Apply a finished scan to the status banner"""
+            with _render_phase():
+                app_state["plan"] = plan
+
+                if plan is None or not plan.targets:
+                    _update_live_preview([])
+                _update_status_banner(plan)
+
+                app_state["is_loading"] = False
+                _hide_step3_loading()
+
+                page.update()
+
+        def _render_phase():
+            """Time Flet rendering as the "render" phase (no-op when stats are disabled)"""
+            return renamer.stats.phase("render") if renamer.stats is not None else nullcontext()
+
+        def _compute_plan(settings: Optional[Dict[str, Any]], token: CancelToken) -> Optional[RenamePlan]:
+            """Background pass: publish a small sample first, then build the shared plan"""
+            if settings is None:
+                return None
+
+            with plan_lock:
+                if renamer.stats is not None:
+                    renamer.stats.reset()
+                sample = renamer.sample_targets(PREVIEW_SAMPLE_SIZE, **settings, cancel_check=token)
+                scheduler.publish(token, _apply_sample, sample)
+                return renamer.build_plan(settings, cancel_check=token)
+
+        def _compute_full_plan(settings: Optional[Dict[str, Any]], token: CancelToken) -> Optional[RenamePlan]:
+            """Background pass for the full preview (reuses the cached plan when nothing changed)"""
+            if settings is None:
+                return None
+            with plan_lock:
+                return renamer.build_plan(settings, cancel_check=token)
+
+        def _request_update(delay: Optional[float] = None) -> None:
+            """Recompute the plan off-thread; superseded computations are cancelled"""
+            if not app_state["ui_ready"]:
+                return
+
             _reset_execute_button()
             app_state["is_loading"] = True
             _show_step3_loading()
-
-            targets = _get_targets()
-            app_state["targets"] = targets
-
-            _update_live_preview(targets)
-            _update_status_banner(targets)
             _update_input_states()
 
-            app_state["is_loading"] = False
-            _hide_step3_loading()
+            settings = _collect_scan_settings()
+            scheduler.schedule(
+                lambda token: _compute_plan(settings, token),
+                _apply_plan,
+                delay=delay
+            )
 
-            page.update()
+        def update_ui(e=None) -> None:
+            """Main UI update function"""
+            _request_update(delay=0)
+
+        def schedule_update(e=None) -> None:
+            """Debounced update for text input"""
+            _request_update()
 
         # =====================================================================
         # EVENT HANDLERS
@@ -207,6 +307,9 @@ def create_app() -> None:
 
         def on_reset_click(e=None) -> None:
             """Reset button handler"""
+            if not app_state["ui_ready"]:
+                return
+
             if app_state["is_executing"]:
                 page.snack_bar = ft.SnackBar(
                     content=ft.Text(_get_text("alert_cant_reset")),
@@ -216,6 +319,12 @@ def create_app() -> None:
                 page.update()
                 return
 
+            # 停止尚未完成的預覽計算，避免舊結果在重設後寫回畫面
+            scheduler.cancel()
+            app_state["plan"] = None
+            app_state["is_loading"] = False
+            _hide_step3_loading()
+
             refs["selected_path"].value = ""
             refs["rename_mode"].value = "files"
             refs["filter_type"].value = "all"
@@ -236,11 +345,11 @@ def create_app() -> None:
 
         def on_execute_click(e=None) -> None:
             """Execute button handler"""
-            if app_state["is_executing"]:
+            if app_state["is_executing"] or app_state["is_loading"]:
                 return
 
-            targets = app_state["targets"]
-            changed = [t for t in targets if t[0].name != t[1]]
+            plan = app_state["plan"]
+            changed = plan.changed if plan is not None else []
 
             if not changed:
                 page.snack_bar = ft.SnackBar(
@@ -259,54 +368,132 @@ def create_app() -> None:
                 refs["btn_execute"].icon = ft.Icons.WARNING
                 refs["btn_execute"].update()
             else:
+                # 確認後才執行前再驗證一次：設定或檔案系統在預覽後改變時重新掃描，不執行舊計畫
+                settings = _collect_scan_settings()
+                if settings is None or not plan.matches(settings) or plan.is_stale():
+                    page.snack_bar = ft.SnackBar(
+                        content=ft.Text(_get_text("alert_plan_outdated")),
+                        bgcolor="orange"
+                    )
+                    page.snack_bar.open = True
+                    page.update()
+                    _request_update(delay=0)
+                    return
+
                 app_state["is_executing"] = True
                 refs["btn_execute"].disabled = True
                 refs["btn_execute"].text = _get_text("exec_btn_renaming")
                 refs["btn_execute"].bgcolor = "grey700"
                 refs["btn_execute"].update()
+                _set_execution_controls(True)
 
-                log_lines = [ft.Text(_get_text("execution_start"), color=COLORS["accent"])]
-                refs["preview_log"].controls = log_lines
-                refs["preview_log"].update()
+                app_state["log_since"] = EVENT_LOG.last_seq
+                start_line = ft.Text(_get_text("execution_start"), color=COLORS["accent"])
+                progress_line = ft.Text(
+                    _get_text("execution_progress", 0, len(changed)), color=COLORS["text_dim"], size=13
+                )
+                _render_log(start_line, progress_line)
                 page.update()
+                rendered_seq = [EVENT_LOG.last_seq]
+
+                def on_progress(success: int, failed: int, total: int) -> None:
+                    """Progress reported from the worker thread (throttled)"""
+                    progress_line.value = _get_text("execution_progress", success, total - success - failed)
+                    if EVENT_LOG.last_seq != rendered_seq[0]:
+                        # 有新的失敗記錄時才重建記錄面板
+                        rendered_seq[0] = EVENT_LOG.last_seq
+                        _render_log(start_line, progress_line)
+                    else:
+                        progress_line.update()
 
-                try:
-                    success, failed = renamer.execute_rename(targets)
-
-                    log_lines = [
-                        ft.Text(_get_text("execution_start"), color=COLORS["accent"]),
-                        ft.Text(_get_text("execution_progress", success, 0), color=COLORS["text_dim"], size=13),
-                        ft.Text(_get_text("execution_complete", success), weight="bold", color="green")
-                    ]
-
-                finally:
+                def on_complete(summary: RenameSummary) -> None:
+                    """Worker finished or was cancelled"""
+                    app_state["worker"] = None
                     app_state["is_executing"] = False
+                    _set_execution_controls(False)
                     _reset_execute_button()
                     update_ui()
-                    refs["preview_log"].controls = log_lines
-                    refs["preview_log"].update()
 
-                    page.snack_bar = ft.SnackBar(
-                        content=ft.Text(_get_text("alert_success", success)),
-                        bgcolor="green"
-                    )
+                    if summary.error is not None:
+                        done_line = ft.Text(_get_text("execution_failed", summary.error), weight="bold", color="red")
+                    elif summary.cancelled:
+                        done_line = ft.Text(_get_text("execution_cancelled", summary.success), weight="bold", color="orange")
+                    else:
+                        done_line = ft.Text(_get_text("execution_complete", summary.success), weight="bold", color="green")
+                    progress_line.value = _get_text("execution_progress", summary.success, summary.total - summary.success - summary.failed)
+                    _render_log(start_line, progress_line, done_line)
+
+                    if summary.error is not None:
+                        page.snack_bar = ft.SnackBar(content=ft.Text(_get_text("execution_failed", summary.error)), bgcolor="red")
+                    else:
+                        page.snack_bar = ft.SnackBar(
+                            content=ft.Text(_get_text("alert_success", summary.success)),
+                            bgcolor="orange" if summary.cancelled else "green"
+                        )
                     page.snack_bar.open = True
                     page.update()
 
+                worker = RenameWorker(
+                    renamer, changed,
+                    on_progress=on_progress,
+                    on_complete=on_complete,
+                    refresh_interval=UI_REFRESH_INTERVAL
+                )
+                app_state["worker"] = worker
+                worker.start()
+
+        def on_pause_click(e=None) -> None:
+            """Pause / resume button handler"""
+            worker = app_state["worker"]
+            if worker is None:
+                return
+
+            if worker.control.is_paused:
+                worker.resume()
+                refs["btn_pause"].text = _get_text("exec_btn_pause")
+                refs["btn_pause"].icon = ft.Icons.PAUSE
+            else:
+                worker.pause()
+                refs["btn_pause"].text = _get_text("exec_btn_resume")
+                refs["btn_pause"].icon = ft.Icons.PLAY_ARROW
+                EVENT_LOG.info(EXECUTION_PAUSED, _get_text("execution_paused"))
+            refs["btn_pause"].update()
+
+        def on_cancel_click(e=None) -> None:
+            """Cancel button handler (stops after the current operation)"""
+            worker = app_state["worker"]
+            if worker is not None:
+                worker.cancel()
+                refs["btn_cancel"].disabled = True
+                refs["btn_cancel"].update()
+
         def on_show_full_preview(e=None) -> None:
             """Show full preview handler"""
-            targets = _get_targets()
-            log_lines = [ft.Text(_get_text("preview_mode"), color="yellow")]
-
-            for item, new_name in targets:
-                if item.name != new_name:
-                    log_lines.append(ft.Row([
-                        ft.Text(item.name, color="grey", selectable=True, expand=True),
-                        ft.Text(" → ", color=COLORS["accent"], size=12, weight="bold"),
-                        ft.Text(new_name, color=COLORS["accent"], weight="bold", selectable=True, expand=True)
-                    ], spacing=8))
-
-            refs["preview_log"].controls = log_lines
+            if not app_state["ui_ready"]:
+                return
+
+            _reset_execute_button()
+            app_state["is_loading"] = True
+            _show_step3_loading()
+
+            settings = _collect_scan_settings()
+            scheduler.schedule(
+                lambda token: _compute_full_plan(settings, token),
+                _apply_full_preview,
+                delay=0
+            )
+
+        def _apply_full_preview(plan: Optional[RenamePlan]) -> None:
+            """Show the paged list of every change once the background scan is done"""
+            _apply_plan(plan)
+
+            preview_list = PreviewList(PreviewPager(plan.changed if plan is not None else []), _get_text)
+            refs["preview_list"] = preview_list
+
+            refs["preview_log"].controls = [
+                ft.Text(_get_text("preview_mode"), color="yellow"),
+                preview_list.control
+            ]
             refs["preview_log"].update()
 
         def on_language_change(e=None) -> None:
@@ -315,6 +502,7 @@ def create_app() -> None:
             current_language[0] = lang
             page.clean()
             _build_ui()
+            _build_steps()
             page.update()
 
         # =====================================================================
@@ -322,7 +510,8 @@ def create_app() -> None:
         # =====================================================================
 
         def _build_ui():
-            """Build all UI components"""
+            """Build the first frame: header, step 1 and the execution panel"""
+            app_state["ui_ready"] = False
 
             # --- STEP 1: SOURCE FOLDER ---
             selected_path_field = ft.TextField(
@@ -362,6 +551,135 @@ def create_app() -> None:
                 padding=15, bgcolor=COLORS["card"], border_radius=10
             )
 
+            # --- RIGHT COLUMN: EXECUTION & LOG ---
+            status_display = ft.Container(
+                content=ft.Row([
+                    ft.Icon(ft.Icons.INFO_OUTLINE, color="white"),
+                    ft.Text(_get_text("exec_status_waiting"), color="white", weight=ft.FontWeight.BOLD)
+                ], alignment=ft.MainAxisAlignment.CENTER),
+                bgcolor="grey700", padding=12, border_radius=8
+            )
+            refs["status_banner"] = status_display
+
+            preview_btn = ft.Button(
+                _get_text("exec_btn_preview"),
+                icon=ft.Icons.VISIBILITY,
+                style=ft.ButtonStyle(color=COLORS["accent"], bgcolor=COLORS["card"])
+            )
+            preview_btn.on_click = on_show_full_preview
+            refs["preview_btn"] = preview_btn
+
+            execute_btn = ft.Button(
+                _get_text("exec_btn_execute"),
+                icon=ft.Icons.ROCKET_LAUNCH,
+                style=ft.ButtonStyle(color="black", bgcolor=COLORS["accent"])
+            )
+            execute_btn.on_click = on_execute_click
+            refs["btn_execute"] = execute_btn
+
+            action_buttons = ft.Row([
+                ft.Container(content=preview_btn, height=50, expand=True),
+                ft.Container(content=execute_btn, height=50, expand=True)
+            ], spacing=8)
+
+            pause_btn = ft.Button(_get_text("exec_btn_pause"), icon=ft.Icons.PAUSE, expand=True)
+            pause_btn.on_click = on_pause_click
+            refs["btn_pause"] = pause_btn
+
+            cancel_btn = ft.Button(
+                _get_text("exec_btn_cancel"),
+                icon=ft.Icons.STOP,
+                style=ft.ButtonStyle(color="white", bgcolor=COLORS["red"]),
+                expand=True
+            )
+            cancel_btn.on_click = on_cancel_click
+            refs["btn_cancel"] = cancel_btn
+
+            execution_controls = ft.Row([pause_btn, cancel_btn], spacing=8, visible=False)
+            refs["execution_controls"] = execution_controls
+
+            preview_log = ft.Column(spacing=4, scroll="auto")
+            refs["preview_log"] = preview_log
+
+            log_area = ft.Container(
+                content=preview_log,
+                border_radius=4,
+                padding=8,
+                expand=True
+            )
+
+            right_column = ft.Column([
+                ft.Text(_get_text("exec_title"), size=18, weight=ft.FontWeight.BOLD),
+                status_display,
+                action_buttons,
+                execution_controls,
+                log_area
+            ], spacing=12, expand=True)
+
+            step_actions = ft.Container(
+                content=right_column,
+                padding=12, bgcolor=COLORS["card"], border_radius=10,
+                expand=True
+            )
+
+            # --- MAIN LAYOUT ---
+            language_btn = ft.Button(
+                "EN" if current_language[0] == "en" else "中文",
+                icon=ft.Icons.LANGUAGE,
+                height=36
+            )
+            language_btn.on_click = on_language_change
+            refs["language_btn"] = language_btn
+
+            reset_btn = ft.IconButton(
+                ft.Icons.REFRESH,
+                icon_size=24,
+                tooltip=_get_text("btn_reset")
+            )
+            reset_btn.on_click = on_reset_click
+            refs["reset_btn"] = reset_btn
+
+            header_row = ft.Row([
+                ft.Column([
+                    ft.Row([
+                        ft.Icon(ft.Icons.DRIVE_FILE_RENAME_OUTLINE, color=COLORS["accent"], size=32),
+                        ft.Column([
+                            ft.Text(_get_text("app_title"), size=24, weight=ft.FontWeight.BOLD),
+                            ft.Text(_get_text("app_subtitle"), size=10, color=COLORS["text_dim"])
+                        ], spacing=2)
+                    ], spacing=12, alignment=ft.MainAxisAlignment.START)
+                ], expand=True),
+                ft.Row([language_btn, reset_btn], spacing=8)
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
+
+            steps_column = ft.Column(
+                [step1],
+                expand=6, spacing=12,
+                scroll=ft.ScrollMode.AUTO
+            )
+            refs["steps_column"] = steps_column
+
+            main_content = ft.Column([
+                header_row,
+                ft.Container(height=12),
+                ft.Row([
+                    steps_column,
+                    ft.Column([step_actions], expand=6)
+                ], vertical_alignment=ft.CrossAxisAlignment.STRETCH, spacing=16, expand=True)
+            ], expand=True)
+
+            content = ft.Container(
+                expand=True,
+                bgcolor=COLORS["bg"],
+                padding=28,
+                content=main_content
+            )
+
+            page.add(content)
+
+        def _build_steps():
+            """Build steps 2-4 once the first frame is on screen"""
+
             # --- STEP 2: FILTER ---
             filter_type_group = ft.RadioGroup(
                 value="all",
@@ -378,7 +696,7 @@ def create_app() -> None:
                 disabled=True,
                 dense=True
             )
-            filter_ext_field.on_change = update_ui
+            filter_ext_field.on_change = schedule_update
             refs["filter_ext"] = filter_ext_field
 
             step2 = ft.Container(
@@ -424,7 +742,7 @@ def create_app() -> None:
                 expand=True, disabled=True,
                 dense=True
             )
-            replace_from_field.on_change = update_ui
+            replace_from_field.on_change = schedule_update
             refs["replace_from"] = replace_from_field
 
             replace_to_field = ft.TextField(
@@ -432,7 +750,7 @@ def create_app() -> None:
                 expand=True, disabled=True,
                 dense=True
             )
-            replace_to_field.on_change = update_ui
+            replace_to_field.on_change = schedule_update
             refs["replace_to"] = replace_to_field
 
             replace_fields_row = ft.Row([replace_from_field, replace_to_field], visible=False)
@@ -458,21 +776,21 @@ def create_app() -> None:
                 hint_text=_get_text("step4_remove_hint"),
                 dense=True
             )
-            remove_sym_field.on_change = update_ui
+            remove_sym_field.on_change = schedule_update
             refs["remove_sym_input"] = remove_sym_field
 
             prefix_field = ft.TextField(
                 label=_get_text("step4_prefix"),
                 expand=True, dense=True
             )
-            prefix_field.on_change = update_ui
+            prefix_field.on_change = schedule_update
             refs["prefix_input"] = prefix_field
 
             suffix_field = ft.TextField(
                 label=_get_text("step4_suffix"),
                 expand=True, dense=True
             )
-            suffix_field.on_change = update_ui
+            suffix_field.on_change = schedule_update
             refs["suffix_input"] = suffix_field
 
             live_preview_col = ft.Column()
@@ -490,114 +808,24 @@ def create_app() -> None:
                 padding=16, bgcolor=COLORS["card"], border_radius=12
             )
 
-            # --- RIGHT COLUMN: EXECUTION & LOG ---
-            status_display = ft.Container(
-                content=ft.Row([
-                    ft.Icon(ft.Icons.INFO_OUTLINE, color="white"),
-                    ft.Text(_get_text("exec_status_waiting"), color="white", weight=ft.FontWeight.BOLD)
-                ], alignment=ft.MainAxisAlignment.CENTER),
-                bgcolor="grey700", padding=12, border_radius=8
-            )
-            refs["status_banner"] = status_display
-
-            preview_btn = ft.Button(
-                _get_text("exec_btn_preview"),
-                icon=ft.Icons.VISIBILITY,
-                style=ft.ButtonStyle(color=COLORS["accent"], bgcolor=COLORS["card"])
-            )
-            preview_btn.on_click = on_show_full_preview
-            refs["preview_btn"] = preview_btn
-
-            execute_btn = ft.Button(
-                _get_text("exec_btn_execute"),
-                icon=ft.Icons.ROCKET_LAUNCH,
-                style=ft.ButtonStyle(color="black", bgcolor=COLORS["accent"])
-            )
-            execute_btn.on_click = on_execute_click
-            refs["btn_execute"] = execute_btn
-
-            action_buttons = ft.Row([
-                ft.Container(content=preview_btn, height=50, expand=True),
-                ft.Container(content=execute_btn, height=50, expand=True)
-            ], spacing=8)
-
-            preview_log = ft.Column(spacing=4, scroll="auto")
-            refs["preview_log"] = preview_log
-
-            log_area = ft.Container(
-                content=preview_log,
-                border_radius=4,
-                padding=8,
-                expand=True
-            )
-
-            right_column = ft.Column([
-                ft.Text(_get_text("exec_title"), size=18, weight=ft.FontWeight.BOLD),
-                status_display,
-                action_buttons,
-                log_area
-            ], spacing=12, expand=True)
-
-            step_actions = ft.Container(
-                content=right_column,
-                padding=12, bgcolor=COLORS["card"], border_radius=10,
-                expand=True
-            )
-
-            # --- MAIN LAYOUT ---
-            language_btn = ft.Button(
-                "EN" if current_language[0] == "en" else "中文",
-                icon=ft.Icons.LANGUAGE,
-                height=36
-            )
-            language_btn.on_click = on_language_change
-            refs["language_btn"] = language_btn
-
-            reset_btn = ft.IconButton(
-                ft.Icons.REFRESH,
-                icon_size=24,
-                tooltip=_get_text("btn_reset")
-            )
-            reset_btn.on_click = on_reset_click
-            refs["reset_btn"] = reset_btn
-
-            header_row = ft.Row([
-                ft.Column([
-                    ft.Row([
-                        ft.Icon(ft.Icons.DRIVE_FILE_RENAME_OUTLINE, color=COLORS["accent"], size=32),
-                        ft.Column([
-                            ft.Text(_get_text("app_title"), size=24, weight=ft.FontWeight.BOLD),
-                            ft.Text(_get_text("app_subtitle"), size=10, color=COLORS["text_dim"])
-                        ], spacing=2)
-                    ], spacing=12, alignment=ft.MainAxisAlignment.START)
-                ], expand=True),
-                ft.Row([language_btn, reset_btn], spacing=8)
-            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
-
-            main_content = ft.Column([
-                header_row,
-                ft.Container(height=12),
-                ft.Row([
-                    ft.Column(
-                        [step1, step2, step3, step4],
-                        expand=6, spacing=12,
-                        scroll=ft.ScrollMode.AUTO
-                    ),
-                    ft.Column([step_actions], expand=6)
-                ], vertical_alignment=ft.CrossAxisAlignment.STRETCH, spacing=16, expand=True)
-            ], expand=True)
-
-            content = ft.Container(
-                expand=True,
-                bgcolor=COLORS["bg"],
-                padding=28,
-                content=main_content
-            )
-
-            page.add(content)
+            refs["steps_column"].controls.extend([step2, step3, step4])
+            app_state["ui_ready"] = True
             _update_input_states()
 
+        def _warm_up() -> None:
+            """Nonessential startup work, run after the UI is complete"""
+            get_opencc_status()
+            STARTUP.mark("opencc_ready")
+            STARTUP.write()
+
         _build_ui()
         page.update()
+        STARTUP.mark("first_paint")
+
+        _build_steps()
+        page.update()
+        STARTUP.mark("ui_complete")
+
+        threading.Thread(target=_warm_up, daemon=True).start()
 
     flet_app(target=main)
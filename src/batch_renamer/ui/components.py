@@ -2,6 +2,7 @@
 
 import flet as ft
 from typing import Callable, Optional, Dict, Any
+from ..core.preview import PreviewPager
 from ..utils.constants import COLORS
 
 
@@ -106,3 +107,85 @@ class LivePreviewLog:
 
     def update(self):
         self.log_column.update()
+
+
+class PreviewList:
+    """分頁式完整預覽列表 (只為目前頁面建立控制項)"""
+
+    def __init__(self, pager: PreviewPager, get_text: Callable[..., str]):
+        self.pager = pager
+        self.get_text = get_text
+        self.current_page = 0
+        self.highlight: Optional[int] = None
+
+        self.page_label = ft.Text("", color=COLORS["text_dim"], size=12)
+        self.rows = ft.Column(spacing=4)
+        self.jump_field = ft.TextField(
+            label=get_text("preview_jump_label"), dense=True, width=110,
+            on_submit=self._on_jump
+        )
+        self.search_field = ft.TextField(
+            label=get_text("preview_search_label"), dense=True, expand=True,
+            on_submit=self._on_search
+        )
+
+        self.control = ft.Column([
+            ft.Row([
+                ft.IconButton(ft.Icons.FIRST_PAGE, on_click=lambda e: self.show_page(0)),
+                ft.IconButton(ft.Icons.CHEVRON_LEFT, on_click=lambda e: self.show_page(self.current_page - 1)),
+                self.page_label,
+                ft.IconButton(ft.Icons.CHEVRON_RIGHT, on_click=lambda e: self.show_page(self.current_page + 1)),
+                ft.IconButton(ft.Icons.LAST_PAGE, on_click=lambda e: self.show_page(self.pager.page_count - 1)),
+            ], spacing=0, vertical_alignment=ft.CrossAxisAlignment.CENTER),
+            ft.Row([
+                self.jump_field,
+                self.search_field,
+                ft.IconButton(ft.Icons.SEARCH, on_click=self._on_search)
+            ], spacing=8),
+            self.rows
+        ], spacing=6)
+
+        self._render()
+
+    def show_page(self, number: int, update: bool = True):
+        """切換到指定頁"""
+        self.current_page = min(max(number, 0), self.pager.page_count - 1)
+        self._render()
+        if update:
+            self.control.update()
+
+    def _render(self):
+        """只為目前頁面的列建立控制項"""
+        rows = []
+        for index, old_name, new_name in self.pager.page(self.current_page):
+            highlighted = index == self.highlight
+            rows.append(ft.Row([
+                ft.Text(f"{index + 1}", color=COLORS["text_dim"], size=11, width=60),
+                ft.Text(old_name, color="white" if highlighted else "grey", selectable=True, expand=True),
+                ft.Text(" → ", color=COLORS["accent"], size=12, weight="bold"),
+                ft.Text(new_name, color=COLORS["accent"], weight="bold", selectable=True, expand=True)
+            ], spacing=8))
+        self.rows.controls = rows
+        self.page_label.value = self.get_text(
+            "preview_page", self.current_page + 1, self.pager.page_count, len(self.pager)
+        )
+
+    def _on_jump(self, e=None):
+        """跳到指定列 (1 起算)"""
+        try:
+            index = int(self.jump_field.value) - 1
+        except (TypeError, ValueError):
+            return
+        self.highlight = index
+        self.show_page(self.pager.page_of(index))
+
+    def _on_search(self, e=None):
+        """搜尋下一個符合的列"""
+        start = self.highlight + 1 if self.highlight is not None else 0
+        index = self.pager.find(self.search_field.value, start)
+        if index is None:
+            self.page_label.value = self.get_text("preview_not_found")
+            self.control.update()
+            return
+        self.highlight = index
+        self.show_page(self.pager.page_of(index))
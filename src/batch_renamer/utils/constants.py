@@ -50,3 +50,42 @@ COLORS = {
     "text_dim": "#94a3b8",
     "red": "#ef4444",
 }
+
+# 背景執行時 UI 進度刷新間隔 (秒)
+UI_REFRESH_INTERVAL = 0.1
+
+# 文字輸入停止多久後才重新計算預覽 (秒)
+PREVIEW_DEBOUNCE_DELAY = 0.3
+
+# 即時預覽顯示的樣本數 (取得後即停止走訪)
+PREVIEW_SAMPLE_SIZE = 3
+
+# 執行記錄面板顯示的最新事件數 (取自事件記錄的環形緩衝區)
+UI_LOG_LINES = 50
+
+# 符號連結處理方式："skip" = 略過, "link" = 只重命名連結本身 (不進入), "follow" = 跟隨 (以裝置與 inode 避免循環)
+SYMLINK_POLICIES = ("skip", "link", "follow")
+DEFAULT_SYMLINK_POLICY = "link"
+
+# 附屬檔案規則：附屬副檔名 -> 主檔副檔名 (依優先順序)；主檔改名時附屬檔一併改名
+_IMAGE_EXTS = (
+    ".jpg", ".jpeg", ".heic", ".heif", ".png", ".tif", ".tiff", ".dng",
+    ".cr2", ".cr3", ".nef", ".arw", ".raf", ".orf", ".rw2",
+)
+_VIDEO_EXTS = (".mp4", ".mkv", ".mov", ".m4v", ".avi", ".webm", ".wmv")
+DEFAULT_COMPANION_RULES = {
+    ".xmp": _IMAGE_EXTS + _VIDEO_EXTS,
+    ".json": _IMAGE_EXTS + _VIDEO_EXTS,
+    ".aae": _IMAGE_EXTS,
+    ".srt": _VIDEO_EXTS,
+    ".ass": _VIDEO_EXTS,
+    ".ssa": _VIDEO_EXTS,
+    ".vtt": _VIDEO_EXTS,
+    ".sub": _VIDEO_EXTS,
+    ".idx": _VIDEO_EXTS,
+    ".thm": _VIDEO_EXTS,
+    ".lrv": _VIDEO_EXTS,
+}
+
+# 冷啟動目標：從進入點開始到首個可操作畫面 (秒)
+COLD_START_TARGET = 1.5
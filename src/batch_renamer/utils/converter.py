@@ -1,16 +1,19 @@
 """Simplified to Traditional Chinese conversion utilities"""
 
+import threading
 from typing import Optional
 
 # Global state for OpenCC
 _HAS_OPENCC = False
 _OPENCC_CONVERTER: Optional[object] = None
 _OPENCC_STATUS = "Init..."
+_INITIALIZED = False
+_INIT_LOCK = threading.Lock()
 
 
 def init_opencc() -> None:
     """初始化 OpenCC (簡轉繁工具)"""
-    global _HAS_OPENCC, _OPENCC_CONVERTER, _OPENCC_STATUS
+    global _HAS_OPENCC, _OPENCC_CONVERTER, _OPENCC_STATUS, _INITIALIZED
 
     try:
         from opencc import OpenCC
@@ -28,22 +31,31 @@ def init_opencc() -> None:
             _OPENCC_STATUS = "Missing (Fallback Active)"
     except ImportError:
         _OPENCC_STATUS = "Module Missing"
+    _INITIALIZED = True
+
+
+def _ensure_opencc() -> None:
+    """首次使用時才載入 OpenCC (避免拖慢啟動；可由背景執行緒預先載入)"""
+    if _INITIALIZED:
+        return
+    with _INIT_LOCK:
+        if not _INITIALIZED:
+            init_opencc()
 
 
 def has_opencc() -> bool:
     """Check if OpenCC is available"""
+    _ensure_opencc()
     return _HAS_OPENCC
 
 
 def get_opencc_converter() -> Optional[object]:
     """Get the OpenCC converter instance"""
+    _ensure_opencc()
     return _OPENCC_CONVERTER
 
 
 def get_opencc_status() -> str:
     """Get OpenCC initialization status"""
+    _ensure_opencc()
     return _OPENCC_STATUS
-
-
-# Initialize on import
-init_opencc()
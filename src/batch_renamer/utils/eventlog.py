@@ -0,0 +1,248 @@
+"""Structured event log - bounded ring buffer with an optional rotating JSONL sink"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# 等級
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
+
+# 事件代碼
+SCAN_ERROR = "scan_error"
+RENAME_FAILED = "rename_failed"
+FSYNC_FAILED = "fsync_failed"
+INDEX_ERROR = "index_error"
+PREVIEW_FAILED = "preview_failed"
+METRICS_FAILED = "metrics_failed"
+SYMLINK_CYCLE = "symlink_cycle"
+EXECUTION_PAUSED = "execution_paused"
+MIRROR_FAILED = "mirror_failed"
+MKDIR_FAILED = "mkdir_failed"
+
+# 環形緩衝區保留的事件數 (超過時丟棄最舊的)
+EVENT_BUFFER_SIZE = 1000
+
+# JSONL 檔案輪替：單檔上限 (位元組) 與保留的舊檔數
+EVENT_LOG_MAX_BYTES = 5 * 1024 * 1024
+EVENT_LOG_BACKUPS = 3
+
+# 設定此環境變數後，事件同時寫入該 JSONL 檔案
+EVENT_LOG_ENV = "BATCH_RENAMER_EVENT_LOG"
+
+
+@dataclass
+class LogEvent:
+    """One structured log record"""
+
+    seq: int
+    time: float
+    level: int
+    code: str
+    message: str
+    path: Optional[str] = None
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def level_name(self) -> str:
+        return LEVEL_NAMES.get(self.level, str(self.level))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """轉為可 JSON 序列化的字典"""
+        data = {
+            "seq": self.seq,
+            "time": round(self.time, 3),
+            "level": self.level_name,
+            "code": self.code,
+            "message": self.message,
+        }
+        if self.path is not None:
+            data["path"] = self.path
+        data.update(self.fields)
+        return data
+
+
+class RotatingJsonlSink:
+    """Append events to a JSONL file, rotating to .1 .. .N when it grows too large"""
+
+    def __init__(self, path: Path, max_bytes: int = EVENT_LOG_MAX_BYTES, backups: int = EVENT_LOG_BACKUPS):
+        """
+        Args:
+            path: 記錄檔路徑
+            max_bytes: 超過此大小時輪替 (0 = 不輪替)
+            backups: 保留的舊檔數 (path.1 為最新)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self._size = self._fh.tell()
+
+    def write(self, event: LogEvent) -> None:
+        """寫入一筆事件 (呼叫端負責加鎖)"""
+        line = json.dumps(event.as_dict(), ensure_ascii=False) + "\n"
+        size = len(line.encode("utf-8"))
+        if self.max_bytes and self._size and self._size + size > self.max_bytes:
+            self._rotate()
+        self._fh.write(line)
+        self._fh.flush()
+        self._size += size
+
+    def _rotate(self) -> None:
+        """path -> path.1 -> path.2 ...，超過 backups 的舊檔刪除"""
+        self._fh.close()
+        for i in range(self.backups, 0, -1):
+            src = self.path if i == 1 else self.path.with_name(f"{self.path.name}.{i - 1}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i}"))
+        if not self.backups:
+            self.path.unlink(missing_ok=True)
+        self._fh = open(self.path, "w", encoding="utf-8")
+        self._size = 0
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class EventLog:
+    """
+    Thread-safe structured log kept in a fixed-size ring buffer
+
+    每筆事件有遞增序號，介面可用 events(since=序號) 只取新事件；
+    計數不受緩衝區大小限制，因此即使舊事件已被丟棄，各錯誤代碼的總數仍然正確。
+    """
+
+    def __init__(self, capacity: int = EVENT_BUFFER_SIZE, sink: Optional[RotatingJsonlSink] = None, level: int = INFO):
+        """
+        Args:
+            capacity: 環形緩衝區大小
+            sink: 檔案輸出 (可選)
+            level: 低於此等級的事件不記錄
+        """
+        self.level = level
+        self.sink = sink
+        self._buffer: Deque[LogEvent] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._listeners: List[Callable[[LogEvent], None]] = []
+        self.counts: Dict[str, int] = {}
+
+    @property
+    def last_seq(self) -> int:
+        """最後一筆事件的序號 (尚無事件時為 0)"""
+        return self._seq
+
+    def log(self, level: int, code: str, message: str, path: Optional[Any] = None, **fields: Any) -> Optional[LogEvent]:
+        """
+        記錄一筆事件
+
+        Args:
+            level: 等級 (DEBUG / INFO / WARNING / ERROR)
+            code: 錯誤代碼 (例如 RENAME_FAILED)
+            message: 說明
+            path: 相關的路徑 (可選)
+            **fields: 其他欄位
+
+        Returns:
+            LogEvent，等級不足時為 None
+        """
+        if level < self.level:
+            return None
+        with self._lock:
+            self._seq += 1
+            event = LogEvent(self._seq, time.time(), level, code, message, None if path is None else str(path), fields)
+            self._buffer.append(event)
+            self.counts[code] = self.counts.get(code, 0) + 1
+            if self.sink is not None:
+                try:
+                    self.sink.write(event)
+                except OSError:
+                    # 記錄檔無法寫入時只保留在緩衝區
+                    pass
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(event)
+        return event
+
+    def debug(self, code: str, message: str, path: Optional[Any] = None, **fields: Any) -> Optional[LogEvent]:
+        return self.log(DEBUG, code, message, path, **fields)
+
+    def info(self, code: str, message: str, path: Optional[Any] = None, **fields: Any) -> Optional[LogEvent]:
+        return self.log(INFO, code, message, path, **fields)
+
+    def warning(self, code: str, message: str, path: Optional[Any] = None, **fields: Any) -> Optional[LogEvent]:
+        return self.log(WARNING, code, message, path, **fields)
+
+    def error(self, code: str, message: str, path: Optional[Any] = None, **fields: Any) -> Optional[LogEvent]:
+        return self.log(ERROR, code, message, path, **fields)
+
+    def events(self, since: int = 0, level: int = DEBUG, limit: Optional[int] = None) -> List[LogEvent]:
+        """
+        取得緩衝區中的事件
+
+        Args:
+            since: 只取序號大於此值的事件
+            level: 最低等級
+            limit: 只取最新的 limit 筆
+
+        Returns:
+            依序號排列的事件列表
+        """
+        with self._lock:
+            events = [e for e in self._buffer if e.seq > since and e.level >= level]
+        return events[-limit:] if limit else events
+
+    def subscribe(self, listener: Callable[[LogEvent], None]) -> Callable[[], None]:
+        """
+        每筆新事件都呼叫 listener (於記錄事件的執行緒)
+
+        Returns:
+            取消訂閱的函式
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        return unsubscribe
+
+    def set_sink(self, path: Optional[Path], max_bytes: int = EVENT_LOG_MAX_BYTES, backups: int = EVENT_LOG_BACKUPS) -> None:
+        """設定 (或以 None 移除) 檔案輸出"""
+        with self._lock:
+            if self.sink is not None:
+                self.sink.close()
+            self.sink = RotatingJsonlSink(path, max_bytes, backups) if path else None
+
+    def clear(self) -> None:
+        """清除緩衝區與計數 (序號繼續遞增)"""
+        with self._lock:
+            self._buffer.clear()
+            self.counts = {}
+
+
+def _default_log() -> EventLog:
+    """建立行程共用的記錄 (設定環境變數時附加檔案輸出)"""
+    log = EventLog()
+    path = os.environ.get(EVENT_LOG_ENV)
+    if path:
+        try:
+            log.set_sink(Path(path))
+        except OSError:
+            pass
+    return log
+
+
+# 行程共用的事件記錄
+EVENT_LOG = _default_log()
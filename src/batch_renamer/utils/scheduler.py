@@ -0,0 +1,111 @@
+"""Debounced, cancellable background recomputation"""
+
+import threading
+from typing import Any, Callable, Optional
+
+from .eventlog import EVENT_LOG, PREVIEW_FAILED
+
+
+class CancelToken:
+    """Cooperative cancellation flag passed to a running computation"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def __call__(self) -> bool:
+        """可直接作為 cancel_check 回呼使用"""
+        return self._event.is_set()
+
+
+class DebouncedScheduler:
+    """
+    Debounce bursts of requests and run only the newest one off-thread
+
+    每次 schedule() 都會取消尚未開始的計時器與正在執行的舊計算，
+    只有最新一次的結果會交給 apply 回呼。
+    """
+
+    def __init__(self, delay: float = 0.3):
+        """
+        Args:
+            delay: 最後一次輸入後等待多久才開始計算 (秒)
+        """
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._timer: Optional[threading.Timer] = None
+        self._token: Optional[CancelToken] = None
+
+    def schedule(
+        self,
+        compute: Callable[[CancelToken], Any],
+        apply: Callable[[Any], None],
+        delay: Optional[float] = None
+    ) -> None:
+        """
+        排程一次重新計算
+
+        Args:
+            compute: 在背景執行緒執行的計算，應定期檢查 CancelToken
+            apply: 僅在結果仍為最新時呼叫，參數為 compute 的回傳值
+            delay: 覆寫預設延遲 (0 = 立即開始)
+        """
+        with self._lock:
+            self._cancel_locked()
+            self._generation += 1
+            generation = self._generation
+            token = CancelToken()
+            self._token = token
+            self._timer = threading.Timer(
+                self.delay if delay is None else delay,
+                self._run, args=(generation, token, compute, apply)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self) -> None:
+        """取消等待中與執行中的計算"""
+        with self._lock:
+            self._cancel_locked()
+            self._generation += 1
+
+    def publish(self, token: CancelToken, apply: Callable[[Any], None], value: Any) -> bool:
+        """
+        在計算途中發布中間結果 (例如預覽樣本)，已被取代時不發布
+
+        Returns:
+            是否已發布
+        """
+        with self._lock:
+            if token.is_cancelled:
+                return False
+            apply(value)
+            return True
+
+    def _cancel_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._token is not None:
+            self._token.cancel()
+            self._token = None
+
+    def _run(self, generation: int, token: CancelToken, compute: Callable, apply: Callable) -> None:
+        try:
+            result = compute(token)
+        except Exception as ex:
+            EVENT_LOG.error(PREVIEW_FAILED, f"preview recompute: {ex}")
+            return
+
+        with self._lock:
+            # 被較新的輸入取代時丟棄結果
+            if token.is_cancelled or generation != self._generation:
+                return
+            apply(result)
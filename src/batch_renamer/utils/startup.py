@@ -0,0 +1,78 @@
+"""Startup instrumentation - import and first-paint timings"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .constants import COLD_START_TARGET
+
+# 設定此環境變數後，啟動完成時將計時結果附加到該檔案 (JSON lines)
+STARTUP_LOG_ENV = "BATCH_RENAMER_STARTUP_LOG"
+
+
+class StartupTimer:
+    """
+    Record named startup milestones relative to the first import of this module
+
+    里程碑只涵蓋本模組匯入之後的時間 (不含直譯器啟動、site 匯入與打包的 bootloader)；
+    報告另外記錄首個畫面的系統時間 (first_paint_at)，由外部從啟動行程的時刻計算完整的冷啟動時間。
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        Args:
+            start: 起始時間 (time.perf_counter()，預設為現在)
+        """
+        self.start = time.perf_counter() if start is None else start
+        # 起始時間對應的系統時間 (Unix 秒)
+        self.started_at = time.time() - (time.perf_counter() - self.start)
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, name: str) -> float:
+        """
+        記錄一個里程碑 (同名只記第一次)
+
+        Returns:
+            距離起始的秒數
+        """
+        return self.marks.setdefault(name, time.perf_counter() - self.start)
+
+    def report(self, target: float = COLD_START_TARGET) -> dict:
+        """
+        產生計時報告
+
+        Args:
+            target: 首個畫面的目標時間 (秒)
+
+        Returns:
+            {"marks", "first_paint_at", "target", "within_target"}
+            (within_target 只以行程內的 first_paint 比較)
+        """
+        first_paint = self.marks.get("first_paint")
+        return {
+            "marks": {name: round(seconds, 4) for name, seconds in self.marks.items()},
+            "first_paint_at": round(self.started_at + first_paint, 4) if first_paint is not None else None,
+            "target": target,
+            "within_target": first_paint is not None and first_paint <= target
+        }
+
+    def write(self, path: Optional[Path] = None, target: float = COLD_START_TARGET) -> Optional[dict]:
+        """
+        將報告附加到記錄檔 (未指定路徑且未設定環境變數時不寫入)
+
+        Returns:
+            寫入的報告，未寫入時為 None
+        """
+        path = path or os.environ.get(STARTUP_LOG_ENV)
+        if not path:
+            return None
+        report = self.report(target)
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(report) + "\n")
+        return report
+
+
+# 行程共用的計時器 (由進入點最先匯入)
+STARTUP = StartupTimer()
@@ -52,6 +52,9 @@ STRINGS = {
         "exec_btn_execute": "Execute Rename",
         "exec_btn_confirm": "Confirm Rename",
         "exec_btn_renaming": "Renaming...",
+        "exec_btn_pause": "Pause",
+        "exec_btn_resume": "Resume",
+        "exec_btn_cancel": "Cancel",
 
         # Status Messages
         "status_idle": "No changes detected",
@@ -59,19 +62,28 @@ STRINGS = {
         "status_warning": "Found {} files | Changes: {} file(s)",
         "status_reset": "All settings have been reset",
         "status_executing": "Executing",
+        "status_counting": "Counting matching files...",
 
         # Alerts
         "alert_no_changes": "No changes to apply!",
         "alert_success": "Success! {} file(s) renamed",
         "alert_cant_reset": "Cannot reset while renaming!",
+        "alert_plan_outdated": "Files or settings changed, preview refreshed. Please confirm again.",
         "alert_no_files": "No matching files found",
 
         # Preview Mode
         "preview_mode": "--- Preview Mode ---",
+        "preview_page": "Page {} / {} ({} changes)",
+        "preview_jump_label": "Go to #",
+        "preview_search_label": "Search",
+        "preview_not_found": "No match found",
         "execution_start": "--- Execution Started ---",
         "execution_complete": "--- Completed: {} file(s) renamed ---",
         "execution_progress": "Successfully renamed: {} | Remaining: {} ",
         "execution_error": "[ERR] {}: {}",
+        "execution_paused": "--- Paused ---",
+        "execution_cancelled": "--- Cancelled: {} file(s) renamed ---",
+        "execution_failed": "--- Stopped by an error: {} ---",
 
         # Buttons & Actions
         "btn_reset": "Reset all settings",
@@ -122,6 +134,9 @@ STRINGS = {
         "exec_btn_execute": "執行重新命名",
         "exec_btn_confirm": "確認重新命名",
         "exec_btn_renaming": "正在重新命名...",
+        "exec_btn_pause": "暫停",
+        "exec_btn_resume": "繼續",
+        "exec_btn_cancel": "取消",
 
         # Status Messages
         "status_idle": "未偵測到變化",
@@ -129,19 +144,28 @@ STRINGS = {
         "status_warning": "找到 {} 個檔案 | 變更: {} 個",
         "status_reset": "已重設所有設定",
         "status_executing": "正在執行",
+        "status_counting": "正在統計符合條件的檔案...",
 
         # Alerts
         "alert_no_changes": "沒有變化可應用!",
         "alert_success": "成功! {} 個檔案已重命名",
         "alert_cant_reset": "正在轉換中，無法重設!",
+        "alert_plan_outdated": "檔案或設定已變更，預覽已重新整理，請再次確認。",
         "alert_no_files": "未找到符合條件的檔案",
 
         # Preview Mode
         "preview_mode": "--- 預覽模式 ---",
+        "preview_page": "第 {} / {} 頁 (共 {} 項變更)",
+        "preview_jump_label": "跳至 #",
+        "preview_search_label": "搜尋",
+        "preview_not_found": "找不到符合的項目",
         "execution_start": "--- 執行開始 ---",
         "execution_complete": "--- 完成: {} 個檔案已重命名 ---",
         "execution_progress": "已轉換成功 {} 個，剩餘 {} 個",
         "execution_error": "[ERR] {}: {}",
+        "execution_paused": "--- 已暫停 ---",
+        "execution_cancelled": "--- 已取消: {} 個檔案已重命名 ---",
+        "execution_failed": "--- 發生錯誤而中止: {} ---",
 
         # Buttons & Actions
         "btn_reset": "重設所有設定",
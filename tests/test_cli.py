@@ -0,0 +1,112 @@
+"""Tests for the headless CLI"""
+
+import io
+import json
+import subprocess
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.cli import STARTUP_BUDGET_SECONDS, main
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+
+def run_cli(*argv: str):
+    """執行 CLI 並解析輸出的 JSON lines"""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        code = main([str(arg) for arg in argv])
+    return code, [json.loads(line) for line in buffer.getvalue().splitlines()]
+
+
+class TestCli:
+    """Test cases for the CLI entry point"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        (self.temp_path / "电子书").mkdir()
+        (self.temp_path / "电子书" / "草稿.txt").write_text("x")
+        (self.temp_path / "电视.txt").write_text("x")
+        (self.temp_path / "notes.md").write_text("x")
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def test_import_is_headless_and_within_budget(self):
+        """Test that importing the CLI loads neither Flet nor OpenCC and stays within the startup budget"""
+        code = (
+            "import sys, time; t = time.perf_counter(); import batch_renamer.cli; "
+            "print(time.perf_counter() - t, 'flet' in sys.modules, 'opencc' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONPATH": SRC_DIR}
+        )
+        elapsed, has_flet, has_opencc = result.stdout.split()
+
+        assert has_flet == "False"
+        assert has_opencc == "False"
+        assert float(elapsed) < STARTUP_BUDGET_SECONDS
+
+    def test_preview_streams_changed_entries(self):
+        """Test that preview emits one JSON line per changed entry plus a summary"""
+        code, events = run_cli("preview", self.temp_path, "--op", "replace", "--find", "电", "--replace", "電",
+                               "--ext", "txt")
+
+        assert code == 0
+        entries = [e for e in events if e["event"] == "entry"]
+        assert sorted(e["new_name"] for e in entries) == ["電视.txt"]
+        assert events[-1] == {"event": "summary", "changed": 1, "truncated": False}
+
+    def test_execute_and_undo_with_journal(self):
+        """Test that execute renames files and folders and undo restores them"""
+        journal = self.temp_path.parent / f"{self.temp_path.name}.journal"
+        try:
+            code, events = run_cli("execute", self.temp_path, "--mode", "both", "--op", "replace",
+                                   "--find", "电", "--replace", "電", "--prefix", "x_", "--ext", "txt",
+                                   "--journal", journal)
+
+            assert code == 0
+            assert events[-1]["event"] == "summary"
+            assert events[-1]["failed"] == 0
+            assert (self.temp_path / "x_電子书" / "x_草稿.txt").exists()
+            assert (self.temp_path / "x_電视.txt").exists()
+
+            code, events = run_cli("undo", journal)
+            assert code == 0
+            assert (self.temp_path / "电子书" / "草稿.txt").exists()
+            assert (self.temp_path / "电视.txt").exists()
+        finally:
+            journal.unlink(missing_ok=True)
+
+    def test_missing_root_reports_error(self):
+        """Test that an invalid root produces an error event and exit code 2"""
+        code, events = run_cli("scan", self.temp_path / "missing")
+
+        assert code == 2
+        assert events == [{"event": "error", "message": f"not a directory: {self.temp_path / 'missing'}"}]
+
+    def test_mapping_option_errors(self):
+        """Test that --op mapping needs --mapping and that an unreadable mapping file is reported"""
+        stderr = io.StringIO()
+        with redirect_stderr(stderr), pytest.raises(SystemExit) as excinfo:
+            main(["scan", str(self.temp_path), "--op", "mapping"])
+        assert excinfo.value.code == 2
+        assert "--op mapping requires --mapping" in stderr.getvalue()
+
+        missing = self.temp_path / "missing.csv"
+        code, events = run_cli("scan", self.temp_path, "--op", "mapping", "--mapping", missing)
+        assert code == 2
+        assert events[0]["event"] == "error"
+        assert str(missing) in events[0]["message"]
@@ -0,0 +1,90 @@
+"""Tests for durable rename mode"""
+
+import tempfile
+from pathlib import Path
+from unittest import mock
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.renamer import FileRenamer
+
+
+class TestDurableRename:
+    """Test cases for per-directory fsync batching"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.renamer = FileRenamer()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        for sub in ("a", "b"):
+            (self.temp_path / sub).mkdir()
+            for i in range(3):
+                (self.temp_path / sub / f"f{i}.txt").touch()
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def _scan(self):
+        return self.renamer.scan_directory(self.temp_path, "files", "all", [], "none", prefix="x_")
+
+    def test_default_mode_does_not_sync(self):
+        """Test that durability is opt-in"""
+        self.renamer.execute_rename(self._scan())
+
+        summary = self.renamer.last_summary
+        assert summary.success == 6
+        assert not summary.durable
+        assert summary.dirs_synced == 0
+
+    def test_durable_syncs_each_directory_once(self):
+        """Test that touched directories are synced once at the end"""
+        success, failed = self.renamer.execute_rename(self._scan(), durable=True)
+
+        summary = self.renamer.last_summary
+        assert (success, failed) == (6, 0)
+        assert summary.durable
+        assert summary.dirs_synced == 2
+        assert summary.fsync_seconds <= summary.elapsed
+
+    def test_durable_sync_every(self):
+        """Test periodic directory sync every N operations"""
+        self.renamer.execute_rename(self._scan(), durable=True, sync_every=3)
+
+        # 兩個資料夾各 3 筆：每批 3 筆只觸及一個資料夾
+        assert self.renamer.last_summary.dirs_synced == 2
+        assert (self.temp_path / "a" / "x_f0.txt").exists()
+
+    def test_durable_renames_folder_and_contents(self):
+        """Test that folders renamed after their contents are synced at their new path"""
+        (self.temp_path / "a" / "deep").mkdir()
+        (self.temp_path / "a" / "deep" / "g.txt").touch()
+        synced = []
+
+        def sync(directory: Path) -> bool:
+            synced.append((directory, directory.is_dir()))
+            return True
+
+        self.renamer.fs = mock.Mock(wraps=self.renamer.fs, sync_dir=sync)
+        targets = self.renamer.scan_directory(self.temp_path, "both", "all", [], "none", prefix="x_")
+        assert self.renamer.execute_rename(targets, durable=True) == (10, 0)
+
+        summary = self.renamer.last_summary
+        # 每個目錄在同步當下都存在；a/deep 在 a 改名前已以新名稱同步
+        assert all(exists for _, exists in synced)
+        assert sorted(p.relative_to(self.temp_path).as_posix() for p, _ in synced) == [
+            ".", "a/x_deep", "x_a", "x_b"
+        ]
+        assert summary.dirs_synced == summary.fsync_calls == 4
+
+    def test_failed_syncs_are_not_counted(self):
+        """Test that dirs_synced only counts directories that were actually synced"""
+        self.renamer.fs = mock.Mock(wraps=self.renamer.fs, sync_dir=lambda directory: False)
+        self.renamer.execute_rename(self._scan(), durable=True)
+
+        summary = self.renamer.last_summary
+        assert (summary.dirs_synced, summary.fsync_calls) == (0, 2)
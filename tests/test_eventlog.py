@@ -0,0 +1,94 @@
+"""Tests for the structured event log"""
+
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.cli import main
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.utils.eventlog import (
+    EVENT_LOG, ERROR, RENAME_FAILED, WARNING, EventLog, RotatingJsonlSink
+)
+
+
+class TestEventLog:
+    """Test cases for EventLog, its file sink and the renamer integration"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        EVENT_LOG.set_sink(None)
+        self.temp_dir.cleanup()
+
+    def test_ring_buffer_is_bounded_but_counts_are_not(self):
+        """Test that old events are dropped while per-code counts stay exact"""
+        log = EventLog(capacity=10)
+        for i in range(25):
+            log.error("boom", f"failure {i}", path=f"/x/{i}")
+        log.info("note", "hello")
+        log.debug("noise", "below the default level")
+
+        events = log.events()
+        assert len(events) == 10
+        assert events[-1].code == "note" and events[0].seq == 17
+        assert log.counts == {"boom": 25, "note": 1}
+        assert [e.message for e in log.events(since=24, level=ERROR)] == ["failure 24"]
+        assert len(log.events(level=WARNING, limit=3)) == 3
+        assert log.events(level=ERROR)[0].as_dict()["path"] == "/x/16"
+
+    def test_rotating_sink(self):
+        """Test that the JSONL sink rotates and keeps a bounded number of backups"""
+        path = self.temp_path / "logs" / "events.jsonl"
+        log = EventLog(sink=RotatingJsonlSink(path, max_bytes=300, backups=2))
+        for i in range(40):
+            log.warning("slow", f"entry {i:03d}")
+        log.sink.close()
+
+        files = sorted(p.name for p in path.parent.iterdir())
+        assert files == ["events.jsonl", "events.jsonl.1", "events.jsonl.2"]
+        assert all(p.stat().st_size <= 300 for p in path.parent.iterdir())
+        last = json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+        assert last["message"] == "entry 039" and last["level"] == "warning"
+
+    def test_rename_failures_are_logged(self):
+        """Test that per-entry rename failures are recorded with code and path"""
+        log = EventLog()
+        renamer = FileRenamer(event_log=log)
+        missing = self.temp_path / "missing.txt"
+        success, failed = renamer.execute_rename([(missing, "other.txt")])
+
+        assert (success, failed) == (0, 1)
+        [event] = log.events()
+        assert event.code == RENAME_FAILED and event.level == ERROR
+        assert event.path == str(missing)
+        assert event.fields["target"] == str(self.temp_path / "other.txt")
+
+    def test_cli_reports_recent_failures(self):
+        """Test that the CLI emits a bounded log event and writes the JSONL sink"""
+        root = self.temp_path / "root"
+        root.mkdir()
+        (root / "a.txt").write_text("x")
+        (root / "x_a.txt").mkdir()
+        log_file = self.temp_path / "cli.jsonl"
+
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            code = main(["--log", str(log_file), "execute", str(root), "--prefix", "x_"])
+        events = [json.loads(line) for line in buffer.getvalue().splitlines()]
+
+        assert code == 1
+        [log_event] = [e for e in events if e["event"] == "log"]
+        assert log_event["counts"] == {RENAME_FAILED: 1}
+        assert log_event["recent"][0]["path"] == str(root / "a.txt")
+        assert json.loads(log_file.read_text(encoding="utf-8"))["code"] == RENAME_FAILED
@@ -0,0 +1,109 @@
+"""Tests for background rename execution"""
+
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.core.executor import RenameControl, RenameWorker, ThrottledProgress
+from batch_renamer.core.journal import RenameJournal
+
+
+class TestRenameWorker:
+    """Test cases for RenameWorker and its helpers"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.renamer = FileRenamer()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        for i in range(20):
+            (self.temp_path / f"f{i:02d}.txt").touch()
+        self.targets = self.renamer.scan_directory(self.temp_path, "files", "all", [], "none", prefix="x_")
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def test_throttled_progress_always_reports_final(self):
+        """Test that throttling drops intermediate updates but keeps the last one"""
+        calls = []
+        progress = ThrottledProgress(lambda s, f, t: calls.append((s, f, t)), interval=60)
+
+        for done in range(1, 11):
+            progress(done, 0, 10)
+
+        assert calls == [(1, 0, 10), (10, 0, 10)]
+
+    def test_worker_runs_in_background(self):
+        """Test that the worker renames everything and reports completion"""
+        finished = threading.Event()
+        summaries = []
+
+        def on_complete(summary):
+            summaries.append(summary)
+            finished.set()
+
+        worker = RenameWorker(self.renamer, self.targets, on_complete=on_complete)
+        worker.start()
+
+        assert finished.wait(5)
+        assert summaries[0].success == 20
+        assert not summaries[0].cancelled
+
+    def test_crash_reports_error_not_previous_summary(self):
+        """Test that a run that raises reports its own error instead of the last run's counts"""
+        self.renamer.execute_rename(self.targets)
+        assert self.renamer.last_summary.success == 20
+        summaries = []
+
+        with mock.patch.object(self.renamer, "execute_rename", side_effect=PermissionError("journal is read-only")):
+            worker = RenameWorker(self.renamer, self.targets, on_complete=summaries.append)
+            worker.start()
+            worker.join(5)
+
+        assert summaries[0].error == "PermissionError: journal is read-only"
+        assert (summaries[0].success, summaries[0].failed) == (0, 0)
+
+    def test_cancel_stops_between_operations(self):
+        """Test cancelling a paused run leaves the journal resumable"""
+        journal_path = self.temp_path / "run.journal"
+        control = RenameControl()
+
+        def on_progress(success, failed, total):
+            if success == 5:
+                control.cancel()
+
+        self.renamer.execute_rename(
+            self.targets, journal=RenameJournal(journal_path),
+            progress=on_progress, control=control
+        )
+
+        summary = self.renamer.last_summary
+        assert summary.cancelled
+        assert summary.success == 5
+        state = RenameJournal.load(journal_path)
+        assert not state.completed
+        assert len(state.pending()) == 15
+
+        assert self.renamer.resume_journal(journal_path) == (15, 0)
+
+    def test_pause_blocks_until_resume(self):
+        """Test that a paused worker makes no progress until resumed"""
+        finished = threading.Event()
+        worker = RenameWorker(self.renamer, self.targets, on_complete=lambda s: finished.set())
+        worker.pause()
+        worker.start()
+
+        assert not finished.wait(0.2)
+        assert not any(p.name.startswith("x_") for p in self.temp_path.iterdir())
+
+        worker.resume()
+        assert finished.wait(5)
+        assert self.renamer.last_summary.success == 20
@@ -0,0 +1,114 @@
+"""Tests for the streaming plan export"""
+
+import gzip
+import json
+import shutil
+import subprocess
+import tempfile
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core import export
+from batch_renamer.core.export import export_plan
+from batch_renamer.core.mapping import MappingIndex
+from batch_renamer.core.renamer import FileRenamer
+
+
+class TestExport:
+    """Test cases for export_plan"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.root = self.temp_path / "tree"
+        (self.root / "国家" / "国 'quoted'").mkdir(parents=True)
+        (self.root / "国家" / "国 'quoted'" / "国.txt").write_text("x")
+        (self.root / "国家" / "same.txt").write_text("x")
+        self.renamer = FileRenamer()
+        self.settings = dict(
+            root_path=self.root, rename_mode="both", filter_type="all", valid_exts=[], operation="s2t"
+        )
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def tree(self) -> list:
+        return sorted(p.relative_to(self.root).as_posix() for p in self.root.rglob("*"))
+
+    def test_csv_round_trips_as_mapping(self):
+        """Test that a CSV export with a root can be loaded back as a mapping file"""
+        out = self.temp_path / "plan.csv"
+        stats = export_plan(self.renamer.iter_targets(**self.settings), out, root=self.root)
+        mapping = MappingIndex.from_file(out)
+
+        assert (stats.scanned, stats.written) == (4, 3)
+        assert mapping.lookup("国家/国 'quoted'/国.txt", "") == "國.txt"
+        assert len(mapping) == 3
+
+    def test_csv_with_relative_root(self, monkeypatch):
+        """Test that exporting with root "." writes the same relative paths as an absolute root"""
+        monkeypatch.chdir(self.root)
+        out = self.temp_path / "plan.csv"
+        settings = dict(self.settings, root_path=Path("."))
+        export_plan(self.renamer.iter_targets(**settings), out, root=Path("."))
+
+        with open(out, encoding="utf-8") as fh:
+            rows = fh.read().splitlines()
+        assert rows[0] == "old,new"
+        assert sorted(rows[1:]) == sorted([
+            "国家,國家", "国家/国 'quoted',國 'quoted'", "国家/国 'quoted'/国.txt,國.txt"
+        ])
+
+    def test_gzip_jsonl_with_all_entries(self):
+        """Test that .gz output is compressed and --all keeps unchanged entries"""
+        out = self.temp_path / "plan.jsonl.gz"
+        export_plan(self.renamer.iter_targets(**self.settings), out, changed_only=False)
+
+        with gzip.open(out, "rt", encoding="utf-8") as fh:
+            rows = [json.loads(line) for line in fh]
+        assert len(rows) == 4
+        assert {"path": str(self.root / "国家" / "same.txt"), "new_name": "same.txt", "changed": False} in rows
+
+    @pytest.mark.skipif(shutil.which("sh") is None, reason="needs a POSIX shell")
+    def test_shell_script_renames_and_undo_restores(self):
+        """Test that the forward script matches execute_rename and the undo script restores the tree"""
+        original = self.tree()
+        forward, backward = self.temp_path / "rename.sh", self.temp_path / "undo.sh"
+        export_plan(self.renamer.iter_targets(**self.settings), forward)
+        export_plan(self.renamer.iter_targets(**self.settings), backward, undo=True)
+
+        subprocess.run(["sh", str(forward)], check=True, capture_output=True)
+        assert self.tree() == sorted(["國家", "國家/國 'quoted'", "國家/國 'quoted'/國.txt", "國家/same.txt"])
+
+        subprocess.run(["sh", str(backward)], check=True, capture_output=True)
+        assert self.tree() == original
+
+    def test_memory_is_constant_in_plan_size(self):
+        """Test that exporting a large synthetic plan does not hold the entries in memory"""
+        # 預先建立 Path：建立 Path 會 intern 路徑片段，intern 表擴張不應算進峰值
+        paths = [Path(f"/archive/d{i % 100}/国_{i}.jpg") for i in range(1000)]
+
+        def synthetic(count):
+            for i in range(count):
+                yield paths[i % 1000], f"國_{i}.jpg"
+
+        peaks = []
+        # 縮小寫入緩衝區，兩種大小的輸出都超過緩衝區，峰值才可比較
+        with mock.patch.object(export, "EXPORT_BUFFER_SIZE", 1 << 14):
+            for count in (2_000, 20_000):
+                tracemalloc.start()
+                export_plan(synthetic(count), self.temp_path / f"plan{count}.csv")
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+        assert peaks[1] < peaks[0] * 1.5
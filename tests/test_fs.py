@@ -0,0 +1,96 @@
+"""Tests for the filesystem backends"""
+
+import os
+import tempfile
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.fs import FileSystem, LOCAL_FS, MemoryFileSystem
+from batch_renamer.core.journal import RenameJournal
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.utils.eventlog import EventLog, SYMLINK_CYCLE
+
+
+class TestMemoryFileSystem:
+    """Test cases for MemoryFileSystem and FileRenamer running on it"""
+
+    def setup_method(self):
+        """Setup test fixtures: the same small tree in memory and on disk"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.fs = MemoryFileSystem()
+        self.root = Path("/data/国家")
+        for rel in ("国/国.txt", "国/same.txt", "图.jpg"):
+            self.fs.add_file(self.root / rel, parents=True)
+            (self.temp_path / "国家" / rel).parent.mkdir(parents=True, exist_ok=True)
+            (self.temp_path / "国家" / rel).touch()
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def tree(self) -> list:
+        return sorted(str(Path(p).relative_to("/data")) for p in self.fs.walk_paths("/data"))
+
+    def test_posix_semantics(self):
+        """Test that errors and rename rules match the os module"""
+        fs = self.fs
+        with pytest.raises(TypeError):
+            FileSystem()
+        with pytest.raises(FileNotFoundError):
+            fs.stat("/data/missing")
+        with pytest.raises(FileExistsError):
+            fs.mkdir(self.root / "国")
+        with pytest.raises(NotADirectoryError):
+            list(fs.list_dir(self.root / "图.jpg"))
+        with pytest.raises(OSError):
+            fs.rename(self.root, self.root / "国" / "inside")
+
+        before = fs.stat(self.root).st_mtime_ns
+        fs.rename(self.root / "图.jpg", self.root / "国" / "same.txt")
+        assert not fs.exists(self.root / "图.jpg")
+        assert fs.stat(self.root).st_mtime_ns != before
+        assert not fs.is_dir(self.root / "国" / "same.txt") and fs.is_dir(self.root / "国")
+
+    def test_list_dir_matches_local(self):
+        """Test that both backends list the same entries with the same types"""
+        def listing(fs, root):
+            return sorted(fs.list_dir(root))
+
+        assert listing(self.fs, self.root) == listing(LOCAL_FS, self.temp_path / "国家")
+        assert listing(self.fs, self.root / "国") == listing(LOCAL_FS, self.temp_path / "国家" / "国")
+
+    def test_scan_execute_and_undo(self):
+        """Test that the renamer plans, executes and undoes without touching the disk"""
+        renamer = FileRenamer(fs=self.fs)
+        settings = dict(root_path=self.root, rename_mode="both", filter_type="all", valid_exts=[], operation="s2t")
+        plan = renamer.build_plan(settings)
+        assert plan.changed_count == 3
+        assert renamer.build_plan(settings) is plan
+
+        journal_path = self.temp_path / "rename.journal"
+        assert renamer.execute_rename(plan.changed, journal=RenameJournal(journal_path)) == (3, 0)
+        assert self.tree() == sorted(["国家", "国家/國", "国家/國/國.txt", "国家/國/same.txt", "国家/圖.jpg"])
+        assert (self.temp_path / "国家" / "图.jpg").exists()
+
+        assert renamer.undo_journal(journal_path) == (3, 0)
+        assert self.tree() == sorted(["国家", "国家/国", "国家/国/国.txt", "国家/国/same.txt", "国家/图.jpg"])
+
+    def test_plan_goes_stale_and_links_are_followed(self):
+        """Test plan staleness and symlink cycle detection on the in-memory tree"""
+        log = EventLog()
+        renamer = FileRenamer(event_log=log, fs=self.fs)
+        settings = dict(root_path=self.root, rename_mode="both", filter_type="all", valid_exts=[], operation="s2t")
+        plan = renamer.build_plan(settings)
+
+        self.fs.symlink(self.root, self.root / "国" / "loop")
+        assert plan.is_stale()
+
+        targets = renamer.scan_directory(**settings, symlinks="follow")
+        assert str(self.root / "国" / "loop") in {str(item) for item, _ in targets}
+        assert [e.code for e in log.events()] == [SYMLINK_CYCLE]
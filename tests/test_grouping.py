@@ -0,0 +1,90 @@
+"""Tests for companion (sidecar) grouping"""
+
+import os
+import tempfile
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.grouping import CompanionGrouper, parse_companion_rules
+from batch_renamer.core.renamer import FileRenamer
+
+
+class TestGrouping:
+    """Test cases for CompanionGrouper and the companions scan setting"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name) / "media"
+        (self.root / "trip").mkdir(parents=True)
+        for name in ("IMG_001.jpg", "IMG_001.xmp", "IMG_001.jpg.json", "电影.mkv", "电影.en.srt", "lonely.xmp"):
+            (self.root / "trip" / name).write_text("x")
+        self.renamer = FileRenamer()
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def test_parse_rules(self):
+        """Test rule strings, mappings and the built-in defaults"""
+        assert parse_companion_rules("XMP=jpg, .CR2; srt=mkv") == {".xmp": (".jpg", ".cr2"), ".srt": (".mkv",)}
+        assert parse_companion_rules({"aae": ["heic"]}) == {".aae": (".heic",)}
+        assert ".srt" in parse_companion_rules("default")
+        with pytest.raises(ValueError):
+            parse_companion_rules("xmp")
+
+    def test_companions_follow_primary(self):
+        """Test that sidecars take the primary's new stem and keep their own extra suffixes"""
+        targets = self.renamer.scan_directory(
+            self.root, "files", "all", [], "s2t", prefix="2024_", companions="default"
+        )
+        names = {item.name: new_name for item, new_name in targets}
+        assert names["IMG_001.xmp"] == "2024_IMG_001.xmp"
+        assert names["IMG_001.jpg.json"] == "2024_IMG_001.jpg.json"
+        assert names["电影.en.srt"] == "2024_電影.en.srt"
+        assert names["lonely.xmp"] == "2024_lonely.xmp"
+
+    def test_extension_filter_pulls_in_companions(self):
+        """Test that filtered scans still rename matching sidecars and leave orphans out"""
+        self.renamer.scan_directory(
+            self.root, "files", "ext", [".jpg"], "replace", find_text="IMG", replace_text="Photo",
+            companions="xmp=jpg; json=jpg"
+        )
+        self.renamer.execute_rename(self.renamer.targets)
+        assert sorted(p.name for p in (self.root / "trip").iterdir()) == sorted(
+            ["Photo_001.jpg", "Photo_001.xmp", "Photo_001.jpg.json", "电影.mkv", "电影.en.srt", "lonely.xmp"]
+        )
+
+    def test_directory_is_never_a_primary(self):
+        """Test that a folder sharing the stem of a sidecar does not lend it its new name"""
+        (self.root / "trip" / "IMG_002.jpg").mkdir()
+        (self.root / "trip" / "IMG_002.xmp").write_text("x")
+
+        targets = self.renamer.scan_directory(
+            self.root, "both", "all", [], "replace", find_text="IMG_002.jpg", replace_text="album",
+            companions="default"
+        )
+        names = {item.name: new_name for item, new_name in targets}
+
+        assert names["IMG_002.jpg"] == "album"
+        assert names["IMG_002.xmp"] == "IMG_002.xmp"
+
+    def test_linear_without_filesystem_access(self):
+        """Test grouping on a large synthetic directory that does not exist on disk"""
+        count = 20_000
+        targets = []
+        for i in range(count):
+            targets.append((Path(f"/nonexistent/big/IMG_{i}.CR2"), f"new_{i}.CR2"))
+            targets.append((Path(f"/nonexistent/big/IMG_{i}.JPG"), f"new_{i}.JPG"))
+            targets.append((Path(f"/nonexistent/big/IMG_{i}.xmp"), f"IMG_{i}.xmp"))
+
+        grouper = CompanionGrouper(parse_companion_rules("xmp=cr2,jpg"))
+        grouped = grouper.group(targets)
+        assert grouper.grouped == count
+        assert grouped[2] == (Path("/nonexistent/big/IMG_0.xmp"), "new_0.xmp")
+        assert grouped[-1][1] == f"new_{count - 1}.xmp"
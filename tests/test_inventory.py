@@ -0,0 +1,96 @@
+"""Tests for the persistent scan index"""
+
+import tempfile
+import time
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.core.fs import MemoryFileSystem
+from batch_renamer.core.inventory import InventoryIndex
+
+
+class TestInventoryIndex:
+    """Test cases for InventoryIndex"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.root = self.temp_path / "archive"
+        for sub in ("a", "b", "c"):
+            (self.root / sub / "deep").mkdir(parents=True)
+            (self.root / sub / "deep" / "国.txt").write_text("x")
+        self.index = InventoryIndex(self.temp_path / "index.db")
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def test_first_refresh_indexes_everything(self):
+        """Test that the first refresh lists every directory and records metadata"""
+        stats = self.index.refresh(self.root)
+
+        assert stats.dirs_rescanned == 7
+        assert stats.dirs_reused == 0
+        record = self.index.lookup(self.root, self.root / "a" / "deep" / "国.txt")
+        assert record["size"] == 1
+        assert not record["is_dir"]
+        assert record["inode"] == os.stat(self.root / "a" / "deep" / "国.txt").st_ino
+
+    def test_unchanged_subtrees_are_reused(self):
+        """Test that only directories whose mtime changed are listed again"""
+        self.index.refresh(self.root)
+        time.sleep(0.01)
+        (self.root / "b" / "deep" / "电.txt").touch()
+
+        stats = self.index.refresh(self.root)
+
+        assert stats.dirs_checked == 7
+        assert stats.dirs_rescanned == 1
+        assert self.index.lookup(self.root, self.root / "b" / "deep" / "电.txt") is not None
+
+    def test_removed_directory_is_forgotten(self):
+        """Test that deleting a folder drops its whole subtree from the index"""
+        self.index.refresh(self.root)
+        (self.root / "c" / "deep" / "国.txt").unlink()
+        (self.root / "c" / "deep").rmdir()
+
+        self.index.refresh(self.root)
+
+        assert self.index.lookup(self.root, self.root / "c" / "deep") is None
+        assert self.index.lookup(self.root, self.root / "c" / "deep" / "国.txt") is None
+
+    def test_scan_directory_uses_index(self):
+        """Test that scans through the index match a plain scan"""
+        renamer = FileRenamer(inventory=self.index)
+        plain = FileRenamer().scan_directory(self.root, "both", "all", [], "s2t")
+
+        indexed = renamer.scan_directory(self.root, "both", "all", [], "s2t")
+        again = renamer.scan_directory(self.root, "both", "all", [], "s2t")
+
+        assert sorted(indexed) == sorted(plain)
+        assert sorted(again) == sorted(plain)
+        assert self.index.stats.dirs_reused == 7
+
+    def test_index_reads_through_backend(self):
+        """Test that an index on an in-memory tree never touches the disk and keeps link kinds"""
+        fs = MemoryFileSystem()
+        fs.add_file("/mem/archive/国/a.txt", parents=True)
+        fs.symlink("/mem/archive/国", "/mem/archive/link")
+        index = InventoryIndex(self.temp_path / "memory.db", fs=fs)
+        try:
+            assert index.refresh(Path("/mem/archive")).dirs_rescanned == 2
+            assert index.lookup(Path("/mem/archive"), Path("/mem/archive/link"))["is_link"]
+
+            renamer = FileRenamer(inventory=index, fs=fs)
+            renamer.scan_directory(Path("/mem/archive"), "both", "all", [], "s2t")
+            assert renamer.execute_rename(renamer.targets) == (1, 0)
+            assert ("a.txt", False, False) in index.children(Path("/mem/archive"), Path("/mem/archive/國"))
+        finally:
+            index.close()
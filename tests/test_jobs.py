@@ -0,0 +1,146 @@
+"""Tests for job manifests and the concurrent runner"""
+
+import json
+import tempfile
+from pathlib import Path
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core import jobs as jobs_module
+from batch_renamer.core.jobs import JobSpec, group_jobs, load_manifest, run_job, run_manifest
+from batch_renamer.core.journal import RenameJournal
+
+
+def _crash_on_inbox(job, journal_file, durable=False):
+    """在工作行程中模擬崩潰 (inbox 工作直接結束行程)"""
+    if job.name == "inbox":
+        os._exit(1)
+    return run_job(job, journal_file, durable)
+
+
+class TestJobs:
+    """Test cases for manifests and run_manifest"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        for drop in ("inbox", "scans"):
+            (self.temp_path / drop).mkdir()
+            (self.temp_path / drop / "国家.txt").write_text("x")
+            (self.temp_path / drop / "photo.jpg").write_text("x")
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def write_manifest(self, data: dict, name: str = "jobs.json") -> Path:
+        path = self.temp_path / name
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        return path
+
+    def test_load_json_and_toml_manifests(self):
+        """Test that both formats resolve roots relative to the manifest and normalise extensions"""
+        json_path = self.write_manifest({"max_workers": 2, "jobs": [{"name": "inbox", "root": "inbox", "ext": "txt, .JPG"}]})
+        toml_path = self.temp_path / "jobs.toml"
+        toml_path.write_text('journal_dir = "logs"\n[[jobs]]\nroot = "scans"\noperation = "s2t"\n', encoding="utf-8")
+
+        manifest = load_manifest(json_path)
+        assert manifest.max_workers == 2
+        assert manifest.jobs[0].root == self.temp_path.resolve() / "inbox"
+        assert manifest.jobs[0].scan_settings()["valid_exts"] == [".txt", ".jpg"]
+
+        manifest = load_manifest(toml_path)
+        assert manifest.journal_dir == self.temp_path.resolve() / "logs"
+        assert manifest.jobs[0].name == "job1"
+        assert manifest.jobs[0].operation == "s2t"
+
+    def test_invalid_manifests_are_rejected(self):
+        """Test that duplicate names and unknown fields raise ValueError"""
+        with pytest.raises(ValueError):
+            load_manifest(self.write_manifest({"jobs": [{"name": "a", "root": "inbox"}, {"name": "a", "root": "scans"}]}))
+        with pytest.raises(ValueError):
+            load_manifest(self.write_manifest({"jobs": [{"root": "inbox", "oparation": "s2t"}]}))
+
+    @pytest.mark.parametrize("data, message", [
+        ({"jobs": [{"name": "a", "root": "inbox", "ext": 5}]}, "a: 'ext'"),
+        ({"jobs": [{"name": "a", "root": "inbox", "ext": ["jpg", 1]}]}, "a: 'ext'"),
+        ({"jobs": [{"name": "a", "root": "inbox", "one_filesystem": "yes"}]}, "a: 'one_filesystem'"),
+        ({"jobs": [{"name": "a", "root": 3}]}, "a: 'root'"),
+        ({"max_workers": "x", "jobs": [{"root": "inbox"}]}, "'max_workers'"),
+        ({"max_workers": True, "jobs": [{"root": "inbox"}]}, "'max_workers'"),
+        ({"group_limits": {"nas": 0}, "jobs": [{"root": "inbox"}]}, "'group_limits.nas'"),
+        ({"jobs": ["inbox"]}, "job1"),
+    ])
+    def test_field_types_are_checked(self, data, message):
+        """Test that wrongly typed fields name the job and the field"""
+        with pytest.raises(ValueError, match=message):
+            load_manifest(self.write_manifest(data))
+
+    def test_overlapping_roots_share_a_group(self):
+        """Test that nested or identical roots are serialised while separate roots run in parallel"""
+        jobs = [
+            JobSpec("a", self.temp_path / "inbox"),
+            JobSpec("b", self.temp_path / "scans"),
+            JobSpec("c", self.temp_path / "inbox" / "sub"),
+        ]
+
+        assert [[job.name for job in group] for group in group_jobs(jobs)] == [["a", "c"], ["b"]]
+
+    def test_run_manifest_renames_each_root_with_its_own_journal(self):
+        """Test that jobs run in a process pool and produce a combined summary"""
+        manifest = load_manifest(self.write_manifest({"jobs": [
+            {"name": "inbox", "root": "inbox", "operation": "s2t", "ext": ["txt"]},
+            {"name": "scans", "root": "scans", "prefix": "scan_", "ext": ["jpg"]},
+            {"name": "missing", "root": "nowhere"},
+        ]}))
+
+        summary = run_manifest(manifest, max_workers=2)
+
+        assert [r.name for r in summary.results] == ["inbox", "scans", "missing"]
+        assert summary.success == 2
+        assert summary.jobs_failed == 1
+        assert "nowhere" in summary.results[2].error
+        assert (self.temp_path / "inbox" / "國家.txt").exists()
+        assert (self.temp_path / "scans" / "scan_photo.jpg").exists()
+        journals = {r.journal for r in summary.results[:2]}
+        assert len(journals) == 2
+        assert all(RenameJournal.load(Path(j)).completed for j in journals)
+
+    def test_group_limit_serialises_jobs(self):
+        """Test that jobs sharing a group with limit 1 never run at the same time"""
+        manifest = load_manifest(self.write_manifest({"max_workers": 2, "group_limits": {"disk": 1}, "jobs": [
+            {"name": "inbox", "root": "inbox", "prefix": "a_", "group": "disk"},
+            {"name": "scans", "root": "scans", "prefix": "b_", "group": "disk"},
+        ]}))
+        summary = run_manifest(manifest)
+
+        spans = []
+        for result in summary.results:
+            records = [json.loads(line) for line in Path(result.journal).read_text(encoding="utf-8").splitlines()]
+            spans.append((records[0]["ts"], records[-1]["ts"]))
+        spans.sort()
+        assert summary.success == 4
+        assert spans[0][1] <= spans[1][0]
+
+    def test_worker_crash_is_recorded_as_failed(self, monkeypatch):
+        """Test that a dying worker fails its job without losing results that already finished"""
+        monkeypatch.setattr(jobs_module, "run_job", _crash_on_inbox)
+        manifest = load_manifest(self.write_manifest({"max_workers": 1, "jobs": [
+            {"name": "scans", "root": "scans", "prefix": "b_"},
+            {"name": "inbox", "root": "inbox", "prefix": "a_"},
+        ]}))
+        reported = []
+
+        summary = run_manifest(manifest, on_result=reported.append)
+
+        scans, inbox = summary.results
+        assert scans.ok and scans.success == 2
+        assert inbox.error.startswith("BrokenProcessPool")
+        assert [r.name for r in reported] == ["scans", "inbox"]
+        assert not any(p.name.startswith("a_") for p in (self.temp_path / "inbox").iterdir())
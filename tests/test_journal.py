@@ -0,0 +1,123 @@
+"""Tests for RenameJournal (crash resume and undo)"""
+
+import tempfile
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.core.journal import RenameJournal, OP_DONE
+
+
+class TestRenameJournal:
+    """Test cases for the write-ahead journal"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.renamer = FileRenamer()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.root = self.temp_path / "root"
+        self.root.mkdir()
+        self.journal_path = self.temp_path / "run.journal"
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def _scan(self, rename_mode: str = "files"):
+        return self.renamer.scan_directory(self.root, rename_mode, "all", [], "none", prefix="x_")
+
+    def test_execute_records_plan_and_completion(self):
+        """Test that every planned operation is journaled as done"""
+        for i in range(5):
+            (self.root / f"f{i}.txt").touch()
+
+        success, failed = self.renamer.execute_rename(self._scan(), journal=RenameJournal(self.journal_path))
+
+        state = RenameJournal.load(self.journal_path)
+        assert (success, failed) == (5, 0)
+        assert len(state.planned) == 5
+        assert sorted(state.done) == list(range(5))
+        assert state.completed
+        assert state.pending() == []
+
+    def test_undo_restores_original_names(self):
+        """Test bulk undo of a completed run, including renamed folders"""
+        (self.root / "sub").mkdir()
+        (self.root / "sub" / "a.txt").touch()
+        (self.root / "b.txt").touch()
+
+        success, failed = self.renamer.execute_rename(
+            self._scan("both"), journal=RenameJournal(self.journal_path)
+        )
+        assert (success, failed) == (3, 0)
+        assert (self.root / "x_sub" / "x_a.txt").exists()
+
+        success, failed = self.renamer.undo_journal(self.journal_path)
+
+        assert (success, failed) == (3, 0)
+        assert (self.root / "sub" / "a.txt").exists()
+        assert (self.root / "b.txt").exists()
+        assert RenameJournal.load(self.journal_path).undo_completed
+
+    def test_resume_after_crash(self):
+        """Test resuming a run whose journal stops midway"""
+        for i in range(4):
+            (self.root / f"f{i}.txt").touch()
+        ops = [(old, old.parent / new) for old, new in self._scan()]
+
+        # 模擬崩潰：計畫已落盤，僅第一筆完成並記錄，第二筆已改名但記錄遺失
+        journal = RenameJournal(self.journal_path)
+        journal.begin(ops)
+        os.rename(*ops[0])
+        journal.record(OP_DONE, 0)
+        os.rename(*ops[1])
+        journal.close()
+        with open(self.journal_path, "a", encoding="utf-8") as fh:
+            fh.write('{"op": "do')
+
+        success, failed = self.renamer.resume_journal(self.journal_path)
+
+        assert (success, failed) == (3, 0)
+        assert sorted(p.name for p in self.root.iterdir()) == [f"x_f{i}.txt" for i in range(4)]
+        assert RenameJournal.load(self.journal_path).pending() == []
+
+    def test_fresh_run_does_not_treat_missing_source_as_done(self):
+        """Test that a vanished source next to an unrelated target fails instead of being journaled as done"""
+        (self.root / "a.txt").touch()
+        (self.root / "b.txt").touch()
+        targets = self._scan()
+        (self.root / "a.txt").unlink()
+        (self.root / "x_a.txt").write_text("unrelated")
+
+        success, failed = self.renamer.execute_rename(targets, journal=RenameJournal(self.journal_path))
+
+        state = RenameJournal.load(self.journal_path)
+        assert (success, failed) == (1, 1)
+        assert list(state.failed) == [state.planned.index((self.root / "a.txt", self.root / "x_a.txt"))]
+        assert self.renamer.undo_journal(self.journal_path) == (1, 0)
+        assert (self.root / "x_a.txt").read_text() == "unrelated"
+        assert not (self.root / "a.txt").exists()
+
+    def test_reused_journal_holds_only_last_run(self):
+        """Test that a second run replaces the journal and relative paths are stored absolute"""
+        (self.root / "a.txt").touch()
+        self.renamer.execute_rename(self._scan(), journal=RenameJournal(self.journal_path))
+        (self.root / "b.txt").touch()
+
+        cwd = os.getcwd()
+        os.chdir(self.temp_path)
+        try:
+            targets = [(Path("root") / "b.txt", "y_b.txt")]
+            assert self.renamer.execute_rename(targets, journal=RenameJournal(self.journal_path)) == (1, 0)
+        finally:
+            os.chdir(cwd)
+
+        state = RenameJournal.load(self.journal_path)
+        assert state.planned == [(self.root / "b.txt", self.root / "y_b.txt")]
+        assert self.renamer.undo_journal(self.journal_path) == (1, 0)
+        assert sorted(p.name for p in self.root.iterdir()) == ["b.txt", "x_a.txt"]
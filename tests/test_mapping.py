@@ -0,0 +1,110 @@
+"""Tests for external mapping files"""
+
+import tempfile
+from pathlib import Path
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.mapping import MappingIndex
+from batch_renamer.core.renamer import FileRenamer
+
+
+class TestMappingIndex:
+    """Test cases for MappingIndex and the mapping operation"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.root = self.temp_path / "archive"
+        (self.root / "2024").mkdir(parents=True)
+        (self.root / "2024" / "IMG_001.jpg").write_text("x")
+        (self.root / "2024" / "IMG_002.jpg").write_text("x")
+        (self.root / "notes.txt").write_text("x")
+        self.renamer = FileRenamer()
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def settings(self, mapping: MappingIndex, mode: str = "files") -> dict:
+        return dict(
+            root_path=self.root, rename_mode=mode, filter_type="all", valid_exts=[],
+            operation="mapping", mapping=mapping
+        )
+
+    def test_load_csv_with_header_and_tsv(self):
+        """Test that headers are skipped, keys are normalised and bad rows are counted"""
+        csv_path = self.temp_path / "map.csv"
+        csv_path.write_text(
+            "old,new\n./2024/IMG_001.jpg,beach.jpg\n2024\\IMG_002.jpg,2024/sunset.jpg\n"
+            "notes.txt,other/notes.txt\nbroken\n2024/IMG_001.jpg,beach-final.jpg\n",
+            encoding="utf-8"
+        )
+        tsv_path = self.temp_path / "map.tsv"
+        tsv_path.write_text("notes.txt\t筆記.txt\n", encoding="utf-8")
+
+        index = MappingIndex.from_file(csv_path)
+        report = index.report()
+        assert len(index) == 2
+        assert report.duplicates == 1
+        assert report.invalid_rows == 2
+        assert report.invalid_samples == [4, 5]
+        assert index.lookup("2024/IMG_001.jpg", "x") == "beach-final.jpg"
+        assert index.lookup("2024/IMG_002.jpg", "x") == "sunset.jpg"
+
+        assert MappingIndex.from_file(tsv_path).lookup("notes.txt", "x") == "筆記.txt"
+
+    def test_scan_applies_mapping_and_reports_unmatched(self):
+        """Test that the scan renames mapped entries, keeps the rest and reports both sides"""
+        index = MappingIndex()
+        index.add(["2024/IMG_001.jpg", "beach.jpg"])
+        index.add(["2024/missing.jpg", "gone.jpg"])
+
+        targets = dict((p.relative_to(self.root).as_posix(), n) for p, n in self.renamer.iter_targets(**self.settings(index)))
+        report = index.report()
+
+        assert targets == {"2024/IMG_001.jpg": "beach.jpg", "2024/IMG_002.jpg": "IMG_002.jpg", "notes.txt": "notes.txt"}
+        assert report.matched == 1
+        assert report.unmatched_rows == 1
+        assert report.unmatched_row_samples == ["2024/missing.jpg"]
+        assert report.unmatched_files == 2
+        assert sorted(report.unmatched_file_samples) == ["2024/IMG_002.jpg", "notes.txt"]
+
+    def test_relative_root_builds_the_same_keys(self, monkeypatch):
+        """Test that a relative root such as "." matches the same rows as the absolute root"""
+        index = MappingIndex()
+        index.add(["2024/IMG_001.jpg", "beach.jpg"])
+        index.add(["notes.txt", "memo.txt"])
+        monkeypatch.chdir(self.root)
+
+        settings = dict(self.settings(index), root_path=Path("."))
+        targets = dict((p.as_posix(), n) for p, n in self.renamer.iter_targets(**settings))
+        report = index.report()
+
+        assert targets == {"2024/IMG_001.jpg": "beach.jpg", "2024/IMG_002.jpg": "IMG_002.jpg", "notes.txt": "memo.txt"}
+        assert report.matched == 2
+        assert report.unmatched_file_samples == ["2024/IMG_002.jpg"]
+
+    def test_execute_renames_folders_and_files(self):
+        """Test that a mapped plan runs through execute_rename, children before their folder"""
+        index = MappingIndex()
+        index.add(["2024", "2024-vacation"])
+        index.add(["2024/IMG_002.jpg", "sunset.jpg"])
+
+        plan = self.renamer.build_plan(self.settings(index, mode="both"))
+        success, failed = self.renamer.execute_rename(plan.changed)
+
+        assert (success, failed) == (2, 0)
+        assert (self.root / "2024-vacation" / "sunset.jpg").exists()
+        assert (self.root / "2024-vacation" / "IMG_001.jpg").exists()
+
+    def test_mapping_operation_requires_index(self):
+        """Test that the mapping operation without an index is rejected"""
+        with pytest.raises(ValueError):
+            list(self.renamer.iter_targets(**self.settings(None)))
@@ -0,0 +1,88 @@
+"""Tests for Prometheus textfile metrics"""
+
+import tempfile
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.metrics import Histogram, MetricsWriter
+from batch_renamer.core.renamer import FileRenamer
+
+
+def parse_metrics(text: str) -> dict:
+    """將文字格式解析為 {series: value} (略過註解)"""
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            series, _, value = line.rpartition(" ")
+            values[series] = float(value.replace("+Inf", "inf"))
+    return values
+
+
+class TestMetricsWriter:
+    """Test cases for MetricsWriter and its scanner / executor hooks"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.root = self.temp_path / "root"
+        (self.root / "sub").mkdir(parents=True)
+        for name in ("a.txt", "b.txt", "sub/c.txt"):
+            (self.root / name).write_text("x")
+        self.prom = self.temp_path / "textfile" / "batch_renamer.prom"
+        self.prom.parent.mkdir()
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket placement and cumulative counts"""
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+        assert histogram.cumulative() == [2, 3, 4]
+        assert histogram.count == 4 and abs(histogram.sum - 5.65) < 1e-9
+
+    def test_scan_and_rename_are_recorded(self):
+        """Test that the scanner and executor hooks update counters and histograms"""
+        metrics = MetricsWriter(self.prom, interval=3600, labels={"host": 'nas"01'})
+        renamer = FileRenamer(metrics=metrics)
+        plan = renamer.build_plan(dict(
+            root_path=self.root, rename_mode="files", filter_type="all", valid_exts=[],
+            operation="none", prefix="x_"
+        ))
+        (self.root / "b.txt").unlink()
+        renamer.execute_rename(plan.changed)
+
+        values = parse_metrics(self.prom.read_text(encoding="utf-8"))
+        labels = '{host="nas\\"01"}'
+        assert values[f"batch_renamer_entries_scanned_total{labels}"] == 3
+        assert values[f"batch_renamer_scans_total{labels}"] == 1
+        assert values[f"batch_renamer_renames_total{labels}"] == 2
+        assert values[f"batch_renamer_rename_failures_total{labels}"] == 1
+        assert values[f"batch_renamer_rename_duration_seconds_count{labels}"] == 3
+        assert values['batch_renamer_rename_duration_seconds_bucket{host="nas\\"01",le="+Inf"}'] == 3
+        assert values[f"batch_renamer_scan_duration_seconds_count{labels}"] == 1
+        assert values[f"batch_renamer_opencc_conversions_total{labels}"] == 0
+
+    def test_writes_are_atomic_and_throttled(self):
+        """Test that only the final file remains and writes respect the interval"""
+        metrics = MetricsWriter(self.prom, interval=3600)
+        metrics.inc("renames_total")
+        first = self.prom.read_text(encoding="utf-8")
+        metrics.inc("renames_total")
+        assert self.prom.read_text(encoding="utf-8") == first
+
+        assert metrics.flush()
+        assert parse_metrics(self.prom.read_text(encoding="utf-8"))["batch_renamer_renames_total"] == 2
+        assert sorted(p.name for p in self.prom.parent.iterdir()) == ["batch_renamer.prom"]
+
+    def test_unwritable_target_does_not_raise(self):
+        """Test that a failed write is logged instead of interrupting the run"""
+        metrics = MetricsWriter(self.temp_path / "missing" / "m.prom")
+        assert not metrics.flush()
@@ -0,0 +1,123 @@
+"""Tests for the copy-rename (mirror) mode"""
+
+import errno
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core import mirror as mirror_module
+from batch_renamer.core.mirror import TreeMirror, mirror_plan
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.utils.eventlog import EventLog, MIRROR_FAILED
+
+
+class TestMirror:
+    """Test cases for mirror_plan and TreeMirror"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.root = self.temp_path / "src"
+        (self.root / "国家" / "空").mkdir(parents=True)
+        (self.root / "国家" / "国.txt").write_text("data")
+        (self.root / "same.txt").write_text("same")
+        self.output = self.temp_path / "out"
+        self.renamer = FileRenamer()
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def targets(self, mode: str = "both"):
+        return self.renamer.iter_targets(self.root, mode, "all", [], "s2t")
+
+    def tree(self, root: Path) -> list:
+        return sorted(p.relative_to(root).as_posix() for p in root.rglob("*"))
+
+    def test_hardlinks_renamed_tree(self):
+        """Test that the output has the new names, shares inodes and leaves the source alone"""
+        before = self.tree(self.root)
+        stats = mirror_plan(self.targets(), self.root, self.output, method="hardlink")
+
+        assert self.tree(self.output) == ["same.txt", "國家", "國家/國.txt", "國家/空"]
+        assert self.tree(self.root) == before
+        assert os.path.samefile(self.output / "國家" / "國.txt", self.root / "国家" / "国.txt")
+        assert (stats.scanned, stats.dirs, stats.linked, stats.failed) == (4, 2, 2, 0)
+
+    def test_files_mode_keeps_folder_names(self):
+        """Test that folders missing from the targets are created once with their original names"""
+        stats = mirror_plan(self.targets("files"), self.root, self.output)
+        assert self.tree(self.output) == ["same.txt", "国家", "国家/國.txt"]
+        assert stats.dirs == 1
+
+    def test_auto_falls_back_without_userspace_copy(self):
+        """Test that a cross-device hardlink falls back to reflink, then to copy_file_range / sendfile"""
+        cross_device = OSError(errno.EXDEV, "cross-device link")
+        with mock.patch.object(mirror_module.os, "link", side_effect=cross_device), \
+                mock.patch.object(mirror_module, "FICLONE", 0):
+            stats = mirror_plan(self.targets(), self.root, self.output)
+
+        copy = self.output / "國家" / "國.txt"
+        assert copy.read_text() == "data"
+        assert not os.path.samefile(copy, self.root / "国家" / "国.txt")
+        assert copy.stat().st_mtime_ns == (self.root / "国家" / "国.txt").stat().st_mtime_ns
+        assert (stats.linked, stats.cloned, stats.copied, stats.failed) == (0, 0, 2, 0)
+
+    def test_per_file_error_keeps_hardlinks_for_other_files(self):
+        """Test that EPERM on one file falls back for that file only"""
+        real_link = os.link
+        refused = []
+
+        def link(src, dst, **kwargs):
+            # 第一個檔案不允許硬連結，之後的照常
+            if not refused:
+                refused.append(Path(src))
+                raise OSError(errno.EPERM, "protected hardlink")
+            return real_link(src, dst, **kwargs)
+
+        with mock.patch.object(mirror_module.os, "link", side_effect=link), \
+                mock.patch.object(mirror_module, "FICLONE", 0):
+            stats = mirror_plan(self.targets(), self.root, self.output)
+
+        linked = [p for p in (self.root / "国家" / "国.txt", self.root / "same.txt") if p not in refused]
+        assert len(linked) == 1 and os.stat(linked[0]).st_nlink == 2
+        assert (self.output / "國家" / "國.txt").read_text() == "data"
+        assert (stats.linked, stats.copied, stats.failed) == (1, 1, 0)
+
+    def test_refuses_nested_output_and_never_overwrites(self):
+        """Test that the output may not sit inside the root and existing files are reported, not replaced"""
+        with pytest.raises(ValueError):
+            TreeMirror(self.root, self.root / "out")
+
+        self.output.mkdir()
+        (self.output / "same.txt").write_text("keep")
+        log = EventLog()
+        mirror = TreeMirror(self.root, self.output, event_log=log)
+        for item, new_name in self.targets():
+            mirror.add(item, new_name)
+
+        assert (self.output / "same.txt").read_text() == "keep"
+        assert mirror.stats.failed == 1
+        assert [e.code for e in log.events()] == [MIRROR_FAILED]
+
+    def test_item_outside_root_is_counted_as_failed(self, monkeypatch):
+        """Test that a target outside the root fails on its own instead of ending the run"""
+        outside = self.temp_path / "elsewhere" / "stray.txt"
+        outside.parent.mkdir()
+        outside.write_text("x")
+        log = EventLog()
+        monkeypatch.setattr(mirror_module, "EVENT_LOG", log)
+
+        stats = mirror_plan([(outside, "stray.txt")] + list(self.targets()), self.root, self.output)
+
+        assert stats.failed == 1
+        assert self.tree(self.output) == ["same.txt", "國家", "國家/國.txt", "國家/空"]
+        assert [e.code for e in log.events()] == [MIRROR_FAILED]
@@ -0,0 +1,69 @@
+"""Tests for RenamePlan reuse and invalidation"""
+
+import tempfile
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.renamer import FileRenamer
+
+
+class TestRenamePlan:
+    """Test cases for FileRenamer.build_plan"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.renamer = FileRenamer()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        (self.temp_path / "sub").mkdir()
+        (self.temp_path / "国家.txt").touch()
+        (self.temp_path / "sub" / "same.txt").touch()
+        self.settings = dict(
+            root_path=self.temp_path, rename_mode="files", filter_type="all",
+            valid_exts=[], operation="s2t"
+        )
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def test_counts_and_changed_subset(self):
+        """Test that counts are computed once from the scan"""
+        plan = self.renamer.build_plan(self.settings)
+
+        assert plan.total_count == 2
+        assert plan.changed_count == 1
+        assert plan.changed[0][1] == "國家.txt"
+
+    def test_plan_is_reused_until_settings_change(self):
+        """Test reuse for identical settings and rebuild for new ones"""
+        plan = self.renamer.build_plan(self.settings)
+
+        assert self.renamer.build_plan(dict(self.settings)) is plan
+
+        changed = self.renamer.build_plan(dict(self.settings, prefix="x_"))
+        assert changed is not plan
+        assert changed.version > plan.version
+        assert changed.changed_count == 2
+
+    def test_plan_is_rebuilt_after_filesystem_change(self):
+        """Test that adding a file in a scanned folder invalidates the plan"""
+        plan = self.renamer.build_plan(self.settings)
+        (self.temp_path / "sub" / "电.txt").touch()
+
+        assert plan.is_stale()
+        rebuilt = self.renamer.build_plan(self.settings)
+        assert rebuilt is not plan
+        assert rebuilt.changed_count == 2
+
+    def test_execute_invalidates_plan(self):
+        """Test that executing a plan drops it from the cache"""
+        plan = self.renamer.build_plan(self.settings)
+        self.renamer.execute_rename(plan.changed)
+
+        assert self.renamer.plan is None
+        assert self.renamer.build_plan(self.settings).changed_count == 0
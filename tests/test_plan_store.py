@@ -0,0 +1,62 @@
+"""Tests for CompactPlanStore"""
+
+import tempfile
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.core.plan_store import CompactPlanStore
+from batch_renamer.core.preview import PreviewPager
+
+
+class TestCompactPlanStore:
+    """Test cases for the compact plan representation"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.store = CompactPlanStore()
+        self.store.append(Path("/data/a/国家.txt"), "國家.txt")
+        self.store.append(Path("/data/a/same.txt"), "same.txt")
+        self.store.append(Path("/data/b/电.txt"), "電.txt")
+
+    def test_round_trip_and_interning(self):
+        """Test that entries come back as (Path, new_name) with parents interned"""
+        assert len(self.store) == 3
+        assert self.store.dir_count == 2
+        assert list(self.store)[1] == (Path("/data/a/same.txt"), "same.txt")
+        assert self.store[-1] == (Path("/data/b/电.txt"), "電.txt")
+
+    def test_changed_view_and_entries(self):
+        """Test the changed subset and the __slots__ entry view"""
+        assert self.store.changed_count == 2
+        assert [new for _, new in self.store.changed] == ["國家.txt", "電.txt"]
+
+        entry = self.store.entry(1)
+        assert not entry.changed
+        assert entry.path == Path("/data/a/same.txt")
+        assert not hasattr(entry, "__dict__")
+
+    def test_pager_reads_store_in_place(self):
+        """Test paging directly over the compact changed view"""
+        pager = PreviewPager(self.store.changed, page_size=1)
+        assert pager.page(1) == [(1, "电.txt", "電.txt")]
+        assert pager.find("國") == 0
+
+    def test_execute_rename_from_compact_plan(self):
+        """Test that a compact plan runs through execute_rename deepest-first"""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "电").mkdir()
+            (root / "电" / "国.txt").touch()
+            renamer = FileRenamer()
+            plan = renamer.build_plan(dict(
+                root_path=root, rename_mode="both", filter_type="all",
+                valid_exts=[], operation="s2t"
+            ))
+
+            assert renamer.execute_rename(plan.changed) == (2, 0)
+            assert (root / "電" / "國.txt").exists()
@@ -0,0 +1,40 @@
+"""Tests for PreviewPager"""
+
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.preview import PreviewPager
+
+
+class TestPreviewPager:
+    """Test cases for paged full preview"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        targets = [(Path(f"/data/f{i:04d}.txt"), f"x_f{i:04d}.txt") for i in range(1000)]
+        targets.append((Path("/data/same.txt"), "same.txt"))
+        self.pager = PreviewPager(targets, page_size=100)
+
+    def test_only_changed_entries_are_kept(self):
+        """Test that unchanged entries are dropped"""
+        assert len(self.pager) == 1000
+        assert self.pager.page_count == 10
+
+    def test_page_builds_only_requested_rows(self):
+        """Test page slicing and clamping"""
+        page = self.pager.page(3)
+        assert len(page) == 100
+        assert page[0] == (300, "f0300.txt", "x_f0300.txt")
+        assert self.pager.page(99)[-1][0] == 999
+
+    def test_find_and_jump(self):
+        """Test searching wraps around and maps to the right page"""
+        index = self.pager.find("F0742")
+        assert index == 742
+        assert self.pager.page_of(index) == 7
+        assert self.pager.find("f0001", start=500) == 1
+        assert self.pager.find("missing") is None
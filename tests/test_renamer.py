@@ -119,3 +119,26 @@ class TestFileRenamer:
 
         assert len(targets) == 2
         assert all(item.suffix == ".txt" for item, _ in targets)
+
+    def test_scan_directory_both_lists_folder_before_contents(self):
+        """Test pre-order output when folders are included"""
+        (self.temp_path / "sub").mkdir()
+        (self.temp_path / "sub" / "a.txt").touch()
+
+        targets = self.renamer.scan_directory(self.temp_path, "both", "all", [], "none")
+
+        assert [item.name for item, _ in targets] == ["sub", "a.txt"]
+
+    def test_sample_targets_stops_walk_early(self):
+        """Test that sampling stops visiting entries once enough are found"""
+        for i in range(100):
+            (self.temp_path / f"file{i}.txt").touch()
+        visited = []
+
+        sample = self.renamer.sample_targets(
+            2, self.temp_path, "files", "all", [], "none",
+            cancel_check=lambda: visited.append(1) and False
+        )
+
+        assert len(sample) == 2
+        assert len(visited) == 2
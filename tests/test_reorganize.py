@@ -0,0 +1,130 @@
+"""Tests for the pattern-based reorganize mode"""
+
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.fs import FileStat, MemoryFileSystem
+from batch_renamer.core.journal import RenameJournal
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.core.reorganize import MkdirCache, ReorganizePattern
+
+
+class TestReorganize:
+    """Test cases for ReorganizePattern and FileRenamer.reorganize"""
+
+    def setup_method(self):
+        """Setup test fixtures: files with fixed modification times"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name) / "photos"
+        (self.root / "trip").mkdir(parents=True)
+        self.files = {
+            "trip/国.JPG": datetime(2023, 5, 1, 12),
+            "trip/b.png": datetime(2024, 1, 2, 12),
+            "c.jpg": datetime(2023, 5, 30, 12),
+            "README": datetime(2023, 5, 30, 12),
+        }
+        for rel, mtime in self.files.items():
+            (self.root / rel).write_text(rel)
+            os.utime(self.root / rel, (mtime.timestamp(), mtime.timestamp()))
+        self.renamer = FileRenamer()
+        self.settings = dict(root_path=self.root, rename_mode="both", filter_type="all", valid_exts=[], operation="s2t")
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def files_under(self, root: Path) -> list:
+        return sorted(p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file())
+
+    def test_pattern(self):
+        """Test field rendering and rejected patterns"""
+        pattern = ReorganizePattern("/{mtime:%Y}/{ext}/")
+        mtime_ns = int(datetime(2023, 5, 1, 12).timestamp()) * 1_000_000_000
+        assert pattern.render("a.JPG", mtime_ns) == "2023/jpg"
+        assert pattern.render("Makefile", mtime_ns) == "2023/no_ext"
+
+        with pytest.raises(ValueError):
+            ReorganizePattern("{size}")
+        with pytest.raises(ValueError):
+            ReorganizePattern("../{ext}").render("a.txt")
+
+    def test_moves_into_pattern_folders_and_undo(self):
+        """Test that files move (with their new names), folders stay, and the journal undoes the moves"""
+        before = self.files_under(self.root)
+        plan = self.renamer.build_reorganize_plan(self.settings, "{mtime:%Y}/{mtime:%m}")
+        assert (plan.scanned, len(plan.moves), len(plan.new_dirs), plan.skipped_dirs) == (4, 4, 2, 1)
+
+        journal_path = Path(self.temp_dir.name) / "reorganize.journal"
+        assert self.renamer.reorganize(plan, journal=RenameJournal(journal_path)) == (4, 0)
+        assert self.files_under(self.root) == ["2023/05/README", "2023/05/c.jpg", "2023/05/國.JPG", "2024/01/b.png"]
+        assert (self.root / "trip").is_dir()
+
+        assert self.renamer.undo_journal(journal_path) == (4, 0)
+        assert self.files_under(self.root) == before
+
+    def test_conflicts_are_skipped(self):
+        """Test that duplicate and existing destinations are reported instead of overwritten"""
+        (self.root / "trip" / "c.jpg").write_text("other")
+        (self.root / "png").mkdir()
+        (self.root / "png" / "b.png").write_text("existing")
+
+        plan = self.renamer.build_reorganize_plan(self.settings, "{ext}")
+        conflicts = sorted(item.relative_to(self.root).as_posix() for item, _ in plan.conflicts)
+        assert conflicts == ["c.jpg", "trip/b.png"]
+        assert plan.unchanged == 1
+        self.renamer.reorganize(plan)
+        assert (self.root / "png" / "b.png").read_text() == "existing"
+
+    def test_each_folder_created_once(self):
+        """Test that the mkdir cache creates every folder (and missing parent) exactly once"""
+        fs = MemoryFileSystem()
+        for i in range(200):
+            fs.add_file(f"/data/in/{i}.{('jpg', 'png', 'txt')[i % 3]}", parents=True)
+        renamer = FileRenamer(fs=fs)
+        settings = dict(self.settings, root_path=Path("/data/in"), operation="none")
+
+        plan = renamer.build_reorganize_plan(settings, "{ext}/{mtime:%Y}", dest_root=Path("/data/out"))
+        assert len(plan.new_dirs) == 3
+        assert renamer.reorganize(plan) == (200, 0)
+        assert ("2.txt", False, False) in fs.list_dir("/data/out/txt/1970")
+
+        cache = MkdirCache(fs)
+        with mock.patch.object(fs, "mkdir", wraps=fs.mkdir) as mkdir:
+            for _ in range(3):
+                cache.ensure(Path("/data/new/a/b"))
+                cache.ensure(Path("/data/new/c"))
+        assert cache.created == [Path("/data/new"), Path("/data/new/a"), Path("/data/new/a/b"), Path("/data/new/c")]
+        # 上層不存在時多一次失敗的嘗試，之後全部命中快取
+        assert mkdir.call_count == 6
+
+    def test_destination_on_another_filesystem_is_rejected(self):
+        """Test that a --dest on another device fails before any folder is created or file moved"""
+        fs = MemoryFileSystem()
+        fs.add_file("/data/in/a.jpg", parents=True)
+        fs.mkdir("/mnt")
+        stat = fs.stat
+
+        def other_device(path):
+            st = stat(path)
+            if str(path).startswith("/mnt"):
+                return FileStat(st.st_mode, st.st_ino, fs.DEVICE + 1, st.st_mtime_ns, st.st_size)
+            return st
+
+        renamer = FileRenamer(fs=fs)
+        settings = dict(self.settings, root_path=Path("/data/in"), operation="none")
+        with mock.patch.object(fs, "stat", side_effect=other_device):
+            with pytest.raises(ValueError, match="same filesystem"):
+                renamer.build_reorganize_plan(settings, "{ext}", dest_root=Path("/mnt/sorted/new"))
+            plan = renamer.build_reorganize_plan(settings, "{ext}", dest_root=Path("/data/sorted"))
+
+        assert plan.moves == [(Path("/data/in/a.jpg"), Path("/data/sorted/jpg/a.jpg"))]
+        assert not fs.exists("/mnt/sorted")
@@ -0,0 +1,72 @@
+"""Tests for the debounced preview scheduler"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.utils.scheduler import DebouncedScheduler, CancelToken
+
+
+class TestDebouncedScheduler:
+    """Test cases for DebouncedScheduler"""
+
+    def test_burst_runs_only_newest(self):
+        """Test that typing five characters triggers a single computation"""
+        scheduler = DebouncedScheduler(delay=0.05)
+        computed = []
+        applied = []
+        done = threading.Event()
+
+        for text in ["2", "20", "202", "2024", "2024_"]:
+            scheduler.schedule(
+                lambda token, text=text: computed.append(text) or text,
+                lambda result: (applied.append(result), done.set())
+            )
+
+        assert done.wait(2)
+        time.sleep(0.1)
+        assert computed == ["2024_"]
+        assert applied == ["2024_"]
+
+    def test_superseded_computation_is_cancelled(self):
+        """Test that newer input cancels a running computation and drops its result"""
+        scheduler = DebouncedScheduler(delay=0)
+        started = threading.Event()
+        applied = []
+        done = threading.Event()
+
+        def slow(token: CancelToken):
+            started.set()
+            while not token.is_cancelled:
+                time.sleep(0.01)
+            return "stale"
+
+        scheduler.schedule(slow, applied.append)
+        assert started.wait(2)
+        scheduler.schedule(lambda token: "fresh", lambda result: (applied.append(result), done.set()))
+
+        assert done.wait(2)
+        time.sleep(0.05)
+        assert applied == ["fresh"]
+
+    def test_scan_directory_stops_on_cancel(self):
+        """Test that a cancelled scan does not replace the last complete result"""
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(10):
+                (Path(tmp) / f"f{i}.txt").touch()
+            renamer = FileRenamer()
+            full = renamer.scan_directory(Path(tmp), "files", "all", [], "none")
+
+            token = CancelToken()
+            token.cancel()
+            partial = renamer.scan_directory(Path(tmp), "files", "all", [], "none", cancel_check=token)
+
+            assert partial == []
+            assert renamer.targets == full
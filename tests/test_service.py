@@ -0,0 +1,156 @@
+"""Tests for the local rename service"""
+
+import tempfile
+import time
+from pathlib import Path
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.journal import RenameJournal
+from batch_renamer.service import INVALID_PARAMS, METHOD_NOT_FOUND, RenameService, ServiceClient, ServiceError
+
+
+class TestRenameService:
+    """Test cases for RenameService over a Unix domain socket"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.root = self.temp_path / "drop"
+        (self.root / "子").mkdir(parents=True)
+        for i in range(5):
+            (self.root / "子" / f"国{i}.txt").write_text("x")
+        self.socket_path = self.temp_path / "renamer.sock"
+        self.service = RenameService(
+            self.socket_path, max_workers=1,
+            index_path=self.temp_path / "index.db", journal_dir=self.temp_path / "journals"
+        )
+        self.service.start()
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.service.shutdown()
+        self.temp_dir.cleanup()
+
+    def test_submit_streams_progress_until_done(self):
+        """Test that a streamed submit returns the queued job, then progress and a done notification"""
+        notifications = []
+        with ServiceClient(self.socket_path, timeout=10) as client:
+            job = client.call(
+                "submit", lambda method, params: notifications.append((method, params)),
+                stream=True, root=str(self.root), operation="s2t"
+            )
+
+        assert job["state"] in ("queued", "running")
+        methods = [method for method, _ in notifications]
+        assert methods[0] == "state"
+        assert "progress" in methods
+        assert methods[-1] == "done"
+        done = notifications[-1][1]
+        assert done["state"] == "done"
+        assert done["result"]["success"] == 5
+        assert sorted(p.name for p in (self.root / "子").iterdir()) == [f"國{i}.txt" for i in range(5)]
+        assert RenameJournal.load(Path(done["result"]["journal"])).completed
+
+    def test_status_list_and_watch_after_completion(self):
+        """Test that finished jobs stay queryable and watch returns done immediately"""
+        with ServiceClient(self.socket_path, timeout=10) as client:
+            job = client.call("submit", root=str(self.root), prefix="a_")
+            watched = []
+            client.call("watch", lambda method, params: watched.append(method), job=job["job"])
+
+            assert watched[-1] == "done"
+            assert client.call("status", job=job["job"])["state"] == "done"
+            assert [j["job"] for j in client.call("list")] == [job["job"]]
+            assert client.call("ping")["jobs"] == 1
+
+    def test_cancel_queued_job(self):
+        """Test that a job waiting for a busy tree can be cancelled before it starts"""
+        # 模擬同一棵樹上已有工作在執行，新工作只能排隊
+        with self.service._cond:
+            self.service._active_roots.append(Path(os.path.abspath(self.root)))
+
+        with ServiceClient(self.socket_path, timeout=10) as client:
+            job = client.call("submit", root=str(self.root / "子"), prefix="b_")
+            assert client.call("status", job=job["job"])["state"] == "queued"
+
+            client.call("cancel", job=job["job"])
+            watched = []
+            client.call("watch", lambda method, params: watched.append(params), job=job["job"])
+
+        with self.service._cond:
+            self.service._active_roots.clear()
+        assert watched[-1]["state"] == "cancelled"
+        assert not any(p.name.startswith("b_") for p in (self.root / "子").iterdir())
+
+    def test_waiting_job_does_not_hold_a_worker(self):
+        """Test that a job queued behind a busy tree leaves the only worker to an independent job"""
+        other = self.temp_path / "other"
+        other.mkdir()
+        (other / "国.txt").write_text("x")
+        started = []
+
+        def record(message: dict) -> None:
+            if message["method"] == "state":
+                started.append(message["params"]["job"])
+
+        with self.service._cond:
+            running = self.service.submit({"root": str(self.root / "子"), "prefix": "a_"})
+            running.control.pause()
+        while running.state != "running":
+            time.sleep(0.01)
+        overlapping = self.service.submit({"root": str(self.root), "prefix": "b_"}, record)
+        independent = self.service.submit({"root": str(other), "operation": "s2t"}, record)
+
+        assert [job for job, _ in self.service._waiting] == [overlapping]
+        running.control.resume()
+        while not (overlapping.finished and independent.finished):
+            time.sleep(0.01)
+
+        assert started == [independent.id, overlapping.id]
+        assert (overlapping.state, independent.state) == ("done", "done")
+        assert (other / "國.txt").exists()
+
+    def test_unknown_method_and_bad_params(self):
+        """Test that RPC errors carry JSON-RPC error codes"""
+        with ServiceClient(self.socket_path, timeout=10) as client:
+            with pytest.raises(ServiceError) as excinfo:
+                client.call("rename_everything")
+            assert excinfo.value.code == METHOD_NOT_FOUND
+
+            with pytest.raises(ServiceError):
+                client.call("submit", root=str(self.root), oparation="s2t")
+
+    def test_params_must_be_an_object(self):
+        """Test that positional params are rejected with Invalid params instead of crashing the handler"""
+        sent = []
+        self.service.handle_line(b'{"jsonrpc": "2.0", "id": 7, "method": "submit", "params": ["/tmp"]}', sent.append)
+        assert sent == [{"jsonrpc": "2.0", "id": 7, "error": {"code": INVALID_PARAMS, "message": "params must be an object"}}]
+
+    def test_finished_jobs_are_evicted(self):
+        """Test that only the newest finished jobs are kept"""
+        self.service.job_retention = 2
+        with ServiceClient(self.socket_path, timeout=10) as client:
+            for i in range(3):
+                client.call("submit", lambda method, params: None, root=str(self.root / "子"), prefix=f"{i}_", stream=True)
+            jobs = client.call("list")
+        assert [job["job"] for job in jobs] == ["2", "3"]
+
+    def test_shutdown_cancels_running_jobs(self):
+        """Test that shutdown stops a running job through its RenameControl"""
+        # 在工作開始前暫停，使其停在第一筆重命名之前
+        with self.service._cond:
+            job = self.service.submit({"root": str(self.root / "子"), "prefix": "c_"})
+            job.control.pause()
+        while job.state != "running":
+            time.sleep(0.01)
+
+        self.service.shutdown()
+        assert job.state == "cancelled"
+        assert not any(p.name.startswith("c_") for p in (self.root / "子").iterdir())
@@ -0,0 +1,99 @@
+"""Tests for the disk-spilling plan store"""
+
+import tempfile
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.core.preview import PreviewPager
+from batch_renamer.core.sqlite_store import SqlitePlanStore, SpillingPlanStore
+
+
+class TestSqlitePlanStore:
+    """Test cases for SqlitePlanStore and SpillingPlanStore"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def test_round_trip_and_changed_view(self):
+        """Test random access, ordered iteration and the changed subset"""
+        store = SqlitePlanStore(self.temp_path)
+        for i in range(25):
+            name = f"f{i:02d}.txt"
+            store.append(Path(f"/data/d{i % 3}") / name, f"x_{name}" if i % 5 == 0 else name)
+
+        assert len(store) == 25
+        assert store.dir_count == 3
+        assert store[7] == (Path("/data/d1/f07.txt"), "f07.txt")
+        assert [p.name for p, _ in store][:3] == ["f00.txt", "f01.txt", "f02.txt"]
+        assert next(reversed(store))[0].name == "f24.txt"
+        assert len(store.changed) == 5
+        assert [new for _, new in store.changed] == [f"x_f{i:02d}.txt" for i in range(0, 25, 5)]
+        assert PreviewPager(store.changed, page_size=2).page(1) == [
+            (2, "f10.txt", "x_f10.txt"), (3, "f15.txt", "x_f15.txt")
+        ]
+
+        db_path = store.path
+        store.close()
+        assert not os.path.exists(db_path)
+
+    def test_spills_after_threshold(self):
+        """Test that the store moves to SQLite once the threshold is passed"""
+        store = SpillingPlanStore(threshold=3, directory=self.temp_path)
+        for i in range(3):
+            store.append(Path(f"/data/f{i}"), f"g{i}")
+        assert not store.spilled
+
+        store.append(Path("/data/f3"), "g3")
+        assert store.spilled
+        assert [new for _, new in store] == ["g0", "g1", "g2", "g3"]
+        assert store.changed_count == 4
+
+    def test_scan_and_execute_through_spilled_plan(self):
+        """Test scan_directory and execute_rename with a disk-backed plan"""
+        root = self.temp_path / "root"
+        root.mkdir()
+        for i in range(10):
+            (root / f"f{i}.txt").touch()
+        renamer = FileRenamer(spill_threshold=4, spill_dir=self.temp_path)
+
+        plan = renamer.build_plan(dict(
+            root_path=root, rename_mode="files", filter_type="all",
+            valid_exts=[], operation="none", prefix="x_"
+        ))
+        assert plan.targets.spilled
+        assert plan.changed_count == 10
+
+        assert renamer.execute_rename(plan.changed) == (10, 0)
+        assert sorted(p.name for p in root.iterdir()) == sorted(f"x_f{i}.txt" for i in range(10))
+
+        store = SpillingPlanStore(threshold=2, directory=self.temp_path)
+        assert renamer.scan_directory(root, "files", "all", [], "none", store=store) is store
+        assert len(store) == 10
+
+    def test_find_runs_in_sql(self):
+        """Test that searching a spilled plan uses one query per range and matches the in-memory pager"""
+        store = SqlitePlanStore(self.temp_path)
+        targets = [(Path(f"/data/Ä{i:03d}.txt"), f"x_{i:03d}_國.txt") for i in range(300)]
+        for item, new_name in targets:
+            store.append(item, new_name)
+        pager, reference = PreviewPager(store.changed), PreviewPager(targets)
+
+        queries = []
+        store._conn.set_trace_callback(queries.append)
+        for query, start in (("ä150", 0), ("_042_", 100), ("國", 299), ("missing", 5)):
+            assert pager.find(query, start) == reference.find(query, start)
+        store._conn.set_trace_callback(None)
+        # 找到時一次查詢，需要從頭繼續或找不到時兩次
+        assert len([q for q in queries if q.startswith("SELECT")]) == 6
+        store.close()
@@ -0,0 +1,86 @@
+"""Tests for per-phase timing and counters"""
+
+import tempfile
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.inventory import InventoryIndex
+from batch_renamer.core.renamer import FileRenamer
+from batch_renamer.core.stats import PerfStats
+
+
+class TestPerfStats:
+    """Test cases for PerfStats and the FileRenamer instrumentation"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.root = self.temp_path / "root"
+        (self.root / "简体").mkdir(parents=True)
+        (self.root / "简体" / "电视.txt").write_text("x")
+        (self.root / "a.txt").write_text("x")
+        (self.root / ".hidden").write_text("x")
+        self.settings = dict(
+            root_path=self.root, rename_mode="both", filter_type="all", valid_exts=[], operation="s2t"
+        )
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def test_scan_records_phases_and_syscalls(self):
+        """Test that a scan records walk / convert / format time, entries and syscalls"""
+        stats = PerfStats()
+        targets = FileRenamer(stats=stats).scan_directory(**self.settings)
+
+        assert sorted(targets) == sorted(FileRenamer().scan_directory(**self.settings))
+        assert stats.entries == 3
+        assert {"walk", "convert", "format"} <= set(stats.phases)
+        assert stats.syscalls == {"listdir": 2}
+        assert stats.entries_per_second > 0
+
+        data = stats.as_dict()
+        assert data["entries"] == 3 and list(data["phases"])[:3] == ["walk", "convert", "format"]
+
+    def test_plan_cache_and_rename(self):
+        """Test plan reuse hit rate and rename counts"""
+        stats = PerfStats()
+        renamer = FileRenamer(stats=stats)
+        renamer.build_plan(self.settings)
+        plan = renamer.build_plan(self.settings)
+        assert stats.caches["plan"] == (1, 1)
+        assert stats.hit_rate("plan") == 0.5
+
+        stats.reset()
+        renamer.execute_rename(plan.changed)
+        assert stats.syscalls == {"rename": 2}
+        assert "rename" in stats.phases
+        assert "rename" in stats.summary()
+
+    def test_inventory_hit_rate(self):
+        """Test that reused index folders count as cache hits"""
+        stats = PerfStats()
+        inventory = InventoryIndex(self.temp_path / "index.db")
+        renamer = FileRenamer(inventory=inventory, stats=stats)
+        renamer.scan_directory(**self.settings)
+        assert stats.caches["inventory"] == (0, 2)
+
+        stats.reset()
+        renamer.scan_directory(**self.settings)
+        assert stats.caches["inventory"] == (2, 0)
+        assert stats.syscalls == {"stat": 2, "listdir": 0}
+        inventory.close()
+
+    def test_sample_stops_without_leaking_time(self):
+        """Test that an abandoned lazy scan still records its walk time"""
+        stats = PerfStats()
+        sample = FileRenamer(stats=stats).sample_targets(1, **self.settings)
+
+        assert len(sample) == 1
+        assert stats.entries == 1
+        assert stats.phases["walk"] > 0
@@ -0,0 +1,108 @@
+"""Tests for the symlink policy and cycle detection"""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_renamer.core.fs import LOCAL_FS
+from batch_renamer.core.inventory import InventoryIndex
+from batch_renamer.core.renamer import FileRenamer, _DirectoryGuard, _ENTER, _SKIP, _VISITED
+from batch_renamer.utils.eventlog import EventLog, SYMLINK_CYCLE
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "symlink") or os.name == "nt", reason="needs POSIX symlinks")
+
+
+class TestSymlinks:
+    """Test cases for symlink handling in the walker"""
+
+    def setup_method(self):
+        """Setup test fixtures: a loop back to the root and a link to an outside tree"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.root = self.temp_path / "root"
+        (self.root / "a").mkdir(parents=True)
+        (self.root / "a" / "file.txt").write_text("x")
+        os.symlink(self.root, self.root / "a" / "loop")
+        outside = self.temp_path / "outside"
+        outside.mkdir()
+        (outside / "big.txt").write_text("x")
+        os.symlink(outside, self.root / "ext")
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def scan(self, symlinks: str, renamer: FileRenamer = None) -> list:
+        renamer = renamer or FileRenamer()
+        targets = renamer.scan_directory(
+            self.root, "both", "all", [], "none", prefix="x_", symlinks=symlinks
+        )
+        return sorted(str(item.relative_to(self.root)) for item, _ in targets)
+
+    def test_policies(self):
+        """Test skip / link / follow on a loop and an outside tree"""
+        assert self.scan("skip") == ["a", "a/file.txt"]
+        assert self.scan("link") == ["a", "a/file.txt", "a/loop", "ext"]
+
+        log = EventLog()
+        followed = self.scan("follow", FileRenamer(event_log=log))
+        assert followed == ["a", "a/file.txt", "a/loop", "ext", "ext/big.txt"]
+        assert [e.code for e in log.events()] == [SYMLINK_CYCLE]
+
+        with pytest.raises(ValueError):
+            self.scan("maybe")
+
+    def test_link_renames_the_link_itself(self):
+        """Test that renaming a link leaves its target untouched"""
+        renamer = FileRenamer()
+        plan = renamer.build_plan(dict(
+            root_path=self.root, rename_mode="files", filter_type="all", valid_exts=[],
+            operation="none", prefix="x_"
+        ))
+        renamer.execute_rename(plan.changed)
+
+        assert (self.root / "x_ext").is_symlink()
+        assert (self.temp_path / "outside" / "big.txt").exists()
+        assert sorted(p.name for p in (self.root / "a").iterdir()) == ["x_file.txt", "x_loop"]
+
+    def test_one_filesystem_skips_other_devices(self):
+        """Test that directories on another device are neither listed nor entered"""
+        real_stat = os.stat
+        mount = self.root / "a"
+
+        def fake_stat(path, *args, **kwargs):
+            st = real_stat(path, *args, **kwargs)
+            if Path(path) == mount:
+                values = list(st)
+                values[2] = st.st_dev + 1
+                return os.stat_result(values)
+            return st
+
+        with mock.patch("batch_renamer.core.renamer.os.stat", fake_stat):
+            targets = FileRenamer().scan_directory(
+                self.root, "both", "all", [], "none", one_filesystem=True
+            )
+        assert sorted(str(item.relative_to(self.root)) for item, _ in targets) == ["ext"]
+
+        guard = _DirectoryGuard(LOCAL_FS, os.stat(self.root), one_filesystem=False)
+        assert guard.enter(mount) == _ENTER
+        assert guard.enter(mount) == _VISITED
+        assert guard.enter(self.root / "missing") == _SKIP
+
+    def test_index_records_links_without_following(self):
+        """Test that the inventory stores symlinks as links and refresh does not follow them"""
+        index = InventoryIndex(self.temp_path / "index.db")
+        stats = index.refresh(self.root)
+
+        assert stats.dirs_rescanned == 2
+        assert index.lookup(self.root, self.root / "ext")["is_link"]
+        assert not index.lookup(self.root, self.root / "ext")["is_dir"]
+        assert self.scan("link", FileRenamer(inventory=index)) == ["a", "a/file.txt", "a/loop", "ext"]
+        index.close()
@@ -0,0 +1,54 @@
+"""Tests for the benchmark tree generator"""
+
+import tempfile
+from pathlib import Path
+import sys
+import os
+
+# Add src and benchmarks to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from treegen import TreeSpec, generate_tree, iter_tree
+
+
+class TestTreeGen:
+    """Test cases for the synthetic tree generator"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+
+    def teardown_method(self):
+        """Cleanup test fixtures"""
+        self.temp_dir.cleanup()
+
+    def test_same_seed_same_tree(self):
+        """Test that the generator is deterministic per seed"""
+        spec = TreeSpec(entries=500, depth=3, fanout=4, seed=7)
+
+        assert list(iter_tree(spec)) == list(iter_tree(spec))
+        assert list(iter_tree(spec)) != list(iter_tree(TreeSpec(entries=500, depth=3, fanout=4, seed=8)))
+
+    def test_shape_follows_spec(self):
+        """Test entry count, parents-first order, depth limit and extension / CJK settings"""
+        spec = TreeSpec(entries=1000, depth=2, fanout=5, cjk_ratio=1.0, exts=["jpg", ".png"])
+        entries = list(iter_tree(spec))
+        dirs = {path for path, is_dir in entries if is_dir}
+
+        assert len(entries) == 1000
+        assert max(path.count("/") for path in dirs) == 1
+        assert all(path.rpartition("/")[0] in dirs | {""} for path, _ in entries)
+        files = [path for path, is_dir in entries if not is_dir]
+        assert {Path(path).suffix for path in files} == {".jpg", ".png"}
+        assert all(any("一" <= ch <= "鿿" for ch in Path(path).stem) for path in files)
+
+    def test_generate_tree_writes_every_entry(self):
+        """Test that the tree on disk matches the generated listing"""
+        spec = TreeSpec(entries=300, depth=3, fanout=3)
+        counts = generate_tree(self.temp_path / "tree", spec)
+
+        on_disk = sorted(p.relative_to(self.temp_path / "tree").as_posix() for p in (self.temp_path / "tree").rglob("*"))
+        assert on_disk == sorted(path for path, _ in iter_tree(spec))
+        assert counts["dirs"] + counts["files"] == 300